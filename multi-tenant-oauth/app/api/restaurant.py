@@ -8,20 +8,35 @@ import uuid
 import os
 import tempfile
 from datetime import datetime
+from pathlib import Path
+from celery.result import AsyncResult
 
 from app.models.base import get_db
 from app.models import RestaurantProfile, MenuItem, SalesData, Tenant
-from app.services import MenuImportService, SalesImportService
+from app.services import MenuImportService
 from app.services.restaurant_intelligence_service import RestaurantIntelligenceService
 from app.services.post_suggestion_service import PostSuggestionService
 from app.services.content_calendar_service import ContentCalendarService
 from app.services.asset_service import AssetService
 from app.services.folder_service import FolderService
+from app.tasks import celery_app, run_sales_import
+from app.utils.cache import get_redis
 from app.utils.logger import get_logger
 
 router = APIRouter(prefix="/api/v1/restaurant", tags=["restaurant"])
 logger = get_logger(__name__)
 
+# Uploaded sales files waiting for a worker (must be shared with Celery workers)
+SALES_IMPORT_DIR = Path(os.getenv("SALES_IMPORT_DIR", "uploads/imports"))
+
+# Seconds to remember which tenant owns an import job (Celery's default result_expires)
+IMPORT_JOB_OWNER_TTL = 24 * 3600
+
+
+def _import_job_owner_key(job_id: str) -> str:
+    """Build the Redis key holding the tenant that queued an import job."""
+    return f"import_job:{job_id}:tenant"
+
 
 # Response Models
 class RestaurantProfileResponse(BaseModel):
@@ -84,6 +99,15 @@ class ImportResponse(BaseModel):
     error: Optional[str] = None
 
 
+class ImportJobResponse(BaseModel):
+    """Queued/running import job response."""
+
+    job_id: str
+    status: str
+    result: Optional[ImportResponse] = None
+    error: Optional[str] = None
+
+
 class AnalysisResponse(BaseModel):
     """AI analysis response."""
 
@@ -185,14 +209,17 @@ async def import_menu_data(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/{tenant_id}/import/sales", response_model=ImportResponse)
+@router.post("/{tenant_id}/import/sales", response_model=ImportJobResponse, status_code=202)
 async def import_sales_data(
     tenant_id: str,
     file: UploadFile = File(..., description="Innowi POS order history Excel file"),
     db: Session = Depends(get_db),
 ):
     """
-    Import sales/order history from Innowi POS Excel file.
+    Queue an import of sales/order history from an Innowi POS Excel file.
+
+    The file is parsed and written by a Celery worker; poll
+    GET /{tenant_id}/import/jobs/{job_id} for the result.
 
     Args:
         tenant_id: Tenant UUID
@@ -200,10 +227,10 @@ async def import_sales_data(
         db: Database session
 
     Returns:
-        Import statistics
+        Import job ID and status
 
     Raises:
-        HTTPException: If tenant not found or import fails
+        HTTPException: If tenant not found or the file cannot be queued
     """
     logger.info(f"Importing sales data for tenant {tenant_id}")
 
@@ -216,39 +243,69 @@ async def import_sales_data(
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="File must be Excel format (.xlsx or .xls)")
 
-    # Save uploaded file temporarily
+    # Save uploaded file where the worker can read it (removed by the task)
+    file_path = SALES_IMPORT_DIR / f"{uuid.uuid4()}{Path(file.filename).suffix}"
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
+        SALES_IMPORT_DIR.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(await file.read())
 
-        # Import sales data
-        sales_service = SalesImportService()
-        result = await sales_service.import_sales_from_excel(
-            db=db,
-            file_path=tmp_file_path,
-            tenant_id=tenant_id,
-        )
+        # Record the owning tenant before the job exists, so its result is never readable by another tenant
+        redis_client = get_redis()
+        if redis_client is None:
+            raise RuntimeError("Redis is not configured; import jobs cannot be tracked")
+        job_id = str(uuid.uuid4())
+        redis_client.setex(_import_job_owner_key(job_id), IMPORT_JOB_OWNER_TTL, str(uuid.UUID(tenant_id)))
 
-        # Clean up temp file
-        os.unlink(tmp_file_path)
+        task = run_sales_import.apply_async(args=[str(file_path), tenant_id], task_id=job_id)
 
-        logger.info(f"Sales import completed for tenant {tenant_id}: {result.get('orders_imported', 0)} orders")
+        logger.info(f"Sales import queued for tenant {tenant_id}: job {task.id}")
 
-        return ImportResponse(**result)
+        return ImportJobResponse(job_id=task.id, status=task.status)
 
     except Exception as e:
-        logger.error(f"Error importing sales data: {e}")
-        # Clean up temp file if it exists
-        if 'tmp_file_path' in locals() and os.path.exists(tmp_file_path):
-            os.unlink(tmp_file_path)
+        logger.error(f"Error queueing sales import: {e}")
+        if file_path.exists():
+            file_path.unlink()
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{tenant_id}/import/jobs/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(tenant_id: str, job_id: str):
+    """
+    Get the status of a queued import job.
+
+    Args:
+        tenant_id: Tenant UUID
+        job_id: Job ID returned when the import was queued
+
+    Returns:
+        Job status, with import statistics once finished
+
+    Raises:
+        HTTPException: If the job does not exist for this tenant
+    """
+    redis_client = get_redis()
+    owner = redis_client.get(_import_job_owner_key(job_id)) if redis_client is not None else None
+    try:
+        owned = owner is not None and owner.decode() == str(uuid.UUID(tenant_id))
+    except ValueError:
+        owned = False
+    if not owned:
+        raise HTTPException(status_code=404, detail="Import job not found")
+
+    job = AsyncResult(job_id, app=celery_app)
+
+    if job.successful():
+        return ImportJobResponse(job_id=job_id, status=job.status, result=ImportResponse(**job.result))
+    if job.failed():
+        return ImportJobResponse(job_id=job_id, status=job.status, error=str(job.result))
+    return ImportJobResponse(job_id=job_id, status=job.status)
+
+
 @router.post("/{tenant_id}/analyze", response_model=AnalysisResponse)
 async def analyze_restaurant(
     tenant_id: str,
+    force: bool = Query(False, description="Re-run the analysis even if menu and sales data are unchanged"),
     db: Session = Depends(get_db),
 ):
     """
@@ -261,6 +318,7 @@ async def analyze_restaurant(
 
     Args:
         tenant_id: Tenant UUID
+        force: Skip the stored and cached analysis and call OpenAI again
         db: Database session
 
     Returns:
@@ -282,6 +340,7 @@ async def analyze_restaurant(
         result = await intelligence_service.analyze_restaurant(
             db=db,
             tenant_id=tenant_id,
+            force=force,
         )
 
         if not result.get('success'):
@@ -12,6 +12,9 @@ from dotenv import load_dotenv
 
 from app.api import tenants, oauth, accounts, posts, assets, restaurant
 from app.models.base import engine, Base
+from app.services.post_suggestion_service import PostSuggestionService
+from app.services.restaurant_intelligence_service import RestaurantIntelligenceService
+from app.utils.image_downloader import ImageDownloader
 from app.utils.logger import setup_logging, get_logger
 
 # Load environment variables
@@ -189,6 +192,9 @@ async def startup_event():
 async def shutdown_event():
     """Application shutdown tasks."""
     logger.info("Shutting down Multi-Tenant OAuth Social Media Automation API")
+    await PostSuggestionService.close_http_client()
+    await RestaurantIntelligenceService.close_client()
+    await ImageDownloader.close_http_client()
 
 
 # Root endpoint
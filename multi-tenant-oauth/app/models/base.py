@@ -16,11 +16,13 @@ if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is required")
 
 # Create SQLAlchemy engine
+# Pool sizes are tunable so Celery workers can match their concurrency
 engine = create_engine(
     DATABASE_URL,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
     pool_pre_ping=True,  # Verify connections before using
+    pool_recycle=1800,  # Replace connections older than 30 minutes
     echo=os.getenv("DEBUG", "False").lower() == "true",  # Log SQL queries in debug mode
 )
 
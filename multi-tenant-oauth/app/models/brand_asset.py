@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Text, Index, BigInteger
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Text, Index, BigInteger, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -44,6 +44,9 @@ class BrandAsset(Base):
     tags = Column(JSONB, default=[])  # Array of tag strings
     asset_metadata = Column(JSONB, default={})  # Additional flexible metadata
 
+    # AI generation (SHA-256 of the DALL-E prompt, for reusing identical generations)
+    prompt_hash = Column(String(64))
+
     # Usage tracking
     times_used = Column(Integer, default=0)  # How many posts used this asset
     last_used_at = Column(DateTime)  # When last used in a post
@@ -61,7 +64,13 @@ class BrandAsset(Base):
     __table_args__ = (
         Index("idx_brand_assets_tenant", "tenant_id", "created_at"),
         Index("idx_brand_assets_folder", "folder_id"),
-        Index("idx_brand_assets_tags", "tags", postgresql_using="gin"),  # GIN index for JSONB
+        # GIN index for JSONB containment (@>); jsonb_path_ops is smaller and faster for @>
+        Index("idx_brand_assets_tags", "tags", postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}),
+        # Supports "least recently used asset for tenant" selection without a sort
+        Index("idx_brand_assets_tenant_last_used", "tenant_id", last_used_at.asc().nulls_last()),
+        Index("idx_brand_assets_tenant_prompt_hash", "tenant_id", "prompt_hash"),
+        # Partial index for assets still pointing at non-S3 URLs (fix_brand_assets_urls.py)
+        Index("idx_brand_assets_file_url_non_s3", "id", postgresql_where=text("file_url NOT LIKE '%s3%'")),
     )
 
     def __repr__(self):
@@ -2,8 +2,8 @@
 
 import uuid
 from datetime import datetime, date, time
-from sqlalchemy import Column, String, Text, DateTime, Date, Time, ForeignKey, UUID
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy import Column, String, Text, DateTime, Date, Time, ForeignKey, UUID, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.models.base import Base
@@ -14,9 +14,9 @@ class CalendarPost(Base):
 
     __tablename__ = "calendar_posts"
 
-    id = Column(UUID, primary_key=True, default=uuid.uuid4)
+    id = Column(UUID, primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     calendar_id = Column(UUID, ForeignKey("content_calendars.id", ondelete="CASCADE"), nullable=False, index=True)
-    tenant_id = Column(UUID, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False, index=True)
+    tenant_id = Column(UUID, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
 
     # Post content
     post_type = Column(String(50), nullable=False)  # promotional, product_showcase, etc.
@@ -24,20 +24,20 @@ class CalendarPost(Base):
     post_text = Column(Text, nullable=False)
 
     # Scheduling
-    scheduled_date = Column(Date, nullable=False, index=True)
+    scheduled_date = Column(Date, nullable=False)
     scheduled_time = Column(Time, nullable=False)
     platform = Column(String(50), nullable=False, default="both")  # facebook, instagram, both
 
     # Status
-    status = Column(String(50), nullable=False, default="draft", index=True)  # draft, approved, rejected, published, failed
+    status = Column(String(50), nullable=False, default="draft")  # draft, approved, publishing, rejected, published, failed
 
     # Media
     image_url = Column(String(500), nullable=True)
     asset_id = Column(UUID, ForeignKey("brand_assets.id", ondelete="SET NULL"), nullable=True)
 
     # Additional data
-    featured_items = Column(JSON, nullable=True)  # List of menu item names
-    hashtags = Column(JSON, nullable=True)  # List of hashtags
+    featured_items = Column(JSONB, nullable=True)  # List of menu item names
+    hashtags = Column(JSONB, nullable=True)  # List of hashtags
     call_to_action = Column(String(255), nullable=True)
     reason = Column(Text, nullable=True)  # Why this post was suggested
     generated_by = Column(String(50), nullable=True, default="template")  # "openai" or "template" for debugging
@@ -46,7 +46,7 @@ class CalendarPost(Base):
     platform_post_id = Column(String(255), nullable=True)
     published_at = Column(DateTime, nullable=True)
     error_message = Column(Text, nullable=True)
-    engagement_metrics = Column(JSON, nullable=True)
+    engagement_metrics = Column(JSONB, nullable=True)
 
     # Timestamps
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -57,5 +57,17 @@ class CalendarPost(Base):
     tenant = relationship("Tenant")
     asset = relationship("BrandAsset")
 
+    # Indexes
+    __table_args__ = (
+        # Tenant lookups (and tenant cascade deletes) use the tenant_id prefix
+        Index("ix_calendar_posts_tenant_date", "tenant_id", "scheduled_date"),
+        # Due-post lookup: status = 'approved' AND scheduled_date + scheduled_time <= now
+        Index(
+            "idx_calendar_posts_due",
+            text("(scheduled_date + scheduled_time)"),
+            postgresql_where=text("status = 'approved'"),
+        ),
+    )
+
     def __repr__(self):
         return f"<CalendarPost(id={self.id}, title={self.title}, date={self.scheduled_date}, status={self.status})>"
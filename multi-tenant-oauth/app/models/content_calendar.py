@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, UUID
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, UUID, text
 from sqlalchemy.orm import relationship
 
 from app.models.base import Base
@@ -13,7 +13,7 @@ class ContentCalendar(Base):
 
     __tablename__ = "content_calendars"
 
-    id = Column(UUID, primary_key=True, default=uuid.uuid4)
+    id = Column(UUID, primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     tenant_id = Column(UUID, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Calendar period
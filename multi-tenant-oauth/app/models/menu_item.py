@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime, date
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Text, Boolean, Date, Numeric, Index
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Text, Boolean, Date, Numeric, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -13,12 +13,11 @@ class MenuItem(Base):
 
     __tablename__ = "menu_items"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     tenant_id = Column(
         UUID(as_uuid=True),
         ForeignKey("tenants.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     # Item identification (from POS)
@@ -66,9 +65,11 @@ class MenuItem(Base):
 
     # Indexes for performance
     __table_args__ = (
-        Index("ix_menu_items_tenant_id", "tenant_id"),
+        # Tenant-only lookups use the (tenant_id, ...) composite indexes by prefix
         Index("ix_menu_items_tenant_category", "tenant_id", "category"),
         Index("ix_menu_items_tenant_popularity", "tenant_id", "popularity_rank"),
+        # Partial index for the S3 URL backfill join (fix_brand_assets_urls.py)
+        Index("ix_menu_items_image_url_s3", "asset_id", postgresql_where=text("image_url LIKE '%s3%'")),
     )
 
     def __repr__(self):
@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Integer, Text, CheckConstraint, Index
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Integer, Text, CheckConstraint, Index, and_
 from sqlalchemy.dialects.postgresql import UUID, INET
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -73,6 +73,17 @@ class OAuthToken(Base):
             "expires_at",
             postgresql_where=(expires_at != None),
         ),
+        Index(
+            "idx_oauth_tokens_expiring",
+            "expires_at",
+            postgresql_where=and_(is_revoked == False, expires_at != None),
+        ),
+        Index(
+            "idx_oauth_tokens_account_issued",
+            "social_account_id",
+            issued_at.desc(),
+            postgresql_where=(is_revoked == False),
+        ),
     )
 
     def __repr__(self):
@@ -46,6 +46,7 @@ class PostHistory(Base):
     )
     posted_at = Column(DateTime)
     scheduled_for = Column(DateTime)
+    claimed_at = Column(DateTime)  # When the scheduler claimed the post for publishing
     error_message = Column(Text)
 
     # Engagement metrics (likes, comments, shares, etc.)
@@ -61,10 +62,21 @@ class PostHistory(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint(
-            "status IN ('pending', 'published', 'failed', 'deleted', 'scheduled')",
+            "status IN ('pending', 'published', 'failed', 'deleted', 'scheduled', 'publishing')",
             name="check_post_status",
         ),
         Index("idx_post_history_posted_date", "tenant_id", "posted_at"),
+        Index(
+            "idx_post_history_scheduled_due",
+            "scheduled_for",
+            postgresql_where=(status == "scheduled"),
+        ),
+        # Stale-claim sweep (status = 'publishing' AND claimed_at < cutoff)
+        Index(
+            "idx_post_history_publishing_claimed",
+            "claimed_at",
+            postgresql_where=(status == "publishing"),
+        ),
     )
 
     def __repr__(self):
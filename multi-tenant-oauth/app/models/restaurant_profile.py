@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Boolean, Index, UniqueConstraint
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Boolean, Index, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -13,7 +13,7 @@ class RestaurantProfile(Base):
 
     __tablename__ = "restaurant_profiles"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     tenant_id = Column(
         UUID(as_uuid=True),
         ForeignKey("tenants.id", ondelete="CASCADE"),
@@ -32,6 +32,10 @@ class RestaurantProfile(Base):
     brand_analysis = Column(JSONB)  # Brand personality, voice, themes, tone
     sales_insights = Column(JSONB)  # Slow days, peak hours, bestsellers, trends
     content_strategy = Column(JSONB)  # What to post, when to post, content themes
+    analysis_fingerprint = Column(String(64))  # Hash of the menu/sales data the analysis was built from
+    analyzed_at = Column(DateTime)  # When the AI analysis was last generated
+    analyzed_menu_items_count = Column(Integer)  # Menu items covered by the analysis
+    analyzed_orders_count = Column(Integer)  # Orders covered by the analysis
 
     # Import metadata
     last_menu_import = Column(DateTime)
@@ -54,6 +58,7 @@ class RestaurantProfile(Base):
     __table_args__ = (
         UniqueConstraint("tenant_id", name="uq_restaurant_profiles_tenant_id"),
         Index("ix_restaurant_profiles_tenant_id", "tenant_id"),
+        Index("ix_restaurant_profiles_analyzed_at", "analyzed_at"),
     )
 
     def __repr__(self):
@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Numeric, Index
+from sqlalchemy import Column, String, DateTime, ForeignKey, Numeric, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -13,7 +13,7 @@ class SalesData(Base):
 
     __tablename__ = "sales_data"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     tenant_id = Column(
         UUID(as_uuid=True),
         ForeignKey("tenants.id", ondelete="CASCADE"),
@@ -49,7 +49,14 @@ class SalesData(Base):
     # Indexes for analytics queries
     __table_args__ = (
         Index("ix_sales_data_tenant_id", "tenant_id"),
-        Index("ix_sales_data_tenant_date", "tenant_id", "order_date"),
+        # BRIN: imports COPY each tenant's orders contiguously in report (date) order, so block ranges stay tight
+        Index(
+            "ix_sales_data_tenant_date",
+            "tenant_id",
+            "order_date",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
         Index("ix_sales_data_tenant_amount", "tenant_id", "total_amount"),
     )
 
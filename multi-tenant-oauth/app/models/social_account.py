@@ -51,7 +51,7 @@ class SocialAccount(Base):
             "platform_account_id",
             unique=True,
         ),
-        Index("idx_social_accounts_tenant_platform", "tenant_id", "platform"),
+        Index("idx_social_accounts_tenant_platform_active", "tenant_id", "platform", "is_active"),
     )
 
     def __repr__(self):
@@ -12,6 +12,7 @@ import io
 from app.models import BrandAsset, AssetFolder
 from app.services.image_service import ImageService
 from app.utils.image_downloader import ImageDownloader
+from app.utils.cache import invalidate_brand_assets
 
 
 class AssetService:
@@ -72,6 +73,7 @@ class AssetService:
         db.add(asset)
         db.commit()
         db.refresh(asset)
+        invalidate_brand_assets(asset.tenant_id)
 
         return asset
 
@@ -150,6 +152,7 @@ class AssetService:
         db.add(asset)
         db.commit()
         db.refresh(asset)
+        invalidate_brand_assets(asset.tenant_id)
 
         return asset
 
@@ -231,10 +234,9 @@ class AssetService:
                 )
             )
 
-        # Tags filter (JSONB containment)
+        # Tags filter (single JSONB containment over all tags, one GIN probe)
         if tags:
-            for tag in tags:
-                query = query.filter(BrandAsset.tags.contains([tag]))
+            query = query.filter(BrandAsset.tags.contains(list(tags)))
 
         # Order by most recent first
         query = query.order_by(desc(BrandAsset.created_at))
@@ -282,6 +284,7 @@ class AssetService:
 
         db.commit()
         db.refresh(asset)
+        invalidate_brand_assets(asset.tenant_id)
 
         return asset
 
@@ -325,8 +328,10 @@ class AssetService:
             print(f"Error deleting file: {e}")
 
         # Delete database record
+        tenant_id = asset.tenant_id
         db.delete(asset)
         db.commit()
+        invalidate_brand_assets(tenant_id)
 
         return True
 
@@ -376,6 +381,7 @@ class AssetService:
 
         db.commit()
         db.refresh(asset)
+        invalidate_brand_assets(asset.tenant_id)
 
         return asset
 
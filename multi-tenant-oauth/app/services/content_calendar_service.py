@@ -2,6 +2,7 @@
 
 from typing import Dict, List, Any
 import uuid
+import asyncio
 import calendar
 from datetime import datetime, date, time, timedelta
 from sqlalchemy.orm import Session
@@ -214,6 +215,7 @@ class ContentCalendarService:
             # Update calendar totals
             content_calendar.total_posts = len(posts)
             db.commit()
+            self.suggestion_service.invalidate_committed_assets()
 
             logger.info(f"Generated calendar {content_calendar.id} with {len(posts)} posts for {year}-{month:02d}")
 
@@ -354,6 +356,7 @@ class ContentCalendarService:
             step = gen_log.add_step("save_calendar", "⏳ Saving calendar to database...")
             content_calendar.total_posts = len(posts)
             db.commit()
+            self.suggestion_service.invalidate_committed_assets()
 
             step.complete({"total_posts": len(posts)})
             step.metadata["current_status"] = f"✓ Calendar saved with {len(posts)} posts"
@@ -478,7 +481,24 @@ class ContentCalendarService:
         # This respects target_day preferences while ensuring even distribution
         post_schedule = self._smart_day_distribution(suggestions, year, month)
 
-        for suggestion, day_number in post_schedule:
+        # Get images for all posts concurrently (hybrid: assets first, then AI).
+        # AI generation is bounded by the suggestion service's semaphore.
+        post_images = await asyncio.gather(*[
+            self.suggestion_service._get_post_image(
+                db=db,
+                tenant_id=tenant_id,
+                post_type=suggestion.get('type', 'general'),
+                featured_items=suggestion.get('featured_items', []),
+                post_text=suggestion.get('post_text', ''),
+                profile=profile,
+            )
+            for suggestion, _ in post_schedule
+        ])
+
+        # Persist any AI-generated brand assets in one bulk insert
+        self.suggestion_service.finalize(db)
+
+        for (suggestion, day_number), (asset_id, image_url) in zip(post_schedule, post_images):
             post_date = date(year, month, day_number)
             day_name = post_date.strftime('%A')
 
@@ -490,16 +510,6 @@ class ContentCalendarService:
                 busiest_days,
             )
 
-            # Get image for post (hybrid: assets first, then AI)
-            asset_id, image_url = await self.suggestion_service._get_post_image(
-                db=db,
-                tenant_id=tenant_id,
-                post_type=suggestion.get('type', 'general'),
-                featured_items=suggestion.get('featured_items', []),
-                post_text=suggestion.get('post_text', ''),
-                profile=profile,
-            )
-
             # Create calendar post
             calendar_post = CalendarPost(
                 id=uuid.uuid4(),
@@ -954,6 +964,7 @@ class ContentCalendarService:
         self,
         db: Session,
         post_id: str,
+        claimed: bool = False,
     ) -> Dict[str, Any]:
         """
         Publish a calendar post to social media.
@@ -961,6 +972,7 @@ class ContentCalendarService:
         Args:
             db: Database session
             post_id: Post UUID
+            claimed: Post was already moved to 'publishing' by the auto-publish task
 
         Returns:
             Dict with success status and results
@@ -976,7 +988,9 @@ class ContentCalendarService:
                     "error": "Post not found"
                 }
 
-            if post.status != "approved":
+            # A claimed post whose claim was released (status back to 'approved') is skipped
+            allowed_statuses = ("publishing",) if claimed else ("approved",)
+            if post.status not in allowed_statuses:
                 return {
                     "success": False,
                     "error": f"Post status is '{post.status}', must be 'approved' to publish"
@@ -2,8 +2,9 @@
 
 import os
 import uuid
+from io import BytesIO
 from pathlib import Path
-from typing import Optional
+from typing import Optional, BinaryIO
 import shutil
 from fastapi import UploadFile
 
@@ -97,6 +98,25 @@ class ImageService:
             filename: Filename to use
             tenant_id: Tenant UUID
 
+        Returns:
+            Tuple of (file_path, public_url)
+        """
+        return await self.save_image_stream(BytesIO(image_bytes), filename, tenant_id)
+
+    async def save_image_stream(
+        self,
+        fileobj: BinaryIO,
+        filename: str,
+        tenant_id: str,
+    ) -> tuple[str, str]:
+        """
+        Save image from a binary file object without reading it fully into memory.
+
+        Args:
+            fileobj: Readable binary file object positioned at the start of the image
+            filename: Filename to use
+            tenant_id: Tenant UUID
+
         Returns:
             Tuple of (file_path, public_url)
         """
@@ -109,17 +129,18 @@ class ImageService:
 
         if self.use_s3:
             # Upload to S3
-            from io import BytesIO
-            file_url = await self._upload_bytes_to_s3(image_bytes, relative_path, f"image/{file_extension.lstrip('.')}")
+            image_format = file_extension.lstrip('.').lower()
+            content_type = "image/jpeg" if image_format == "jpg" else f"image/{image_format}"
+            file_url = await self._upload_fileobj_to_s3(fileobj, relative_path, content_type)
             return relative_path, file_url
         else:
             # Save locally
             file_path = self.local_upload_dir / relative_path
             file_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Write bytes to file
+            # Copy stream to file
             with file_path.open("wb") as f:
-                f.write(image_bytes)
+                shutil.copyfileobj(fileobj, f)
 
             # Generate URL
             base_url = os.getenv("API_URL", "http://localhost:8000")
@@ -127,14 +148,12 @@ class ImageService:
 
             return str(relative_path), file_url
 
-    async def _upload_bytes_to_s3(self, image_bytes: bytes, key: str, content_type: str) -> str:
-        """Upload bytes to S3."""
+    async def _upload_fileobj_to_s3(self, fileobj: BinaryIO, key: str, content_type: str) -> str:
+        """Upload a binary file object to S3."""
         try:
-            from io import BytesIO
-
             # Upload to S3
             self.s3_client.upload_fileobj(
-                BytesIO(image_bytes),
+                fileobj,
                 self.bucket_name,
                 key,
                 ExtraArgs={
@@ -122,7 +122,7 @@ class MenuImportService:
             return {}
 
         categories = {}
-        for _, row in df.iterrows():
+        for row in df.to_dict('records'):
             try:
                 cat_id = str(row.get('ID', ''))
                 cat_name = str(row.get('Name', ''))
@@ -148,7 +148,7 @@ class MenuImportService:
             return []
 
         items = []
-        for _, row in df.iterrows():
+        for row in df.to_dict('records'):
             try:
                 # Skip rows with NaN ID (header rows or empty rows)
                 if pd.isna(row.get('ID')):
@@ -178,12 +178,12 @@ class MenuImportService:
 
         return items
 
-    def _find_item_category(self, row: pd.Series) -> Optional[str]:
+    def _find_item_category(self, row: Dict[str, Any]) -> Optional[str]:
         """
         Infer category from item name using keyword matching.
 
         Args:
-            row: DataFrame row
+            row: Item row
 
         Returns:
             Category name or None
@@ -224,7 +224,7 @@ class MenuImportService:
             return {}
 
         modifier_groups = {}
-        for _, row in df.iterrows():
+        for row in df.to_dict('records'):
             try:
                 group_name = str(row.get('Group Name', ''))
                 modifier_name = str(row.get('Name', ''))
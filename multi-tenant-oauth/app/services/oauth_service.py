@@ -12,6 +12,7 @@ from urllib.parse import urlencode
 from sqlalchemy.orm import Session
 
 from app.models import Tenant, SocialAccount, OAuthToken, OAuthState
+from app.services.token_service import invalidate_cached_tokens
 from app.utils.encryption import get_encryption_service
 from app.utils.logger import get_logger
 
@@ -419,6 +420,7 @@ class OAuthService:
             db.add(oauth_token)
 
         db.commit()
+        invalidate_cached_tokens(tenant_id)
 
         result = {
             "platform": "facebook",
@@ -545,6 +547,7 @@ class OAuthService:
             db.add(oauth_token)
 
         db.commit()
+        invalidate_cached_tokens(tenant_id)
 
         return {
             "platform": "instagram",
@@ -601,5 +604,6 @@ class OAuthService:
         social_account.is_active = False
 
         db.commit()
+        invalidate_cached_tokens(tenant_id)
 
         return True
@@ -1,35 +1,130 @@
 """Post Suggestion Service - Context-aware social media post recommendations."""
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple, BinaryIO
 import uuid
-from datetime import datetime, timedelta
+import functools
+import hashlib
+import asyncio
+import tempfile
+from datetime import datetime
+from sqlalchemy import select, insert
 from sqlalchemy.orm import Session
 import logging
-from openai import OpenAI
 import os
-import json
+import httpx
+from PIL import Image
 
-from app.models import RestaurantProfile, MenuItem, SalesData, Tenant, BrandAsset
+from app.models import RestaurantProfile, MenuItem, BrandAsset
 from app.services.image_service import ImageService
-import requests
+from app.utils.cache import cache_get_json, cache_set_json, get_tag_version, invalidate_brand_assets
+from app.utils.retry import retry_transient
 
 logger = logging.getLogger(__name__)
 
+# Images larger than this (bytes) are spooled to disk instead of memory
+SPOOL_MAX_MEMORY = 1024 * 1024
+
+
+@functools.lru_cache(maxsize=1024)
+def _image_prompt_skeleton(
+    tenant_id: str,
+    name: Optional[str],
+    cuisine_type: Optional[str],
+    ai_style: str,
+    updated_at_ts: Optional[float],
+) -> str:
+    """
+    Build the per-tenant DALL-E prompt template.
+
+    tenant_id and updated_at_ts are only part of the cache key, so an edited
+    profile gets a fresh template. The result has {post_type} and {post_text}
+    placeholders; braces in profile values are escaped.
+    """
+    def esc(value: Any) -> str:
+        return str(value).replace("{", "{{").replace("}", "}}")
+
+    return (
+        "Create a professional {post_type} image for a restaurant social media post.\n"
+        f"Restaurant: {esc(name)}\n"
+        f"Cuisine: {esc(cuisine_type or 'casual dining')}\n"
+        "Post: {post_text}\n"
+        f"Style: {esc(ai_style)}\n"
+        f"Requirements: High quality, appetizing, Instagram-ready, {esc(cuisine_type or 'food')} focused"
+    )
+
+
+def _prompt_hash(prompt: str) -> str:
+    """Hash a DALL-E prompt (whitespace-normalized) for generation dedup."""
+    return hashlib.sha256(" ".join(prompt.split()).encode("utf-8")).hexdigest()
+
+
+def _transcode_to_jpeg(image_file: BinaryIO, quality: int = 85) -> Tuple[BinaryIO, int, int, int]:
+    """
+    Re-encode an image as an optimized progressive JPEG.
+
+    Returns:
+        Tuple of (jpeg_file rewound to start, size_bytes, width, height)
+    """
+    image = Image.open(image_file).convert("RGB")
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    image.save(output, "JPEG", quality=quality, optimize=True, progressive=True)
+    size = output.tell()
+    output.seek(0)
+    return output, size, image.width, image.height
+
 
 class PostSuggestionService:
     """Generate intelligent post suggestions based on restaurant context."""
 
+    # Upper bound (seconds) for downloading a generated DALL-E image
+    IMAGE_DOWNLOAD_TIMEOUT = 60
+
+    # How long (seconds) brand-asset lookups are cached in Redis
+    BRAND_ASSET_CACHE_TTL = 60
+
+    # Shared async HTTP client for image downloads (created lazily)
+    _http_client: Optional[httpx.AsyncClient] = None
+    _http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
     def __init__(self):
         """Initialize post suggestion service."""
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         if self.openai_api_key:
+            # Imported lazily so deployments without a key never load the SDK
+            from openai import OpenAI
             self.client = OpenAI(api_key=self.openai_api_key)
         else:
             self.client = None
         self.image_service = ImageService()
+        # Bound concurrent DALL-E generations (and downloads) to respect rate limits
+        self._ai_semaphore = asyncio.Semaphore(int(os.getenv("AI_IMG_CONCURRENCY", "5")))
+        # Generated brand assets awaiting a bulk insert (see finalize)
+        self._pending_assets: List[Dict[str, Any]] = []
+        # Tenants whose inserted assets are not committed yet (see invalidate_committed_assets)
+        self._uncommitted_asset_tenants: Set[uuid.UUID] = set()
         # Store OpenAI request/response data for logging
         self.openai_calls = []
 
+    @classmethod
+    def _get_http_client(cls) -> httpx.AsyncClient:
+        """Return the shared async HTTP client, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if cls._http_client is None or cls._http_client.is_closed or cls._http_client_loop is not loop:
+            cls._http_client = httpx.AsyncClient(
+                timeout=cls.IMAGE_DOWNLOAD_TIMEOUT,
+                follow_redirects=True,
+            )
+            cls._http_client_loop = loop
+        return cls._http_client
+
+    @classmethod
+    async def close_http_client(cls):
+        """Close the shared async HTTP client (call on application shutdown)."""
+        if cls._http_client is not None and not cls._http_client.is_closed:
+            await cls._http_client.aclose()
+        cls._http_client = None
+        cls._http_client_loop = None
+
     # Text length presets
     TEXT_LENGTH_PRESETS = {
         'short': {
@@ -106,7 +201,7 @@ class PostSuggestionService:
                 profile, menu_items, count, text_length
             )
 
-            logger.info(f"Generated {len(suggestions)} post suggestions for tenant {tenant_id} with {text_length} length")
+            logger.info("Generated %d post suggestions for tenant %s with %s length", len(suggestions), tenant_id, text_length)
 
             return {
                 "success": True,
@@ -116,7 +211,7 @@ class PostSuggestionService:
             }
 
         except Exception as e:
-            logger.error(f"Error generating post suggestions: {e}")
+            logger.exception("Error generating post suggestions")
             return {
                 "success": False,
                 "error": str(e),
@@ -620,7 +715,6 @@ Write a compelling social media post ({length_preset['sentences']} sentences, ma
             }
 
             # Call OpenAI API
-            from datetime import datetime
             start_time = datetime.now()
             response = self.client.chat.completions.create(**request_params)
             end_time = datetime.now()
@@ -673,8 +767,8 @@ Write a compelling social media post ({length_preset['sentences']} sentences, ma
 
             return post_text, "openai"
 
-        except Exception as e:
-            logger.error(f"Error generating post with AI: {e}")
+        except Exception:
+            logger.exception("Error generating post with AI")
             return self._template_generic_post(context.get('restaurant_name', 'Our Restaurant')), "template"
 
     def _build_rich_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -691,15 +785,21 @@ Write a compelling social media post ({length_preset['sentences']} sentences, ma
         menu_items = context.get('menu_items', [])
         if menu_items:
             menu_text = []
-            for item in menu_items[:5]:  # Top 5 items
+            # Enforce a total order so identical menus always serialize to the
+            # same prompt prefix (ties on popularity_rank are otherwise unordered)
+            top_items = sorted(
+                menu_items[:5],  # Top 5 items
+                key=lambda i: (getattr(i, 'popularity_rank', None) or 1 << 30, str(getattr(i, 'id', ''))),
+            )
+            for item in top_items:
                 if hasattr(item, 'name'):
                     desc = f"  - {item.name}"
                     if hasattr(item, 'category') and item.category:
                         desc += f" ({item.category})"
                     if hasattr(item, 'description') and item.description:
-                        desc += f": {item.description[:50]}"
+                        desc += f": {item.description[:50].strip()}"
                     if hasattr(item, 'price') and item.price:
-                        desc += f" - ${item.price}"
+                        desc += f" - ${float(item.price):.2f}"
                     menu_text.append(desc)
             rich['menu_context'] = "\n".join(menu_text) if menu_text else "Various delicious items"
 
@@ -790,7 +890,7 @@ Write a compelling social media post ({length_preset['sentences']} sentences, ma
                     db, tenant_id, post_type, featured_items
                 )
                 if asset_id or image_url:
-                    logger.info(f"Using existing asset for post: {asset_id or image_url}")
+                    logger.info("Using existing asset for post: %s", asset_id or image_url)
                     return asset_id, image_url
 
             # Generate AI image if assets_only is not set
@@ -799,14 +899,14 @@ Write a compelling social media post ({length_preset['sentences']} sentences, ma
                     db, tenant_id, post_type, post_text, profile
                 )
                 if image_url:
-                    logger.info(f"Generated AI image for post: {image_url}")
+                    logger.info("Generated AI image for post: %s", image_url)
                     return None, image_url
 
-            logger.info(f"No image found/generated for post type: {post_type}")
+            logger.info("No image found/generated for post type: %s", post_type)
             return None, None
 
-        except Exception as e:
-            logger.error(f"Error getting post image: {e}")
+        except Exception:
+            logger.exception("Error getting post image")
             return None, None
 
     async def _select_existing_image(
@@ -823,19 +923,24 @@ Write a compelling social media post ({length_preset['sentences']} sentences, ma
             Tuple of (asset_id, image_url)
         """
         try:
+            tenant_uuid = uuid.UUID(tenant_id)
+
             # First, try to find menu item images for featured items
             if featured_items:
                 for item_name in featured_items:
-                    menu_item = db.query(MenuItem).filter(
-                        MenuItem.tenant_id == uuid.UUID(tenant_id),
-                        MenuItem.name == item_name,
-                        MenuItem.image_url.isnot(None)
-                    ).first()
-
-                    if menu_item and menu_item.image_url:
-                        logger.info(f"Found menu item image for {item_name}: {menu_item.image_url}")
+                    # Select only the column we need instead of hydrating a MenuItem
+                    image_url = db.execute(
+                        select(MenuItem.image_url).where(
+                            MenuItem.tenant_id == tenant_uuid,
+                            MenuItem.name == item_name,
+                            MenuItem.image_url.isnot(None)
+                        ).limit(1)
+                    ).scalar_one_or_none()
+
+                    if image_url:
+                        logger.info("Found menu item image for %s: %s", item_name, image_url)
                         # Prioritize direct S3 URL over asset_id to avoid ngrok URLs
-                        return None, menu_item.image_url
+                        return None, image_url
 
             # Try to find brand assets with relevant tags
             tag_queries = []
@@ -845,35 +950,70 @@ Write a compelling social media post ({length_preset['sentences']} sentences, ma
                 tag_queries.extend(featured_items)
 
             if tag_queries:
-                # Search for assets with matching tags
-                asset = db.query(BrandAsset).filter(
-                    BrandAsset.tenant_id == uuid.UUID(tenant_id),
-                    BrandAsset.tags.contains(tag_queries)
-                ).order_by(
-                    BrandAsset.last_used_at.nulls_last()
-                ).first()
-
-                if asset:
-                    logger.info(f"Found brand asset with tags: {asset.id}")
-                    return asset.id, asset.file_url
+                asset_id, file_url = self._find_brand_asset(db, tenant_uuid, tag_queries)
+                if asset_id:
+                    logger.info("Found brand asset with tags: %s", asset_id)
+                    return asset_id, file_url
 
             # Fallback: get a random general brand asset
-            general_asset = db.query(BrandAsset).filter(
-                BrandAsset.tenant_id == uuid.UUID(tenant_id)
-            ).order_by(
-                BrandAsset.last_used_at.nulls_last()
-            ).first()
-
-            if general_asset:
-                logger.info(f"Using general brand asset: {general_asset.id}")
-                return general_asset.id, general_asset.file_url
+            asset_id, file_url = self._find_brand_asset(db, tenant_uuid, [])
+            if asset_id:
+                logger.info("Using general brand asset: %s", asset_id)
+                return asset_id, file_url
 
             return None, None
 
-        except Exception as e:
-            logger.error(f"Error selecting existing image: {e}")
+        except Exception:
+            logger.exception("Error selecting existing image")
             return None, None
 
+    def _find_brand_asset(
+        self,
+        db: Session,
+        tenant_uuid: uuid.UUID,
+        tag_queries: List[str],
+    ) -> tuple[Optional[uuid.UUID], Optional[str]]:
+        """
+        Find the least recently used brand asset carrying all given tags.
+
+        Results are cached briefly in Redis and invalidated whenever the
+        tenant's brand assets change.
+
+        Args:
+            db: Database session
+            tenant_uuid: Tenant UUID
+            tag_queries: Required tags (empty for any asset)
+
+        Returns:
+            Tuple of (asset_id, file_url), or (None, None) if none found
+        """
+        version = get_tag_version(f"brand_assets:{tenant_uuid}")
+        tag_key = "|".join(sorted(tag_queries))
+        cache_key = f"brand_asset:{tenant_uuid}:v{version}:{tag_key}"
+
+        cached = cache_get_json(cache_key)
+        if cached is not None:
+            asset_id, file_url = cached
+            return (uuid.UUID(asset_id) if asset_id else None), file_url
+
+        # Lightweight row, not a full ORM object
+        stmt = select(BrandAsset.id, BrandAsset.file_url).where(
+            BrandAsset.tenant_id == tenant_uuid
+        )
+        if tag_queries:
+            stmt = stmt.where(BrandAsset.tags.contains(tag_queries))
+        asset = db.execute(
+            stmt.order_by(BrandAsset.last_used_at.nulls_last()).limit(1)
+        ).first()
+
+        asset_id, file_url = (asset.id, asset.file_url) if asset else (None, None)
+        cache_set_json(
+            cache_key,
+            [str(asset_id) if asset_id else None, file_url],
+            self.BRAND_ASSET_CACHE_TTL,
+        )
+        return asset_id, file_url
+
     async def _generate_ai_image(
         self,
         db: Session,
@@ -892,63 +1032,205 @@ Write a compelling social media post ({length_preset['sentences']} sentences, ma
             if not self.client:
                 return None
 
-            # Get AI image style from content strategy
-            content_strategy = profile.content_strategy or {}
-            ai_style = content_strategy.get('ai_image_style', 'food photography, professional, appetizing')
-
-            # Build DALL-E prompt
-            prompt = f"""Create a professional {post_type} image for a restaurant social media post.
-Restaurant: {profile.name}
-Cuisine: {profile.cuisine_type or 'casual dining'}
-Post: {post_text[:200]}
-Style: {ai_style}
-Requirements: High quality, appetizing, Instagram-ready, {profile.cuisine_type or 'food'} focused"""
-
-            logger.info(f"Generating DALL-E image with prompt: {prompt[:100]}...")
-
-            # Generate image with DALL-E 3
-            response = self.client.images.generate(
-                model="dall-e-3",
-                prompt=prompt,
-                size="1024x1024",
-                quality="standard",
-                n=1,
+            prompt = self._build_image_prompt(post_type, post_text, profile)
+            prompt_hash = _prompt_hash(prompt)
+
+            # Reuse an earlier generation of the identical prompt
+            cached_url = self._find_generated_image(db, uuid.UUID(tenant_id), prompt_hash)
+            if cached_url:
+                logger.info("Reusing AI image for identical prompt: %s", cached_url)
+                return cached_url
+
+            async with self._ai_semaphore:
+                logger.info("Generating DALL-E image with prompt: %s...", prompt[:100])
+
+                # Generate image with DALL-E 3 (off the event loop); retries come
+                # from retry_transient only, not also from the SDK's own retry loop
+                response = await retry_transient(lambda: asyncio.to_thread(
+                    self.client.with_options(max_retries=0).images.generate,
+                    model="dall-e-3",
+                    prompt=prompt,
+                    size="1024x1024",
+                    quality="standard",
+                    n=1,
+                ))
+
+                image_url = response.data[0].url
+
+                # Download and save the image without blocking the event loop
+                image_file = await retry_transient(lambda: asyncio.wait_for(
+                    self._download_image(image_url),
+                    timeout=self.IMAGE_DOWNLOAD_TIMEOUT,
+                ))
+
+            if image_file is not None:
+                with image_file:
+                    public_url = await self._save_generated_image(
+                        db, tenant_id, post_type, post_text, image_file, prompt_hash
+                    )
+
+                logger.info("Successfully generated and saved AI image: %s", public_url)
+                return public_url
+
+            return None
+
+        except Exception:
+            logger.exception("Error generating AI image")
+            return None
+
+    def _build_image_prompt(self, post_type: str, post_text: str, profile: RestaurantProfile) -> str:
+        """Build the DALL-E prompt for a post."""
+        # Get AI image style from content strategy
+        content_strategy = profile.content_strategy or {}
+        ai_style = content_strategy.get('ai_image_style', 'food photography, professional, appetizing')
+
+        skeleton = _image_prompt_skeleton(
+            str(profile.tenant_id),
+            profile.name,
+            profile.cuisine_type,
+            str(ai_style),
+            profile.updated_at.timestamp() if profile.updated_at else None,
+        )
+        return skeleton.format(post_type=post_type, post_text=post_text[:200])
+
+    async def _save_generated_image(
+        self,
+        db: Session,
+        tenant_id: str,
+        post_type: str,
+        post_text: str,
+        image_file: BinaryIO,
+        prompt_hash: Optional[str] = None,
+    ) -> str:
+        """
+        Store a generated image and record it as a brand asset.
+
+        Returns:
+            Public URL of the saved image
+        """
+        # DALL-E returns large PNGs; store a much smaller JPEG instead
+        jpeg_file, file_size, width, height = await asyncio.to_thread(_transcode_to_jpeg, image_file)
+
+        # One id for both the stored file and the asset record
+        asset_id = uuid.uuid4()
+        filename = f"ai_generated_{asset_id}.jpg"
+
+        # Save image using image service
+        with jpeg_file:
+            file_path, public_url = await self.image_service.save_image_stream(
+                jpeg_file,
+                filename,
+                tenant_id
             )
 
-            image_url = response.data[0].url
+        # Queue as brand asset for future use; written in bulk by finalize()
+        self._pending_assets.append({
+            "id": asset_id,
+            "tenant_id": uuid.UUID(tenant_id),
+            "filename": filename,
+            "file_path": file_path,
+            "file_url": public_url,
+            "file_size": file_size,
+            "mime_type": "image/jpeg",
+            "width": width,
+            "height": height,
+            "title": f"AI Generated - {post_type}",
+            "description": post_text[:200],
+            "tags": [post_type, "ai_generated"],
+            "times_used": 0,
+            "prompt_hash": prompt_hash,
+        })
+
+        return public_url
+
+    def _find_generated_image(
+        self,
+        db: Session,
+        tenant_uuid: uuid.UUID,
+        prompt_hash: str,
+    ) -> Optional[str]:
+        """
+        Find a previously generated AI image for the same prompt.
 
-            # Download and save the image
-            image_response = requests.get(image_url)
-            if image_response.status_code == 200:
-                # Save image using image service
-                file_path, public_url = await self.image_service.save_image_bytes(
-                    image_response.content,
-                    f"ai_generated_{uuid.uuid4()}.png",
-                    tenant_id
-                )
+        Args:
+            db: Database session
+            tenant_uuid: Tenant UUID
+            prompt_hash: SHA-256 of the normalized DALL-E prompt
 
-                # Optionally save as brand asset for future use
-                asset = BrandAsset(
-                    id=uuid.uuid4(),
-                    tenant_id=uuid.UUID(tenant_id),
-                    filename=f"ai_generated_{uuid.uuid4()}.png",
-                    file_path=file_path,
-                    file_url=public_url,
-                    file_size=len(image_response.content),
-                    mime_type="image/png",
-                    title=f"AI Generated - {post_type}",
-                    description=post_text[:200],
-                    tags=[post_type, "ai_generated"],
-                    times_used=0,
-                )
-                db.add(asset)
-                db.flush()
+        Returns:
+            Image URL or None
+        """
+        # Assets generated earlier in this request are not inserted yet
+        for row in self._pending_assets:
+            if row["tenant_id"] == tenant_uuid and row["prompt_hash"] == prompt_hash:
+                return row["file_url"]
+
+        return db.execute(
+            select(BrandAsset.file_url).where(
+                BrandAsset.tenant_id == tenant_uuid,
+                BrandAsset.prompt_hash == prompt_hash,
+            ).limit(1)
+        ).scalar_one_or_none()
+
+    def finalize(self, db: Session) -> int:
+        """
+        Insert brand assets queued during this request in one statement.
 
-                logger.info(f"Successfully generated and saved AI image: {public_url}")
-                return public_url
+        Call before committing the session that generated the images, and
+        call invalidate_committed_assets() once that commit has succeeded.
 
-            return None
+        Args:
+            db: Database session
 
-        except Exception as e:
-            logger.error(f"Error generating AI image: {e}")
-            return None
+        Returns:
+            Number of assets inserted
+        """
+        if not self._pending_assets:
+            return 0
+
+        pending, self._pending_assets = self._pending_assets, []
+        db.execute(insert(BrandAsset), pending)
+        self._uncommitted_asset_tenants.update(row["tenant_id"] for row in pending)
+
+        return len(pending)
+
+    def invalidate_committed_assets(self) -> None:
+        """
+        Drop cached brand-asset lookups for tenants whose new assets were just committed.
+
+        Invalidating before the commit would let a concurrent lookup cache the
+        old rows under the new tag version.
+        """
+        tenants, self._uncommitted_asset_tenants = self._uncommitted_asset_tenants, set()
+        for tenant_uuid in tenants:
+            invalidate_brand_assets(tenant_uuid)
+
+    async def _download_image(self, url: str) -> Optional[BinaryIO]:
+        """
+        Stream an image into a spooled temp file using the shared async HTTP client.
+
+        Only one copy of the image is held at a time; large images spill to disk.
+
+        Returns:
+            File object rewound to the start, or None if the response was not successful
+
+        Raises:
+            httpx.HTTPStatusError: On 429/5xx responses, so retry_transient can retry them
+        """
+        async with self._get_http_client().stream("GET", url) as response:
+            if response.status_code == 429 or response.status_code >= 500:
+                response.raise_for_status()
+            if response.status_code != 200:
+                logger.warning("Failed to download image from %s: %s", url, response.status_code)
+                return None
+
+            spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+            try:
+                async for chunk in response.aiter_bytes(64 * 1024):
+                    spool.write(chunk)
+            except BaseException:
+                spool.close()
+                raise
+
+        spool.seek(0)
+        return spool
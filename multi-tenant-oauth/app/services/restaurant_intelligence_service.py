@@ -1,114 +1,375 @@
 """Restaurant Intelligence Service - AI-powered restaurant context analysis."""
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
 import uuid
 import json
-from datetime import datetime, date
+import asyncio
+import hashlib
+import functools
+import heapq
+from collections import defaultdict
+from datetime import datetime
 from decimal import Decimal
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, selectinload, joinedload
 import logging
-from openai import OpenAI
+from openai import AsyncOpenAI
+import httpx
 import os
 
-from app.models import RestaurantProfile, MenuItem, SalesData, Tenant
+from app.models import RestaurantProfile, MenuItem, SalesData, Tenant, SessionLocal
+from app.utils.cache import cache_get_json, cache_set_json
+from app.utils.retry import retry_transient
 
 logger = logging.getLogger(__name__)
 
 
+# Called with (section_name, section) as each top-level analysis section
+# finishes streaming
+SectionCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+_json_decoder = json.JSONDecoder()
+
+
+def _parse_completed_sections(buffer: str, pos: int) -> Tuple[List[Tuple[str, Any]], int]:
+    """
+    Parse the top-level members of a streamed JSON object that are complete.
+
+    Args:
+        buffer: JSON text received so far
+        pos: Offset just past the last member already parsed
+
+    Returns:
+        Tuple of (list of (key, value) pairs, new offset)
+    """
+    sections = []
+    while True:
+        start = pos
+        while start < len(buffer) and buffer[start] in " \t\r\n{,":
+            start += 1
+        try:
+            key, end = _json_decoder.raw_decode(buffer, start)
+            end = buffer.index(":", end) + 1
+            while end < len(buffer) and buffer[end] in " \t\r\n":
+                end += 1
+            value, end = _json_decoder.raw_decode(buffer, end)
+        except ValueError:
+            # Member not fully received yet
+            return sections, pos
+        sections.append((key, value))
+        pos = end
+
+
+# Menu summary size limits, keeping analysis prompts small and information-dense
+MENU_SUMMARY_ITEMS_PER_CATEGORY = 3
+MENU_SUMMARY_MAX_LINES = 60
+MENU_SUMMARY_DESCRIPTION_CHARS = 60
+
+
+@functools.lru_cache(maxsize=512)
+def _menu_summary(items: Tuple[Tuple[str, str, float, str, int], ...]) -> str:
+    """
+    Format the menu summary used in analysis prompts.
+
+    Each category lists its best sellers. When the whole menu does not fit in
+    MENU_SUMMARY_MAX_LINES, only the best-selling categories are included.
+    Cached on the menu contents so re-analysis and prompt previews of an
+    unchanged menu skip the grouping and formatting work.
+
+    Args:
+        items: (category, name, price, description, times_ordered) per menu item
+
+    Returns:
+        Menu summary text
+    """
+    # Group by category
+    categories = defaultdict(list)
+    for cat, name, price, description, times_ordered in items:
+        categories[cat].append((name, price, description, times_ordered))
+
+    blocks = {
+        category: list(_category_summary_lines(category, cat_items))
+        for category, cat_items in categories.items()
+    }
+
+    # Keep the best-selling categories that fit in the line budget
+    kept = list(categories)
+    if sum(len(block) for block in blocks.values()) > MENU_SUMMARY_MAX_LINES:
+        kept = []
+        line_count = 0
+        for category in sorted(categories, key=lambda c: -sum(item[3] for item in categories[c])):
+            if line_count + len(blocks[category]) <= MENU_SUMMARY_MAX_LINES:
+                kept.append(category)
+                line_count += len(blocks[category])
+
+    # Format summary
+    summary = "\n".join(line for category in sorted(kept) for line in blocks[category])
+    if len(kept) < len(categories):
+        summary += f"\n\n... and {len(categories) - len(kept)} more categories"
+    return summary
+
+
+def _category_summary_lines(category: str, cat_items: List[Tuple[str, float, str, int]]):
+    """Yield the summary lines for one menu category, best sellers first."""
+    yield f"\n{category} ({len(cat_items)} items):"
+    top_items = heapq.nlargest(MENU_SUMMARY_ITEMS_PER_CATEGORY, cat_items, key=lambda item: item[3])
+    for name, price, description, _ in top_items:
+        yield f"  - {name} (${price:.2f})"
+        if description:
+            yield f"    {description}"
+    if len(cat_items) > MENU_SUMMARY_ITEMS_PER_CATEGORY:
+        yield f"  ... and {len(cat_items) - MENU_SUMMARY_ITEMS_PER_CATEGORY} more items"
+
+
+def _object(**properties) -> Dict[str, Any]:
+    """Build a strict JSON schema object with every property required."""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def _array(items: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a JSON schema array."""
+    return {"type": "array", "items": items}
+
+
+_STRING = {"type": "string"}
+_STRINGS = _array(_STRING)
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Model used for restaurant analysis (must support structured outputs)
+ANALYSIS_MODEL = os.getenv("GPT_ANALYSIS_MODEL", "gpt-4o-mini")
+
+_BRAND_ANALYSIS_SCHEMA = _object(
+    brand_personality=_object(
+        voice_tone=_STRING,
+        key_attributes=_STRINGS,
+        target_audience=_STRING,
+        unique_selling_points=_STRINGS,
+    ),
+    cuisine_analysis=_object(
+        primary_cuisine=_STRING,
+        cuisine_style=_STRING,
+        signature_items=_STRINGS,
+        price_positioning=_STRING,
+    ),
+    content_themes=_object(
+        recommended_themes=_STRINGS,
+        hashtag_suggestions=_STRINGS,
+        content_pillars=_STRINGS,
+    ),
+)
+
+_SALES_INSIGHTS_SCHEMA = _object(
+    sales_patterns=_object(
+        busiest_days=_STRINGS,
+        slowest_days=_STRINGS,
+        peak_hours=_STRING,
+        seasonal_trends=_STRING,
+    ),
+    item_performance=_object(
+        top_sellers=_array(_object(name=_STRING, times_ordered={"type": "integer"}, insight=_STRING)),
+        underperforming_items=_array(_object(name=_STRING, times_ordered={"type": "integer"}, suggestion=_STRING)),
+    ),
+    promotional_recommendations=_array(_object(
+        strategy=_STRING,
+        target_day=_STRING,
+        reason=_STRING,
+        suggested_discount=_STRING,
+    )),
+    content_opportunities=_array(_object(
+        opportunity=_STRING,
+        best_items_to_feature=_STRINGS,
+        timing=_STRING,
+    )),
+)
+
+_CONTENT_STRATEGY_SCHEMA = _object(
+    posting_schedule=_object(
+        frequency=_STRING,
+        best_days_to_post=_STRINGS,
+        best_times=_STRINGS,
+        rationale=_STRING,
+    ),
+    content_mix=_array(_object(
+        content_type=_STRING,
+        percentage={"type": "integer"},
+        description=_STRING,
+        example_topics=_STRINGS,
+    )),
+    featured_items_rotation=_object(
+        weekly_rotation=_STRINGS,
+        strategy=_STRING,
+    ),
+    promotional_calendar=_array(_object(
+        week={"type": "integer"},
+        focus=_STRING,
+        items=_STRINGS,
+        offer_suggestion=_STRING,
+    )),
+    engagement_tactics=_array(_object(
+        tactic=_STRING,
+        implementation=_STRING,
+        expected_outcome=_STRING,
+    )),
+)
+
+# Combined response schema for the single analysis request
+ANALYSIS_SCHEMA = _object(
+    brand_analysis=_BRAND_ANALYSIS_SCHEMA,
+    sales_insights=_SALES_INSIGHTS_SCHEMA,
+    content_strategy=_CONTENT_STRATEGY_SCHEMA,
+)
+ANALYSIS_SCHEMA_NO_SALES = _object(
+    brand_analysis=_BRAND_ANALYSIS_SCHEMA,
+    content_strategy=_CONTENT_STRATEGY_SCHEMA,
+)
+
+
 class RestaurantIntelligenceService:
     """AI-powered service for analyzing restaurant data and generating insights."""
 
+    # Output token cap for one analysis request
+    ANALYSIS_MAX_TOKENS = 4000
+
+    # Seconds to keep GPT analysis responses in Redis, shared across workers
+    COMPLETION_CACHE_TTL = 7 * 24 * 3600
+
+    # Batch API statuses after which a batch no longer changes
+    BATCH_FINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+    # Shared across instances so TCP/TLS connections to OpenAI are reused
+    _client: Optional[AsyncOpenAI] = None
+    _client_loop: Optional[asyncio.AbstractEventLoop] = None
+
     def __init__(self):
         """Initialize restaurant intelligence service."""
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        if self.openai_api_key:
-            self.client = OpenAI(api_key=self.openai_api_key)
-        else:
-            self.client = None
+
+    @property
+    def client(self) -> Optional[AsyncOpenAI]:
+        """Return the shared async OpenAI client, creating it on first use."""
+        if not self.openai_api_key:
+            return None
+        cls = type(self)
+        loop = asyncio.get_running_loop()
+        if cls._client is None or cls._client_loop is not loop:
+            cls._client = AsyncOpenAI(
+                api_key=self.openai_api_key,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+                    timeout=httpx.Timeout(600.0, connect=5.0),
+                ),
+            )
+            cls._client_loop = loop
+        return cls._client
+
+    @classmethod
+    async def close_client(cls):
+        """Close the shared async OpenAI client (call on application shutdown)."""
+        if cls._client is not None:
+            await cls._client.close()
+        cls._client = None
+        cls._client_loop = None
 
     async def analyze_restaurant(
         self,
         db: Session,
         tenant_id: str,
+        force: bool = False,
+        on_section: Optional[SectionCallback] = None,
     ) -> Dict[str, Any]:
         """
         Perform complete AI analysis of restaurant.
 
+        The stored analysis is reused without calling OpenAI when the menu and
+        sales data are unchanged since it was generated.
+
         Args:
             db: Database session
             tenant_id: Tenant UUID
+            force: Re-run the analysis even if the data is unchanged
+            on_section: Optional async callback receiving each analysis
+                section as soon as it has streamed in
 
         Returns:
             Dict with analysis results
         """
         try:
-            # Get tenant info
-            tenant = db.query(Tenant).filter(Tenant.id == uuid.UUID(tenant_id)).first()
+            tenant_uuid = uuid.UUID(tenant_id)
+
+            # Get tenant with menu items, sales data and profile in one pass
+            tenant = db.query(Tenant).options(
+                selectinload(Tenant.menu_items),
+                joinedload(Tenant.restaurant_profile),
+            ).filter(Tenant.id == tenant_uuid).first()
             if not tenant:
                 return {"success": False, "error": "Tenant not found"}
 
-            # Get menu items
-            menu_items = db.query(MenuItem).filter(
-                MenuItem.tenant_id == uuid.UUID(tenant_id)
-            ).all()
-
+            menu_items = tenant.menu_items
             if not menu_items:
                 return {"success": False, "error": "No menu data found. Please import menu first."}
 
-            # Get sales data
-            sales_data = db.query(SalesData).filter(
-                SalesData.tenant_id == uuid.UUID(tenant_id)
-            ).all()
-
-            # Get or create restaurant profile
-            profile = db.query(RestaurantProfile).filter(
-                RestaurantProfile.tenant_id == uuid.UUID(tenant_id)
-            ).first()
-
-            if not profile:
-                profile = RestaurantProfile(
-                    tenant_id=uuid.UUID(tenant_id),
-                )
-                db.add(profile)
+            # Aggregate sales data in the database
+            sales_stats = self._load_sales_stats(db, [tenant_uuid]).get(tenant_uuid)
+
+            profile = tenant.restaurant_profile
+
+            fingerprint = self._analysis_fingerprint(tenant, menu_items, sales_stats)
+            if (
+                not force and profile
+                and profile.analysis_fingerprint == fingerprint and profile.brand_analysis
+            ):
+                logger.info(f"Menu and sales data unchanged, reusing AI analysis for tenant {tenant_id}")
+                if on_section:
+                    await on_section("brand_analysis", profile.brand_analysis)
+                    await on_section("sales_insights", profile.sales_insights)
+                    await on_section("content_strategy", profile.content_strategy)
+                return {
+                    "success": True,
+                    "brand_analysis": profile.brand_analysis,
+                    "sales_insights": profile.sales_insights,
+                    "content_strategy": profile.content_strategy,
+                }
 
             # Run AI analysis
             logger.info(f"Starting AI analysis for tenant {tenant_id}")
 
-            # 1. Analyze menu for brand personality
-            brand_analysis = await self._analyze_brand_personality(
-                tenant, menu_items
-            )
-            profile.brand_analysis = brand_analysis
-
-            # 2. Analyze sales data for trends and insights
-            if sales_data:
-                sales_insights = await self._analyze_sales_trends(
-                    menu_items, sales_data
-                )
-                profile.sales_insights = sales_insights
-            else:
-                profile.sales_insights = {
-                    "message": "No sales data available yet. Upload sales data to get insights."
-                }
-
-            # 3. Generate content strategy
-            content_strategy = await self._generate_content_strategy(
-                brand_analysis,
-                profile.sales_insights if sales_data else None,
-                menu_items
-            )
-            profile.content_strategy = content_strategy
-
-            profile.updated_at = datetime.utcnow()
+            # Persist the brand analysis on its own connection while the rest
+            # of the response is still streaming
+            write_tasks = []
+
+            async def handle_section(name: str, section: Dict[str, Any]):
+                if name == "brand_analysis":
+                    write_tasks.append(asyncio.create_task(
+                        asyncio.to_thread(self._persist_section, tenant_uuid, name, section)
+                    ))
+                if on_section:
+                    await on_section(name, section)
+
+            # Brand personality, sales trends and content strategy in one GPT call
+            try:
+                analysis = await self._analyze_all(tenant, menu_items, sales_stats, handle_section, force=force)
+            finally:
+                for result in await asyncio.gather(*write_tasks, return_exceptions=True):
+                    if isinstance(result, Exception):
+                        logger.warning(f"Early brand analysis write failed for tenant {tenant_id}: {result}")
+            values = self._profile_values(tenant_uuid, analysis, menu_items, sales_stats, fingerprint)
+            self._upsert_profiles(db, [values])
             db.commit()
 
             logger.info(f"Successfully completed AI analysis for tenant {tenant_id}")
 
             return {
                 "success": True,
-                "brand_analysis": brand_analysis,
-                "sales_insights": profile.sales_insights,
-                "content_strategy": content_strategy,
+                "brand_analysis": values["brand_analysis"],
+                "sales_insights": values["sales_insights"],
+                "content_strategy": values["content_strategy"],
             }
 
         except Exception as e:
@@ -119,358 +380,607 @@ class RestaurantIntelligenceService:
                 "error": str(e),
             }
 
-    async def _analyze_brand_personality(
+    async def analyze_restaurants(
         self,
-        tenant: Tenant,
-        menu_items: List[MenuItem],
-    ) -> Dict[str, Any]:
+        tenant_ids: List[str],
+        concurrency: int = 10,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ) -> Dict[str, Dict[str, Any]]:
         """
-        Use GPT-4 to analyze menu and generate brand personality.
+        Analyze many restaurants concurrently (e.g. an org-wide re-analysis).
+
+        Up to `concurrency` analyses run at once, each with its own database
+        session. If OPENAI_TPM_LIMIT is set, concurrency is lowered so the
+        in-flight requests fit in the tokens-per-minute budget. For very
+        large or non-urgent runs prefer submit_analysis_batch.
 
         Args:
-            tenant: Tenant model
-            menu_items: List of menu items
+            tenant_ids: List of tenant UUIDs
+            concurrency: Maximum number of analyses in flight
+            session_factory: Callable returning a new database session
 
         Returns:
-            Brand analysis dictionary
+            Dict mapping tenant ID to its analyze_restaurant result
         """
-        if not self.openai_api_key:
-            logger.warning("OpenAI API key not configured, using template response")
-            return self._template_brand_analysis(tenant, menu_items)
+        tpm_limit = int(os.getenv("OPENAI_TPM_LIMIT", "0"))
+        if tpm_limit:
+            concurrency = min(concurrency, max(1, tpm_limit // self.ANALYSIS_MAX_TOKENS))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def analyze_one(tenant_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                db = session_factory()
+                try:
+                    return await self.analyze_restaurant(db, tenant_id)
+                finally:
+                    db.close()
+
+        results = await asyncio.gather(
+            *(analyze_one(tenant_id) for tenant_id in tenant_ids),
+            return_exceptions=True,
+        )
+
+        logger.info(f"Analyzed {len(tenant_ids)} restaurants with concurrency {concurrency}")
 
-        try:
-            # Prepare menu data for analysis
-            menu_summary = self._prepare_menu_summary(menu_items)
+        return {
+            tenant_id: (
+                {"success": False, "error": str(result)}
+                if isinstance(result, BaseException) else result
+            )
+            for tenant_id, result in zip(tenant_ids, results)
+        }
 
-            # Create GPT-4 prompt
-            prompt = f"""You are a restaurant branding expert. Analyze the following restaurant menu and generate a comprehensive brand personality profile.
+    async def submit_analysis_batch(
+        self,
+        db: Session,
+        tenant_ids: List[str],
+    ) -> Tuple[Optional[str], Dict[str, Dict[str, str]]]:
+        """
+        Submit the full AI analysis for many tenants as one OpenAI Batch API job.
 
-Restaurant Name: {tenant.name or 'Unknown'}
+        Batch jobs cost roughly half as much as real-time calls and use a
+        separate rate-limit pool, but complete within a 24h window, so this
+        only submits the job; collect_analysis_batch saves the results once it
+        has finished. Tenants whose response is already cached are saved
+        right away. On-demand analyses should keep using analyze_restaurant.
 
-Menu Categories and Items:
-{menu_summary}
-
-Based on this menu, provide a detailed analysis in JSON format with the following structure:
-{{
-    "brand_personality": {{
-        "voice_tone": "string describing the brand voice (e.g., 'casual and friendly', 'upscale and sophisticated')",
-        "key_attributes": ["attribute1", "attribute2", "attribute3"],
-        "target_audience": "description of ideal customer",
-        "unique_selling_points": ["usp1", "usp2", "usp3"]
-    }},
-    "cuisine_analysis": {{
-        "primary_cuisine": "main cuisine type",
-        "cuisine_style": "description of style (e.g., 'traditional Italian', 'modern fusion')",
-        "signature_items": ["item1", "item2", "item3"],
-        "price_positioning": "budget/mid-range/premium"
-    }},
-    "content_themes": {{
-        "recommended_themes": ["theme1", "theme2", "theme3"],
-        "hashtag_suggestions": ["#tag1", "#tag2", "#tag3"],
-        "content_pillars": ["pillar1", "pillar2", "pillar3"]
-    }}
-}}
-
-Provide ONLY the JSON response, no additional text."""
-
-            # Call GPT-4
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a restaurant branding expert that provides analysis in JSON format."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1500,
-            )
+        Args:
+            db: Database session
+            tenant_ids: List of tenant UUIDs
+
+        Returns:
+            Tuple of (batch ID, or None if nothing was submitted, and a
+            mapping of each submitted tenant ID to the cache_key and
+            fingerprint of its request, to hand to collect_analysis_batch)
+        """
+        if not self.client or not tenant_ids:
+            return None, {}
+
+        contexts = self._load_analysis_contexts(db, tenant_ids)
+
+        # Only submit requests whose response is not already cached
+        profile_rows = []
+        requests = {}
+        pending = {}
+        for tenant_id, (tenant, menu_items, sales_stats) in contexts.items():
+            request = self._analysis_request(tenant, menu_items, sales_stats)
+            cache_key = self._completion_cache_key(request)
+            fingerprint = self._analysis_fingerprint(tenant, menu_items, sales_stats)
+            cached = cache_get_json(cache_key)
+            if cached is not None:
+                analysis = self._finish_analysis(cached, menu_items, sales_stats)
+                profile_rows.append(self._profile_values(
+                    tenant.id, analysis, menu_items, sales_stats, fingerprint
+                ))
+            else:
+                requests[tenant_id] = request
+                pending[tenant_id] = {"cache_key": cache_key, "fingerprint": fingerprint}
 
-            # Parse response
-            analysis_text = response.choices[0].message.content.strip()
+        self._upsert_profiles(db, profile_rows)
+        db.commit()
 
-            # Try to extract JSON if wrapped in markdown code blocks
-            if "```json" in analysis_text:
-                analysis_text = analysis_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in analysis_text:
-                analysis_text = analysis_text.split("```")[1].split("```")[0].strip()
+        if not requests:
+            return None, {}
 
-            brand_analysis = json.loads(analysis_text)
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            })
+            for custom_id, body in requests.items()
+        ]
+        batch_input = "\n".join(lines).encode("utf-8")
+        input_file = await retry_transient(lambda: self.client.files.create(
+            file=("analysis_batch.jsonl", batch_input),
+            purpose="batch",
+        ))
+        batch = await retry_transient(lambda: self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        ))
+        logger.info(
+            f"Submitted analysis batch {batch.id} with {len(lines)} requests "
+            f"({len(profile_rows)} tenants served from cache)"
+        )
+
+        return batch.id, pending
+
+    async def collect_analysis_batch(
+        self,
+        db: Session,
+        batch_id: str,
+        pending: Dict[str, Dict[str, str]],
+    ) -> Optional[Dict[str, bool]]:
+        """
+        Save the results of a batch from submit_analysis_batch if it has finished.
 
-            # Add metadata
-            brand_analysis["analyzed_at"] = datetime.utcnow().isoformat()
-            brand_analysis["total_menu_items"] = len(menu_items)
+        A tenant whose batch item failed keeps its existing profile; one
+        without a profile gets the template analysis. Either way it is
+        reported as not analyzed.
 
-            return brand_analysis
+        Args:
+            db: Database session
+            batch_id: Batch ID returned by submit_analysis_batch
+            pending: Tenant mapping returned by submit_analysis_batch
 
-        except Exception as e:
-            logger.error(f"Error in GPT-4 brand analysis: {e}")
-            return self._template_brand_analysis(tenant, menu_items)
+        Returns:
+            Dict mapping tenant ID to whether its AI analysis was saved, or
+            None if the batch is still running
+        """
+        batch = await retry_transient(lambda: self.client.batches.retrieve(batch_id))
+        if batch.status not in self.BATCH_FINAL_STATES:
+            return None
 
-    async def _analyze_sales_trends(
+        outputs = {}
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(f"Analysis batch {batch_id} finished with status {batch.status}")
+        else:
+            output = await retry_transient(lambda: self.client.files.content(batch.output_file_id))
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                result_line = json.loads(line)
+                response = result_line.get("response") or {}
+                if result_line.get("error") or response.get("status_code") != 200:
+                    logger.warning(f"Analysis batch item {result_line['custom_id']} failed: {result_line.get('error')}")
+                    continue
+                outputs[result_line["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+
+        results = {tenant_id: False for tenant_id in pending}
+        contexts = self._load_analysis_contexts(db, list(pending))
+
+        profile_rows = []
+        for tenant_id, (tenant, menu_items, sales_stats) in contexts.items():
+            try:
+                analysis = json.loads(outputs[tenant_id])
+                cache_set_json(pending[tenant_id]["cache_key"], analysis, self.COMPLETION_CACHE_TTL)
+                analysis = self._finish_analysis(analysis, menu_items, sales_stats)
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Batch AI analysis failed for tenant {tenant_id}: {e!r}")
+                if tenant.restaurant_profile is not None:
+                    continue
+                analysis = self._template_analysis(tenant, menu_items, sales_stats)
+            else:
+                results[tenant_id] = True
+
+            profile_rows.append(self._profile_values(
+                tenant.id, analysis, menu_items, sales_stats, pending[tenant_id]["fingerprint"]
+            ))
+
+        self._upsert_profiles(db, profile_rows)
+        db.commit()
+
+        logger.info(
+            f"Batch AI analysis {batch_id} completed for {sum(results.values())}/{len(pending)} tenants"
+        )
+        return results
+
+    def _load_analysis_contexts(
         self,
+        db: Session,
+        tenant_ids: List[str],
+    ) -> Dict[str, Tuple[Tenant, List[MenuItem], Optional[Dict[str, Any]]]]:
+        """
+        Load the tenant, menu items and sales stats each analysis prompt needs.
+
+        Args:
+            db: Database session
+            tenant_ids: List of tenant UUIDs
+
+        Returns:
+            Dict mapping tenant ID to (tenant, menu items, sales stats) for
+            tenants that have menu items
+        """
+        tenant_id_by_uuid = {uuid.UUID(tenant_id): tenant_id for tenant_id in tenant_ids}
+        tenants = db.query(Tenant).options(
+            selectinload(Tenant.menu_items),
+            joinedload(Tenant.restaurant_profile),
+        ).filter(Tenant.id.in_(tenant_id_by_uuid)).all()
+        sales_stats_by_tenant = self._load_sales_stats(db, list(tenant_id_by_uuid))
+
+        return {
+            tenant_id_by_uuid[tenant.id]: (
+                tenant, tenant.menu_items, sales_stats_by_tenant.get(tenant.id)
+            )
+            for tenant in tenants
+            if tenant.menu_items
+        }
+
+    async def _analyze_all(
+        self,
+        tenant: Tenant,
         menu_items: List[MenuItem],
-        sales_data: List[SalesData],
+        sales_stats: Optional[Dict[str, Any]],
+        on_section: Optional[SectionCallback] = None,
+        force: bool = False,
     ) -> Dict[str, Any]:
         """
-        Use GPT-4 to analyze sales data and generate insights.
+        Use GPT to generate brand analysis, sales insights and content strategy.
+
+        All three sections come back from a single structured-output request,
+        so the menu and sales summaries are sent once and the response is
+        guaranteed to match ANALYSIS_SCHEMA. The response is streamed so
+        sections can be handed to on_section before the whole analysis is done.
 
         Args:
+            tenant: Tenant model
             menu_items: List of menu items
-            sales_data: List of sales records
+            sales_stats: Aggregated sales statistics (None without sales data)
+            on_section: Optional async callback receiving each completed section
+            force: Skip the cached completion and call OpenAI (the fresh
+                response still replaces the cached one)
 
         Returns:
-            Sales insights dictionary
+            Dict with brand_analysis, sales_insights and content_strategy
         """
         if not self.openai_api_key:
             logger.warning("OpenAI API key not configured, using template response")
-            return self._template_sales_insights(menu_items, sales_data)
+            return self._template_analysis(tenant, menu_items, sales_stats)
 
         try:
-            # Prepare sales summary
-            sales_summary = self._prepare_sales_summary(menu_items, sales_data)
+            request = self._analysis_request(tenant, menu_items, sales_stats)
+            cache_key = self._completion_cache_key(request)
 
-            # Create GPT-4 prompt
-            prompt = f"""You are a restaurant sales analyst. Analyze the following sales data and provide actionable insights for social media marketing.
+            # A retried stream starts over; hand each section to on_section only once
+            delivered = set()
 
-Sales Summary:
-{sales_summary}
-
-Based on this data, provide insights in JSON format with the following structure:
-{{
-    "sales_patterns": {{
-        "busiest_days": ["day1", "day2"],
-        "slowest_days": ["day1", "day2"],
-        "peak_hours": "description if available",
-        "seasonal_trends": "description of any trends"
-    }},
-    "item_performance": {{
-        "top_sellers": [
-            {{"name": "item name", "times_ordered": number, "insight": "why it's popular"}},
-            ...
-        ],
-        "underperforming_items": [
-            {{"name": "item name", "times_ordered": number, "suggestion": "how to promote"}},
-            ...
-        ]
-    }},
-    "promotional_recommendations": [
-        {{
-            "strategy": "promotion type (e.g., 'Happy Hour', 'Monday Madness')",
-            "target_day": "day of week",
-            "reason": "why this would work",
-            "suggested_discount": "percentage or offer"
-        }},
-        ...
-    ],
-    "content_opportunities": [
-        {{
-            "opportunity": "description",
-            "best_items_to_feature": ["item1", "item2"],
-            "timing": "when to post"
-        }},
-        ...
-    ]
-}}
-
-Provide ONLY the JSON response, no additional text."""
-
-            # Call GPT-4
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a restaurant sales analyst that provides insights in JSON format."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000,
-            )
+            async def deliver_once(name: str, section: Dict[str, Any]):
+                if name not in delivered:
+                    delivered.add(name)
+                    await on_section(name, section)
 
-            # Parse response
-            analysis_text = response.choices[0].message.content.strip()
+            analysis = None if force else cache_get_json(cache_key)
+            if analysis is None:
+                analysis_text = await retry_transient(
+                    lambda: self._stream_completion(request, deliver_once if on_section else None)
+                )
+                analysis = json.loads(analysis_text)
+                cache_set_json(cache_key, analysis, self.COMPLETION_CACHE_TTL)
+            elif on_section:
+                for name, section in analysis.items():
+                    await on_section(name, section)
 
-            # Try to extract JSON if wrapped in markdown code blocks
-            if "```json" in analysis_text:
-                analysis_text = analysis_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in analysis_text:
-                analysis_text = analysis_text.split("```")[1].split("```")[0].strip()
+            return self._finish_analysis(analysis, menu_items, sales_stats)
 
-            sales_insights = json.loads(analysis_text)
+        except Exception as e:
+            logger.error(f"Error in GPT restaurant analysis: {e}")
+            return self._template_analysis(tenant, menu_items, sales_stats)
 
-            # Add metadata
-            sales_insights["analyzed_at"] = datetime.utcnow().isoformat()
-            sales_insights["total_orders_analyzed"] = len(sales_data)
+    async def _stream_completion(
+        self,
+        request: Dict[str, Any],
+        on_section: Optional[SectionCallback] = None,
+    ) -> str:
+        """
+        Stream a chat completion, handing completed top-level sections to on_section.
 
-            return sales_insights
+        Args:
+            request: Chat completion request body
+            on_section: Optional async callback receiving each completed section
 
-        except Exception as e:
-            logger.error(f"Error in GPT-4 sales analysis: {e}")
-            return self._template_sales_insights(menu_items, sales_data)
+        Returns:
+            Full response text
+        """
+        stream = await self.client.chat.completions.create(**request, stream=True)
+
+        buffer = ""
+        pos = 0
+        async for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            delta = chunk.choices[0].delta.content
+            buffer += delta
+
+            # A section can only have completed when a closing brace arrives
+            if on_section and "}" in delta:
+                sections, pos = _parse_completed_sections(buffer, pos)
+                for name, section in sections:
+                    await on_section(name, section)
+
+        return buffer
+
+    def _completion_cache_key(self, request: Dict[str, Any]) -> str:
+        """Build the Redis key for a chat completion request's response."""
+        digest = hashlib.sha256(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest()
+        return f"gpt_analysis:v1:{digest}"
+
+    def _analysis_request(
+        self,
+        tenant: Tenant,
+        menu_items: List[MenuItem],
+        sales_stats: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Build the structured-output chat completion request for a tenant."""
+        schema = ANALYSIS_SCHEMA if sales_stats else ANALYSIS_SCHEMA_NO_SALES
+        return {
+            "model": ANALYSIS_MODEL,
+            "messages": [
+                {"role": "system", "content": "You are a restaurant branding expert, sales analyst and social media content strategist."},
+                {"role": "user", "content": self._analysis_prompt(tenant, menu_items, sales_stats)}
+            ],
+            "temperature": 0.7,
+            "max_tokens": self.ANALYSIS_MAX_TOKENS,
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {"name": "restaurant_analysis", "strict": True, "schema": schema},
+            },
+        }
 
-    async def _generate_content_strategy(
+    def _analysis_prompt(
         self,
-        brand_analysis: Dict[str, Any],
-        sales_insights: Optional[Dict[str, Any]],
+        tenant: Tenant,
+        menu_items: List[MenuItem],
+        sales_stats: Optional[Dict[str, Any]],
+    ) -> str:
+        """Build the combined brand, sales and content strategy prompt."""
+        menu_summary = self._prepare_menu_summary(menu_items)
+
+        if sales_stats:
+            sales_section = f"""
+
+Sales Summary:
+{self._prepare_sales_summary(menu_items, sales_stats)}"""
+            sales_task = """
+2. sales_insights: sales patterns (busiest/slowest days, peak hours, seasonal trends), top-selling and underperforming items with why they sell or how to promote them, promotional recommendations for specific days, and content opportunities with the best items to feature and when to post."""
+            strategy_task = "3. content_strategy: based on the brand analysis and sales insights"
+        else:
+            sales_section = ""
+            sales_task = ""
+            strategy_task = "2. content_strategy: based on the brand analysis"
+
+        return f"""Analyze the following restaurant and produce a brand personality profile{', actionable sales insights for social media marketing' if sales_stats else ''} and a comprehensive social media content strategy.
+
+Restaurant Name: {tenant.name or 'Unknown'}
+
+Menu Categories and Items:
+{menu_summary}{sales_section}
+
+Provide:
+1. brand_analysis: brand voice and tone (e.g., 'casual and friendly', 'upscale and sophisticated'), key attributes, target audience, unique selling points, primary cuisine and style (e.g., 'traditional Italian', 'modern fusion'), signature items, price positioning (budget/mid-range/premium), and recommended content themes, hashtags and content pillars.{sales_task}
+{strategy_task}, a posting schedule with rationale, a content mix whose percentages add up to 100 (e.g., 'Product Showcase', 'Behind the Scenes', 'Customer Stories'), a weekly featured item rotation, a 4-week promotional calendar, and engagement tactics."""
+
+    def _finish_analysis(
+        self,
+        analysis: Dict[str, Any],
+        menu_items: List[MenuItem],
+        sales_stats: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Normalize a parsed GPT analysis."""
+        if not sales_stats:
+            analysis["sales_insights"] = None
+        return analysis
+
+    def _template_analysis(
+        self,
+        tenant: Tenant,
         menu_items: List[MenuItem],
+        sales_stats: Optional[Dict[str, Any]],
     ) -> Dict[str, Any]:
+        """Template analysis when the OpenAI API is not available."""
+        brand_analysis = self._template_brand_analysis(tenant, menu_items)
+        sales_insights = self._template_sales_insights(menu_items, sales_stats) if sales_stats else None
+        return {
+            "brand_analysis": brand_analysis,
+            "sales_insights": sales_insights,
+            "content_strategy": self._template_content_strategy(brand_analysis, sales_insights, menu_items),
+            "is_template": True,
+        }
+
+    def _analysis_fingerprint(
+        self,
+        tenant: Tenant,
+        menu_items: List[MenuItem],
+        sales_stats: Optional[Dict[str, Any]],
+    ) -> str:
         """
-        Generate content strategy based on brand and sales analysis.
+        Hash the inputs of an analysis so unchanged data can reuse it.
 
         Args:
-            brand_analysis: Brand personality analysis
-            sales_insights: Sales trends analysis
+            tenant: Tenant model
             menu_items: List of menu items
+            sales_stats: Aggregated sales statistics (None without sales data)
 
         Returns:
-            Content strategy dictionary
+            Hex digest identifying the analysis inputs
         """
-        if not self.openai_api_key:
-            logger.warning("OpenAI API key not configured, using template response")
-            return self._template_content_strategy(brand_analysis, sales_insights, menu_items)
+        menu = [
+            (str(item.id), item.name, float(item.price or 0), item.category, item.description)
+            for item in sorted(menu_items, key=lambda x: str(x.id))
+        ]
+        sales = [
+            sales_stats["total_orders"],
+            sales_stats["last_order_date"].isoformat(),
+            round(sales_stats["total_revenue"], 2),
+        ] if sales_stats else None
+        canonical = json.dumps([ANALYSIS_MODEL, tenant.name, menu, sales], sort_keys=True)
+        return hashlib.blake2b(canonical.encode("utf-8"), digest_size=32).hexdigest()
+
+    def _profile_values(
+        self,
+        tenant_id: uuid.UUID,
+        analysis: Dict[str, Any],
+        menu_items: List[MenuItem],
+        sales_stats: Optional[Dict[str, Any]],
+        fingerprint: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build the restaurant profile column values for an analysis."""
+        now = datetime.utcnow()
+        return {
+            "tenant_id": tenant_id,
+            "brand_analysis": analysis["brand_analysis"],
+            "sales_insights": analysis["sales_insights"] or {
+                "message": "No sales data available yet. Upload sales data to get insights."
+            },
+            "content_strategy": analysis["content_strategy"],
+            # Template results are never reused, so a later run with an API
+            # key still performs the real analysis
+            "analysis_fingerprint": None if analysis.get("is_template") else fingerprint,
+            "analyzed_at": now,
+            "analyzed_menu_items_count": len(menu_items),
+            "analyzed_orders_count": sales_stats["total_orders"] if sales_stats else 0,
+            "updated_at": now,
+        }
+
+    def _persist_section(self, tenant_id: uuid.UUID, name: str, section: Dict[str, Any]):
+        """
+        Save one analysis section in its own session (runs in a worker thread).
 
+        Args:
+            tenant_id: Tenant UUID
+            name: Profile column for the section
+            section: Section content
+        """
+        db = SessionLocal()
         try:
-            # Create GPT-4 prompt
-            brand_summary = json.dumps(brand_analysis, indent=2)
-            sales_summary = json.dumps(sales_insights, indent=2) if sales_insights else "No sales data available"
-
-            prompt = f"""You are a social media content strategist for restaurants. Based on the brand analysis and sales insights below, create a comprehensive content strategy.
-
-Brand Analysis:
-{brand_summary}
-
-Sales Insights:
-{sales_summary}
-
-Create a content strategy in JSON format with the following structure:
-{{
-    "posting_schedule": {{
-        "frequency": "posts per week",
-        "best_days_to_post": ["day1", "day2"],
-        "best_times": ["time1", "time2"],
-        "rationale": "why this schedule works"
-    }},
-    "content_mix": [
-        {{
-            "content_type": "type (e.g., 'Product Showcase', 'Behind the Scenes', 'Customer Stories')",
-            "percentage": 30,
-            "description": "what to post",
-            "example_topics": ["topic1", "topic2"]
-        }},
-        ...
-    ],
-    "featured_items_rotation": {{
-        "weekly_rotation": ["item1", "item2", "item3", "item4"],
-        "strategy": "how to rotate items for maximum engagement"
-    }},
-    "promotional_calendar": [
-        {{
-            "week": 1,
-            "focus": "what to promote",
-            "items": ["item1", "item2"],
-            "offer_suggestion": "promotion idea"
-        }},
-        ...
-    ],
-    "engagement_tactics": [
-        {{
-            "tactic": "engagement method",
-            "implementation": "how to do it",
-            "expected_outcome": "what to expect"
-        }},
-        ...
-    ]
-}}
-
-Provide ONLY the JSON response, no additional text."""
-
-            # Call GPT-4
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a social media strategist that provides content strategies in JSON format."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2500,
+            stmt = pg_insert(RestaurantProfile).values(
+                tenant_id=tenant_id, **{name: section}, updated_at=datetime.utcnow()
             )
+            db.execute(stmt.on_conflict_do_update(
+                constraint="uq_restaurant_profiles_tenant_id",
+                set_={name: stmt.excluded[name], "updated_at": stmt.excluded.updated_at},
+            ))
+            db.commit()
+        finally:
+            db.close()
 
-            # Parse response
-            analysis_text = response.choices[0].message.content.strip()
+    def _upsert_profiles(self, db: Session, rows: List[Dict[str, Any]]):
+        """
+        Insert or update restaurant profiles in a single statement.
 
-            # Try to extract JSON if wrapped in markdown code blocks
-            if "```json" in analysis_text:
-                analysis_text = analysis_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in analysis_text:
-                analysis_text = analysis_text.split("```")[1].split("```")[0].strip()
+        Args:
+            db: Database session
+            rows: Profile column values from _profile_values
+        """
+        if not rows:
+            return
+
+        stmt = pg_insert(RestaurantProfile).values(rows)
+        db.execute(stmt.on_conflict_do_update(
+            constraint="uq_restaurant_profiles_tenant_id",
+            set_={
+                column: stmt.excluded[column]
+                for column in rows[0]
+                if column != "tenant_id"
+            },
+        ))
 
-            content_strategy = json.loads(analysis_text)
+    def _prepare_menu_summary(self, menu_items: List[MenuItem]) -> str:
+        """Prepare menu summary for GPT-4 analysis."""
+        return _menu_summary(tuple(
+            (
+                item.category or 'Other',
+                item.name,
+                float(item.price) if item.price else 0,
+                item.description[:MENU_SUMMARY_DESCRIPTION_CHARS] if item.description else '',
+                item.times_ordered or 0,
+            )
+            for item in menu_items
+        ))
 
-            # Add metadata
-            content_strategy["generated_at"] = datetime.utcnow().isoformat()
+    def _load_sales_stats(
+        self,
+        db: Session,
+        tenant_ids: List[uuid.UUID],
+    ) -> Dict[uuid.UUID, Dict[str, Any]]:
+        """
+        Aggregate sales data per tenant and day of week in the database.
 
-            return content_strategy
+        Only seven rows per tenant come back instead of every order.
 
-        except Exception as e:
-            logger.error(f"Error in GPT-4 content strategy generation: {e}")
-            return self._template_content_strategy(brand_analysis, sales_insights, menu_items)
+        Args:
+            db: Database session
+            tenant_ids: Tenant UUIDs
 
-    def _prepare_menu_summary(self, menu_items: List[MenuItem]) -> str:
-        """Prepare menu summary for GPT-4 analysis."""
-        # Group by category
-        categories = {}
-        for item in menu_items:
-            cat = item.category or 'Other'
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append({
-                'name': item.name,
-                'price': float(item.price) if item.price else 0,
-                'description': item.description[:100] if item.description else '',
+        Returns:
+            Dict mapping tenant UUID to sales statistics (tenants without
+            sales data are omitted)
+        """
+        day_of_week = func.extract('isodow', SalesData.order_date)
+        rows = db.query(
+            SalesData.tenant_id,
+            day_of_week,
+            func.count(SalesData.id),
+            func.sum(SalesData.total_amount),
+            func.min(SalesData.order_date),
+            func.max(SalesData.order_date),
+        ).filter(
+            SalesData.tenant_id.in_(tenant_ids)
+        ).group_by(SalesData.tenant_id, day_of_week).order_by(SalesData.tenant_id, day_of_week).all()
+
+        stats_by_tenant = {}
+        for tenant_id, isodow, count, revenue, first_order, last_order in rows:
+            stats = stats_by_tenant.setdefault(tenant_id, {
+                "total_orders": 0,
+                "total_revenue": 0.0,
+                "first_order_date": first_order,
+                "last_order_date": last_order,
+                "orders_by_day": {},
             })
+            revenue = float(revenue or 0)
+            stats["total_orders"] += count
+            stats["total_revenue"] += revenue
+            stats["first_order_date"] = min(stats["first_order_date"], first_order)
+            stats["last_order_date"] = max(stats["last_order_date"], last_order)
+            stats["orders_by_day"][DAY_NAMES[int(isodow) - 1]] = {
+                'count': count,
+                'revenue': revenue,
+            }
 
-        # Format summary
-        summary_lines = []
-        for category, items in sorted(categories.items()):
-            summary_lines.append(f"\n{category} ({len(items)} items):")
-            for item in items[:5]:  # Show max 5 items per category
-                summary_lines.append(f"  - {item['name']} (${item['price']:.2f})")
-                if item['description']:
-                    summary_lines.append(f"    {item['description']}")
-            if len(items) > 5:
-                summary_lines.append(f"  ... and {len(items) - 5} more items")
+        return stats_by_tenant
 
-        return "\n".join(summary_lines)
+    def _top_sellers(self, menu_items: List[MenuItem], limit: int) -> List[MenuItem]:
+        """Return the most ordered menu items, best seller first."""
+        # Partial selection instead of sorting the whole menu
+        return heapq.nlargest(
+            limit,
+            (item for item in menu_items if item.times_ordered > 0),
+            key=lambda x: x.times_ordered,
+        )
 
     def _prepare_sales_summary(
         self,
         menu_items: List[MenuItem],
-        sales_data: List[SalesData]
+        sales_stats: Dict[str, Any]
     ) -> str:
         """Prepare sales summary for GPT-4 analysis."""
-        # Calculate day of week stats
-        day_stats = {}
-        for sale in sales_data:
-            day = sale.order_date.strftime('%A')
-            if day not in day_stats:
-                day_stats[day] = {'count': 0, 'revenue': 0}
-            day_stats[day]['count'] += 1
-            day_stats[day]['revenue'] += float(sale.total_amount)
+        day_stats = sales_stats["orders_by_day"]
 
         # Get top items
-        top_items = sorted(
-            [item for item in menu_items if item.times_ordered > 0],
-            key=lambda x: x.times_ordered,
-            reverse=True
-        )[:10]
+        top_items = self._top_sellers(menu_items, 10)
 
         # Format summary
         summary_lines = [
-            f"Total Orders: {len(sales_data)}",
-            f"Date Range: {min(s.order_date for s in sales_data).strftime('%Y-%m-%d')} to {max(s.order_date for s in sales_data).strftime('%Y-%m-%d')}",
-            f"Total Revenue: ${sum(float(s.total_amount) for s in sales_data):.2f}",
-            f"Average Order Value: ${sum(float(s.total_amount) for s in sales_data) / len(sales_data):.2f}",
+            f"Total Orders: {sales_stats['total_orders']}",
+            f"Date Range: {sales_stats['first_order_date'].strftime('%Y-%m-%d')} to {sales_stats['last_order_date'].strftime('%Y-%m-%d')}",
+            f"Total Revenue: ${sales_stats['total_revenue']:.2f}",
+            f"Average Order Value: ${sales_stats['total_revenue'] / sales_stats['total_orders']:.2f}",
             "\nOrders by Day of Week:",
         ]
 
-        for day in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
+        for day in DAY_NAMES:
             if day in day_stats:
                 stats = day_stats[day]
                 summary_lines.append(
@@ -488,7 +998,8 @@ Provide ONLY the JSON response, no additional text."""
     def _template_brand_analysis(self, tenant: Tenant, menu_items: List[MenuItem]) -> Dict[str, Any]:
         """Template response when OpenAI API is not available."""
         categories = set(item.category for item in menu_items if item.category)
-        avg_price = sum(float(item.price) for item in menu_items if item.price) / len(menu_items) if menu_items else 0
+        # Sum the Decimal prices natively and convert once
+        avg_price = float(sum((item.price for item in menu_items if item.price), Decimal(0))) / len(menu_items) if menu_items else 0
 
         return {
             "brand_personality": {
@@ -508,34 +1019,21 @@ Provide ONLY the JSON response, no additional text."""
                 "hashtag_suggestions": ["#FreshFood", "#LocalEats", "#FoodLovers"],
                 "content_pillars": ["Product Showcase", "Behind the Scenes", "Customer Stories"]
             },
-            "note": "Using template analysis. Configure OPENAI_API_KEY for AI-powered insights.",
-            "analyzed_at": datetime.utcnow().isoformat(),
-            "total_menu_items": len(menu_items)
+            "note": "Using template analysis. Configure OPENAI_API_KEY for AI-powered insights."
         }
 
     def _template_sales_insights(
         self,
         menu_items: List[MenuItem],
-        sales_data: List[SalesData]
+        sales_stats: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Template response when OpenAI API is not available."""
-        # Calculate basic stats
-        day_stats = {}
-        for sale in sales_data:
-            day = sale.order_date.strftime('%A')
-            if day not in day_stats:
-                day_stats[day] = {'count': 0, 'revenue': 0}
-            day_stats[day]['count'] += 1
-            day_stats[day]['revenue'] += float(sale.total_amount)
+        day_stats = sales_stats["orders_by_day"]
 
         busiest_day = max(day_stats.items(), key=lambda x: x[1]['count'])[0] if day_stats else None
         slowest_day = min(day_stats.items(), key=lambda x: x[1]['count'])[0] if day_stats else None
 
-        top_items = sorted(
-            [item for item in menu_items if item.times_ordered > 0],
-            key=lambda x: x.times_ordered,
-            reverse=True
-        )[:3]
+        top_items = self._top_sellers(menu_items, 3)
 
         return {
             "sales_patterns": {
@@ -573,9 +1071,7 @@ Provide ONLY the JSON response, no additional text."""
                     "timing": f"Post on {busiest_day} to maximize engagement" if busiest_day else "Peak hours"
                 }
             ],
-            "note": "Using template analysis. Configure OPENAI_API_KEY for AI-powered insights.",
-            "analyzed_at": datetime.utcnow().isoformat(),
-            "total_orders_analyzed": len(sales_data)
+            "note": "Using template analysis. Configure OPENAI_API_KEY for AI-powered insights."
         }
 
     def _template_content_strategy(
@@ -585,11 +1081,7 @@ Provide ONLY the JSON response, no additional text."""
         menu_items: List[MenuItem]
     ) -> Dict[str, Any]:
         """Template response when OpenAI API is not available."""
-        top_items = sorted(
-            [item for item in menu_items if item.times_ordered > 0],
-            key=lambda x: x.times_ordered,
-            reverse=True
-        )[:4] if menu_items else []
+        top_items = self._top_sellers(menu_items, 4)
 
         return {
             "posting_schedule": {
@@ -671,8 +1163,7 @@ Provide ONLY the JSON response, no additional text."""
                     "expected_outcome": "Authentic social proof and extended reach"
                 }
             ],
-            "note": "Using template strategy. Configure OPENAI_API_KEY for AI-powered recommendations.",
-            "generated_at": datetime.utcnow().isoformat()
+            "note": "Using template strategy. Configure OPENAI_API_KEY for AI-powered recommendations."
         }
 
     async def generate_prompt_previews(
@@ -701,10 +1192,8 @@ Provide ONLY the JSON response, no additional text."""
                 MenuItem.tenant_id == uuid.UUID(tenant_id)
             ).all()
 
-            # Get sales data
-            sales_data = db.query(SalesData).filter(
-                SalesData.tenant_id == uuid.UUID(tenant_id)
-            ).all()
+            # Aggregate sales data
+            sales_stats = self._load_sales_stats(db, [uuid.UUID(tenant_id)]).get(uuid.UUID(tenant_id))
 
             # Get restaurant profile
             profile = db.query(RestaurantProfile).filter(
@@ -713,170 +1202,24 @@ Provide ONLY the JSON response, no additional text."""
 
             # Prepare data summaries
             menu_summary = self._prepare_menu_summary(menu_items) if menu_items else "No menu data imported yet."
-            sales_summary = self._prepare_sales_summary(menu_items, sales_data) if sales_data else "No sales data imported yet."
+            sales_summary = self._prepare_sales_summary(menu_items, sales_stats) if sales_stats else "No sales data imported yet."
 
             # Build all prompts
             prompts = {}
 
-            # 1. Brand Analysis Prompt
-            brand_prompt = f"""You are a restaurant branding expert. Analyze the following restaurant menu and generate a comprehensive brand personality profile.
-
-Restaurant Name: {tenant.name or 'Unknown'}
-
-Menu Categories and Items:
-{menu_summary}
-
-Based on this menu, provide a detailed analysis in JSON format with the following structure:
-{{
-    "brand_personality": {{
-        "voice_tone": "string describing the brand voice (e.g., 'casual and friendly', 'upscale and sophisticated')",
-        "key_attributes": ["attribute1", "attribute2", "attribute3"],
-        "target_audience": "description of ideal customer",
-        "unique_selling_points": ["usp1", "usp2", "usp3"]
-    }},
-    "cuisine_analysis": {{
-        "primary_cuisine": "main cuisine type",
-        "cuisine_style": "description of style (e.g., 'traditional Italian', 'modern fusion')",
-        "signature_items": ["item1", "item2", "item3"],
-        "price_positioning": "budget/mid-range/premium"
-    }},
-    "content_themes": {{
-        "recommended_themes": ["theme1", "theme2", "theme3"],
-        "hashtag_suggestions": ["#tag1", "#tag2", "#tag3"],
-        "content_pillars": ["pillar1", "pillar2", "pillar3"]
-    }}
-}}
-
-Provide ONLY the JSON response, no additional text."""
-
-            prompts["brand_analysis"] = {
-                "system_message": "You are a restaurant branding expert that provides analysis in JSON format.",
-                "user_prompt": brand_prompt,
-                "model": "gpt-4",
-                "temperature": 0.7,
-                "max_tokens": 1500,
-                "estimated_cost": "$0.045"
-            }
-
-            # 2. Sales Analysis Prompt
-            sales_prompt = f"""You are a restaurant sales analyst. Analyze the following sales data and provide actionable insights for social media marketing.
-
-Sales Summary:
-{sales_summary}
-
-Based on this data, provide insights in JSON format with the following structure:
-{{
-    "sales_patterns": {{
-        "busiest_days": ["day1", "day2"],
-        "slowest_days": ["day1", "day2"],
-        "peak_hours": "description if available",
-        "seasonal_trends": "description of any trends"
-    }},
-    "item_performance": {{
-        "top_sellers": [
-            {{"name": "item name", "times_ordered": number, "insight": "why it's popular"}},
-            ...
-        ],
-        "underperforming_items": [
-            {{"name": "item name", "times_ordered": number, "suggestion": "how to promote"}},
-            ...
-        ]
-    }},
-    "promotional_recommendations": [
-        {{
-            "strategy": "promotion type (e.g., 'Happy Hour', 'Monday Madness')",
-            "target_day": "day of week",
-            "reason": "why this would work",
-            "suggested_discount": "percentage or offer"
-        }},
-        ...
-    ],
-    "content_opportunities": [
-        {{
-            "opportunity": "description",
-            "best_items_to_feature": ["item1", "item2"],
-            "timing": "when to post"
-        }},
-        ...
-    ]
-}}
-
-Provide ONLY the JSON response, no additional text."""
-
-            prompts["sales_analysis"] = {
-                "system_message": "You are a restaurant sales analyst that provides insights in JSON format.",
-                "user_prompt": sales_prompt,
-                "model": "gpt-4",
-                "temperature": 0.7,
-                "max_tokens": 2000,
-                "estimated_cost": "$0.060"
+            # 1. Restaurant analysis: exactly the request _analyze_all sends
+            analysis_request = self._analysis_request(tenant, menu_items, sales_stats)
+            system_message, user_message = analysis_request["messages"]
+            prompts["restaurant_analysis"] = {
+                "system_message": system_message["content"],
+                "user_prompt": user_message["content"],
+                "response_format": analysis_request["response_format"],
+                "model": analysis_request["model"],
+                "temperature": analysis_request["temperature"],
+                "max_tokens": analysis_request["max_tokens"],
             }
 
-            # 3. Content Strategy Prompt (only if we have brand analysis)
-            if profile and profile.brand_analysis:
-                brand_summary = json.dumps(profile.brand_analysis, indent=2)
-                sales_summary_json = json.dumps(profile.sales_insights, indent=2) if profile.sales_insights else "No sales data"
-
-                strategy_prompt = f"""You are a social media content strategist for restaurants. Based on the brand analysis and sales insights below, create a comprehensive content strategy.
-
-Brand Analysis:
-{brand_summary}
-
-Sales Insights:
-{sales_summary_json}
-
-Create a content strategy in JSON format with the following structure:
-{{
-    "posting_schedule": {{
-        "frequency": "posts per week",
-        "best_days_to_post": ["day1", "day2"],
-        "best_times": ["time1", "time2"],
-        "rationale": "why this schedule works"
-    }},
-    "content_mix": [
-        {{
-            "content_type": "type (e.g., 'Product Showcase', 'Behind the Scenes')",
-            "percentage": 30,
-            "description": "what to post",
-            "example_topics": ["topic1", "topic2"]
-        }},
-        ...
-    ],
-    "featured_items_rotation": {{
-        "weekly_rotation": ["item1", "item2", "item3"],
-        "strategy": "how to rotate items"
-    }},
-    "promotional_calendar": [
-        {{
-            "week": 1,
-            "focus": "what to promote",
-            "items": ["item1", "item2"],
-            "offer_suggestion": "promotion idea"
-        }},
-        ...
-    ],
-    "engagement_tactics": [
-        {{
-            "tactic": "engagement method",
-            "implementation": "how to do it",
-            "expected_outcome": "what to expect"
-        }},
-        ...
-    ]
-}}
-
-Provide ONLY the JSON response, no additional text."""
-
-                prompts["content_strategy"] = {
-                    "system_message": "You are a social media strategist that provides content strategies in JSON format.",
-                    "user_prompt": strategy_prompt,
-                    "model": "gpt-4",
-                    "temperature": 0.7,
-                    "max_tokens": 2500,
-                    "estimated_cost": "$0.075"
-                }
-
-            # 4. Sample Post Suggestion Prompt
+            # 2. Sample Post Suggestion Prompt
             post_prompt = f"""You are a social media manager for a restaurant. Create an engaging promotional social media post.
 
 RESTAURANT PROFILE:
@@ -889,7 +1232,7 @@ MENU HIGHLIGHTS:
 {menu_summary[:500]}...
 
 SALES INSIGHTS:
-{sales_summary[:300] if sales_data else 'No sales data available'}
+{sales_summary[:300] if sales_stats else 'No sales data available'}
 
 POST CONTEXT:
 Target day: Monday
@@ -912,7 +1255,6 @@ Write a compelling social media post (2-3 sentences, max 280 characters).
                 "model": "gpt-4",
                 "temperature": 0.8,
                 "max_tokens": 400,
-                "estimated_cost": "$0.020"
             }
 
             # Restaurant context summary
@@ -921,7 +1263,7 @@ Write a compelling social media post (2-3 sentences, max 280 characters).
                 "cuisine_type": profile.cuisine_type if profile else 'Not set',
                 "location": profile.location if profile else {},
                 "menu_items_count": len(menu_items),
-                "sales_records_count": len(sales_data),
+                "sales_records_count": sales_stats["total_orders"] if sales_stats else 0,
                 "has_brand_analysis": bool(profile and profile.brand_analysis),
                 "has_sales_insights": bool(profile and profile.sales_insights),
             }
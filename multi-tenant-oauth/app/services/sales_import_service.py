@@ -1,18 +1,135 @@
 """Sales import service for Innowi POS order history Excel files."""
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
+import calendar
+import csv
+import io
+import itertools
+import json
 import uuid
 from datetime import datetime
 from decimal import Decimal
 from sqlalchemy.orm import Session
+import openpyxl
 import pandas as pd
 import logging
 import re
 
 from app.models import SalesData, RestaurantProfile, MenuItem
 
+# Optional Rust-backed Excel reader (much faster than openpyxl)
+try:
+    from python_calamine import CalamineWorkbook
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
 logger = logging.getLogger(__name__)
 
+# Trailing timezone abbreviation on order dates ("... 5:49:51 PM PST")
+TIMEZONE_SUFFIX_RE = re.compile(r'\s+[A-Z]{3,4}$')
+
+# Order date format in Innowi exports once the timezone is removed ("12/28/2025 5:49:51 PM")
+INNOWI_DATE_FORMAT = '%m/%d/%Y %I:%M:%S %p'
+
+# Single ordered item: "Item Name(quantity)"
+ORDER_ITEM_RE = re.compile(r'(.+)\((\d+)\)')
+
+# Currency symbols and thousands separators in amount cells ("$1,234.50")
+CURRENCY_CHARS_RE = re.compile(r'[$,]')
+
+# Amount columns stored as Numeric(10, 2)
+AMOUNT_FIELDS = ('subtotal', 'tax', 'tip', 'total_amount')
+
+# sales_data columns written by COPY, in order (id comes from the gen_random_uuid() server default)
+SALES_COPY_COLUMNS = (
+    'tenant_id', 'order_id', 'order_date', 'items_ordered', 'subtotal', 'tax', 'tip',
+    'total_amount', 'customer_name', 'customer_phone', 'order_source', 'status', 'created_at',
+)
+
+# Report metadata rows above the header in Innowi exports
+SALES_HEADER_ROWS = 5
+
+# Orders parsed and inserted per batch while streaming the sheet
+SALES_BATCH_SIZE = 10_000
+
+# Columns read from the Innowi order history export; anything else is skipped
+SALES_COLUMNS = frozenset({
+    'Order ID', 'Order Date', 'Items', 'Subtotal', 'Tax', 'Tip', 'Total Amount',
+    'Customer Name', 'Customer Phone', 'Source', 'Status',
+})
+
+
+class SalesTotals:
+    """Running totals over imported orders, so each batch can be dropped once it is inserted."""
+
+    def __init__(self):
+        """Start with no orders."""
+        self.total_orders = 0
+        self.total_revenue = 0.0
+        self.first_order_date = None
+        self.last_order_date = None
+        # Keyed by sold item name / weekday number, in first-seen order
+        self.item_quantities: Dict[str, int] = {}
+        self.item_revenues: Dict[str, float] = {}
+        self.day_counts: Dict[int, int] = {}
+        self.day_revenues: Dict[int, float] = {}
+        self.customers = set()
+
+    def add(self, orders: List[Dict[str, Any]]) -> None:
+        """
+        Fold a batch of parsed orders into the totals.
+
+        Args:
+            orders: Parsed order dictionaries (float amounts)
+        """
+        if not orders:
+            return
+
+        sales = pd.DataFrame(orders, columns=['order_date', 'total_amount', 'customer_name'])
+        order_dates = pd.to_datetime(sales['order_date'])
+
+        self.total_orders += len(sales)
+        self.total_revenue += float(sales['total_amount'].sum())
+
+        first_order_date = min(order['order_date'] for order in orders)
+        last_order_date = max(order['order_date'] for order in orders)
+        if self.first_order_date is None or first_order_date < self.first_order_date:
+            self.first_order_date = first_order_date
+        if self.last_order_date is None or last_order_date > self.last_order_date:
+            self.last_order_date = last_order_date
+
+        # Group on the integer weekday; names are only attached in the final stats
+        by_day = sales.groupby(order_dates.dt.dayofweek, sort=False)['total_amount'].agg(
+            count='count',
+            revenue='sum',
+        )
+        for day, count, revenue in zip(by_day.index, by_day['count'], by_day['revenue']):
+            self.day_counts[day] = self.day_counts.get(day, 0) + int(count)
+            self.day_revenues[day] = self.day_revenues.get(day, 0.0) + float(revenue)
+
+        self.customers.update(sales['customer_name'].dropna().loc[lambda names: names != ''])
+
+        # Flatten orders into one row per sold item, spreading the order total
+        # evenly across its items as an estimated revenue
+        sold_items = pd.DataFrame(
+            [
+                (item['name'], item.get('quantity', 1), order['total_amount'] / len(order['items_ordered']))
+                for order in orders
+                for item in order['items_ordered']
+            ],
+            columns=['name', 'quantity', 'revenue'],
+        )
+
+        # Count how many times each item was ordered (first-seen order kept)
+        totals = sold_items.groupby('name', sort=False).agg(
+            quantity=('quantity', 'sum'),
+            revenue=('revenue', 'sum'),
+        )
+        for name, quantity, revenue in zip(totals.index, totals['quantity'], totals['revenue']):
+            self.item_quantities[name] = self.item_quantities.get(name, 0) + int(quantity)
+            self.item_revenues[name] = self.item_revenues.get(name, 0.0) + float(revenue)
+
 
 class SalesImportService:
     """Service for importing sales/order history from Innowi POS Excel files."""
@@ -43,58 +160,56 @@ class SalesImportService:
         - Header rows may contain report metadata (skip first 4 rows)
         """
         try:
-            # Read Excel file, skipping header rows (Innowi has 5 header rows)
-            df = pd.read_excel(file_path, skiprows=5, engine='openpyxl')
-
-            # Clean column names (remove extra whitespace)
-            df.columns = df.columns.str.strip()
-
-            # Parse orders from DataFrame
-            orders = self._parse_orders(df)
+            tenant_uuid = uuid.UUID(tenant_id)
 
             # Clear existing sales data for this tenant
-            db.query(SalesData).filter(SalesData.tenant_id == uuid.UUID(tenant_id)).delete()
-
-            # Import orders into database
-            imported_orders = []
-            for order_data in orders:
-                sales_record = self._create_sales_record(order_data, tenant_id)
-                db.add(sales_record)
-                imported_orders.append(sales_record)
+            db.query(SalesData).filter(SalesData.tenant_id == tenant_uuid).delete()
+
+            # Stream the sheet in batches, parsing and inserting each one
+            # (no per-row ORM objects, no whole-sheet DataFrame); only running
+            # totals outlive a batch
+            totals = SalesTotals()
+            for frame in self._iter_order_frames(file_path):
+                batch = self._parse_orders(frame)
+                self._insert_sales_rows(
+                    db,
+                    [self._sales_mapping(order_data, tenant_uuid) for order_data in batch],
+                )
+                totals.add(batch)
 
             # Update menu items popularity based on sales data
-            await self._update_menu_popularity(db, tenant_id, orders)
+            await self._update_menu_popularity(db, tenant_id, totals)
 
             # Update restaurant profile with import metadata
             profile = db.query(RestaurantProfile).filter(
-                RestaurantProfile.tenant_id == uuid.UUID(tenant_id)
+                RestaurantProfile.tenant_id == tenant_uuid
             ).first()
 
             if profile:
                 profile.last_sales_import = datetime.utcnow()
-                profile.sales_records_count = len(imported_orders)
+                profile.sales_records_count = totals.total_orders
             else:
                 # Create new profile if doesn't exist
                 profile = RestaurantProfile(
-                    tenant_id=uuid.UUID(tenant_id),
+                    tenant_id=tenant_uuid,
                     last_sales_import=datetime.utcnow(),
-                    sales_records_count=len(imported_orders),
+                    sales_records_count=totals.total_orders,
                 )
                 db.add(profile)
 
             db.commit()
 
             # Calculate statistics
-            stats = self._calculate_sales_stats(imported_orders)
+            stats = self._calculate_sales_stats(totals)
 
-            logger.info(f"Successfully imported {len(imported_orders)} orders for tenant {tenant_id}")
+            logger.info(f"Successfully imported {totals.total_orders} orders for tenant {tenant_id}")
 
             return {
                 "success": True,
-                "orders_imported": len(imported_orders),
+                "orders_imported": totals.total_orders,
                 "date_range": {
-                    "start": min(order.order_date for order in imported_orders) if imported_orders else None,
-                    "end": max(order.order_date for order in imported_orders) if imported_orders else None,
+                    "start": totals.first_order_date,
+                    "end": totals.last_order_date,
                 },
                 "statistics": stats,
             }
@@ -108,102 +223,150 @@ class SalesImportService:
                 "orders_imported": 0,
             }
 
-    def _parse_orders(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _iter_sheet_rows(self, file_path: str) -> Iterator[List[Any]]:
         """
-        Parse orders from DataFrame.
+        Stream raw cell values from the first sheet of an Excel file.
 
         Args:
-            df: DataFrame from order history Excel
+            file_path: Path to Excel file
 
-        Returns:
-            List of order dictionaries
+        Yields:
+            Row values, with empty cells as None
         """
-        orders = []
-        for _, row in df.iterrows():
-            try:
-                # Skip empty rows
-                if pd.isna(row.get('Order ID')):
-                    continue
-
-                # Parse order date (handle various formats)
-                order_date = self._parse_date(row.get('Order Date'))
-                if not order_date:
-                    logger.warning(f"Skipping order with invalid date: {row.get('Order Date')}")
-                    continue
-
-                # Parse items ordered
-                items_str = str(row.get('Items', ''))
-                items_ordered = self._parse_items_ordered(items_str)
-
-                # Parse total amount
-                total_amount = self._parse_decimal(row.get('Total Amount'))
-                if not total_amount:
-                    logger.warning(f"Skipping order with invalid total: {row.get('Total Amount')}")
-                    continue
-
-                order = {
-                    'order_id': str(row.get('Order ID', '')),
-                    'order_date': order_date,
-                    'items_ordered': items_ordered,
-                    'subtotal': self._parse_decimal(row.get('Subtotal')) if 'Subtotal' in row else None,
-                    'tax': self._parse_decimal(row.get('Tax')) if 'Tax' in row else None,
-                    'tip': self._parse_decimal(row.get('Tip')) if 'Tip' in row else None,
-                    'total_amount': total_amount,
-                    'customer_name': str(row.get('Customer Name', '')) if pd.notna(row.get('Customer Name')) else None,
-                    'customer_phone': str(row.get('Customer Phone', '')) if pd.notna(row.get('Customer Phone')) else None,
-                    'order_source': str(row.get('Source', 'pos')) if 'Source' in row else 'pos',
-                    'status': str(row.get('Status', 'completed')),
-                }
-                orders.append(order)
-
-            except Exception as e:
-                logger.warning(f"Error parsing order row: {e}")
-                continue
-
-        return orders
-
-    def _parse_date(self, date_value: Any) -> Optional[datetime]:
+        if HAS_CALAMINE:
+            sheet = CalamineWorkbook.from_path(file_path).get_sheet_by_index(0)
+            for row in sheet.iter_rows():
+                yield [None if value == '' else value for value in row]
+            return
+
+        # read_only keeps openpyxl from loading the whole workbook into memory
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for row in workbook.worksheets[0].iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            workbook.close()
+
+    def _iter_order_frames(
+        self,
+        file_path: str,
+        batch_size: int = SALES_BATCH_SIZE,
+    ) -> Iterator[pd.DataFrame]:
         """
-        Parse date from various formats.
+        Read an Innowi order history export in DataFrame batches.
+
+        Skips the report metadata rows and any columns we don't import.
 
         Args:
-            date_value: Date value from Excel
+            file_path: Path to Excel file
+            batch_size: Rows per DataFrame
+
+        Yields:
+            DataFrames with stripped column names
+        """
+        rows = itertools.islice(self._iter_sheet_rows(file_path), SALES_HEADER_ROWS, None)
+
+        header = next(rows, None)
+        if header is None:
+            return
+
+        # Clean column names (remove extra whitespace)
+        names = [str(name).strip() if name is not None else '' for name in header]
+        keep = [index for index, name in enumerate(names) if name in SALES_COLUMNS]
+        columns = [names[index] for index in keep]
+
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                return
+            yield pd.DataFrame(
+                [[row[index] if index < len(row) else None for index in keep] for row in batch],
+                columns=columns,
+            )
+
+    def _parse_orders(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Parse orders from DataFrame.
+
+        Cleans whole columns at once and only walks the rows a single time to
+        emit the order dictionaries.
+
+        Args:
+            df: DataFrame from order history Excel
 
         Returns:
-            datetime object or None
+            List of order dictionaries
         """
-        if pd.isna(date_value):
-            return None
+        def column(name: str) -> pd.Series:
+            if name in df.columns:
+                return df[name]
+            return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+        def text(name: str, default: Optional[str] = None) -> pd.Series:
+            values = column(name)
+            return values.map(str, na_action='ignore').astype(object).where(values.notna(), default)
+
+        def amounts(name: str) -> pd.Series:
+            # Kept as floats; Decimal is only built at the database boundary
+            values = column(name)
+            if not pd.api.types.is_numeric_dtype(values):
+                values = pd.to_numeric(
+                    values.astype('string').str.replace(CURRENCY_CHARS_RE, '', regex=True).str.strip(),
+                    errors='coerce',
+                )
+            return values.astype(float)
 
-        try:
-            # If already a datetime
-            if isinstance(date_value, datetime):
-                return date_value
-
-            # Try parsing string formats
-            if isinstance(date_value, str):
-                # Remove timezone abbreviations (PST, EST, etc.) first
-                date_str = re.sub(r'\s+[A-Z]{3,4}$', '', date_value)
-
-                # Try common formats
-                for fmt in [
-                    '%m/%d/%Y %I:%M:%S %p',  # 12/28/2025 5:49:51 PM (after TZ removal)
-                    '%m/%d/%Y %H:%M:%S',     # 12/28/2025 17:49:51
-                    '%m/%d/%Y',              # 12/28/2025
-                    '%Y-%m-%d %H:%M:%S',     # 2025-12-28 17:49:51
-                    '%Y-%m-%d',              # 2025-12-28
-                ]:
-                    try:
-                        return datetime.strptime(date_str, fmt)
-                    except ValueError:
-                        continue
-
-            # Try pandas to_datetime as fallback
-            return pd.to_datetime(date_value)
+        # Skip empty rows
+        df = df[column('Order ID').notna()]
+        if df.empty:
+            return []
 
-        except Exception as e:
-            logger.warning(f"Could not parse date: {date_value} - {e}")
-            return None
+        # Parse order dates (handle various formats, drop timezone abbreviations)
+        raw_dates = column('Order Date')
+        if pd.api.types.is_datetime64_any_dtype(raw_dates):
+            order_dates = raw_dates
+        else:
+            date_strings = raw_dates.astype('string').str.replace(TIMEZONE_SUFFIX_RE, '', regex=True)
+
+            # Innowi's own format takes the fast fixed-format path; anything
+            # else falls back to the (much slower) mixed-format parser
+            order_dates = pd.to_datetime(date_strings, format=INNOWI_DATE_FORMAT, errors='coerce')
+            unparsed = order_dates.isna() & date_strings.notna()
+            if unparsed.any():
+                order_dates[unparsed] = pd.to_datetime(date_strings[unparsed], format='mixed', errors='coerce')
+
+        total_amounts = amounts('Total Amount')
+
+        # Whole-number IDs read as floats ("1001.0") are kept as "1001"
+        order_ids = column('Order ID')
+        if pd.api.types.is_float_dtype(order_ids) and (order_ids % 1 == 0).all():
+            order_ids = order_ids.astype('Int64')
+
+        parsed = pd.DataFrame({
+            'order_id': order_ids.map(str).astype(object),
+            'order_date': order_dates,
+            'items_ordered': column('Items').fillna('').astype(str).map(self._parse_items_ordered),
+            'subtotal': amounts('Subtotal'),
+            'tax': amounts('Tax'),
+            'tip': amounts('Tip'),
+            'total_amount': total_amounts,
+            'customer_name': text('Customer Name'),
+            'customer_phone': text('Customer Phone'),
+            'order_source': text('Source', 'pos'),
+            'status': text('Status', 'completed'),
+        })
+
+        invalid_date = parsed['order_date'].isna()
+        if invalid_date.any():
+            logger.warning(f"Skipping {int(invalid_date.sum())} orders with invalid dates")
+
+        # Zero or unparseable totals are skipped as well
+        invalid_total = ~invalid_date & (total_amounts.isna() | (total_amounts == 0))
+        if invalid_total.any():
+            logger.warning(f"Skipping {int(invalid_total.sum())} orders with invalid totals")
+
+        parsed = parsed[~(invalid_date | invalid_total)]
+        return [row._asdict() for row in parsed.itertuples(index=False)]
 
     def _parse_items_ordered(self, items_str: str) -> List[Dict[str, Any]]:
         """
@@ -225,7 +388,7 @@ class SalesImportService:
         for part in item_parts:
             part = part.strip()
             # Match pattern: "Item Name(quantity)"
-            match = re.match(r'(.+)\((\d+)\)', part)
+            match = ORDER_ITEM_RE.match(part)
             if match:
                 name = match.group(1).strip()
                 quantity = int(match.group(2))
@@ -242,37 +405,11 @@ class SalesImportService:
 
         return items
 
-    def _create_sales_record(self, order_data: Dict[str, Any], tenant_id: str) -> SalesData:
-        """
-        Create a SalesData model instance from parsed data.
-
-        Args:
-            order_data: Parsed order dictionary
-            tenant_id: Tenant UUID
-
-        Returns:
-            SalesData instance
-        """
-        return SalesData(
-            tenant_id=uuid.UUID(tenant_id),
-            order_id=order_data['order_id'],
-            order_date=order_data['order_date'],
-            items_ordered=order_data['items_ordered'],
-            subtotal=order_data.get('subtotal'),
-            tax=order_data.get('tax'),
-            tip=order_data.get('tip'),
-            total_amount=order_data['total_amount'],
-            customer_name=order_data.get('customer_name'),
-            customer_phone=order_data.get('customer_phone'),
-            order_source=order_data.get('order_source'),
-            status=order_data['status'],
-        )
-
     async def _update_menu_popularity(
         self,
         db: Session,
         tenant_id: str,
-        orders: List[Dict[str, Any]]
+        totals: SalesTotals
     ) -> None:
         """
         Update menu items popularity based on sales data.
@@ -280,101 +417,148 @@ class SalesImportService:
         Args:
             db: Database session
             tenant_id: Tenant UUID
-            orders: List of order dictionaries
+            totals: Running totals of the imported orders
         """
-        # Count how many times each item was ordered
-        item_counts = {}
-        item_revenues = {}
-
-        for order in orders:
-            for item in order['items_ordered']:
-                item_name = item['name']
-                quantity = item.get('quantity', 1)
-
-                if item_name not in item_counts:
-                    item_counts[item_name] = 0
-                    item_revenues[item_name] = Decimal('0')
-
-                item_counts[item_name] += quantity
-
-                # Estimate revenue (total / number of items in order)
-                num_items_in_order = len(order['items_ordered'])
-                estimated_item_revenue = order['total_amount'] / num_items_in_order
-                item_revenues[item_name] += estimated_item_revenue
-
-        # Update menu items
-        menu_items = db.query(MenuItem).filter(
+        item_counts = totals.item_quantities
+        item_revenues = {name: Decimal(f"{revenue:.2f}") for name, revenue in totals.item_revenues.items()}
+
+        # Normalize sold item names once for fuzzy matching, and index them so
+        # case-only differences resolve without scanning every sold item
+        folded_item_names = [(item_name, item_name.casefold()) for item_name in item_counts]
+        item_names_by_folded = {}
+        for item_name, folded_name in folded_item_names:
+            item_names_by_folded.setdefault(folded_name, item_name)
+
+        # Update menu items (plain rows, written back with one bulk UPDATE)
+        rows = db.query(MenuItem.id, MenuItem.name, MenuItem.times_ordered).filter(
             MenuItem.tenant_id == uuid.UUID(tenant_id)
         ).all()
 
-        for menu_item in menu_items:
-            # Try to match by exact name first
-            if menu_item.name in item_counts:
-                menu_item.times_ordered = item_counts[menu_item.name]
-                menu_item.total_revenue = item_revenues[menu_item.name]
+        menu_items = []
+        for menu_item_id, name, times_ordered in rows:
+            # Try to match by exact name first, then case-insensitive, then fuzzy (partial) match
+            if name in item_counts:
+                item_name = name
             else:
-                # Try fuzzy match (case-insensitive, partial match)
-                for item_name, count in item_counts.items():
-                    if menu_item.name.lower() in item_name.lower() or item_name.lower() in menu_item.name.lower():
-                        menu_item.times_ordered = count
-                        menu_item.total_revenue = item_revenues[item_name]
-                        break
+                menu_name = name.casefold()
+                if menu_name not in item_names_by_folded:
+                    # Remember the scan result so repeated menu names are only scanned once
+                    item_names_by_folded[menu_name] = next(
+                        (
+                            item_name
+                            for item_name, folded_name in folded_item_names
+                            if menu_name in folded_name or folded_name in menu_name
+                        ),
+                        None,
+                    )
+                item_name = item_names_by_folded[menu_name]
+
+            menu_item = {'id': menu_item_id, 'times_ordered': times_ordered or 0}
+            if item_name is not None:
+                menu_item['times_ordered'] = item_counts[item_name]
+                menu_item['total_revenue'] = item_revenues[item_name]
+            menu_items.append(menu_item)
 
         # Calculate popularity ranking (1 = most popular)
-        sorted_items = sorted(menu_items, key=lambda x: x.times_ordered, reverse=True)
+        sorted_items = sorted(menu_items, key=lambda x: x['times_ordered'], reverse=True)
         for rank, menu_item in enumerate(sorted_items, start=1):
-            if menu_item.times_ordered > 0:
-                menu_item.popularity_rank = rank
+            if menu_item['times_ordered'] > 0:
+                menu_item['popularity_rank'] = rank
+
+        db.bulk_update_mappings(MenuItem, [
+            menu_item for menu_item in menu_items
+            if 'total_revenue' in menu_item or 'popularity_rank' in menu_item
+        ])
 
-    def _parse_decimal(self, value: Any) -> Optional[Decimal]:
+    def _sales_mapping(self, order_data: Dict[str, Any], tenant_id: uuid.UUID) -> Dict[str, Any]:
         """
-        Parse a value to Decimal, handling various formats.
+        Build a SalesData insert mapping from a parsed order.
 
         Args:
-            value: Value to parse
+            order_data: Parsed order dictionary (float amounts)
+            tenant_id: Tenant UUID
 
         Returns:
-            Decimal value or None
+            Column mapping with amounts as Decimal (None when missing)
+        """
+        mapping = dict(order_data, tenant_id=tenant_id)
+        for field in AMOUNT_FIELDS:
+            value = mapping[field]
+            mapping[field] = None if pd.isna(value) else Decimal(f"{value:.2f}")
+        return mapping
+
+    def _insert_sales_rows(self, db: Session, mappings: List[Dict[str, Any]]) -> None:
+        """
+        Insert sales rows with COPY, inside the session's transaction.
+
+        Falls back to bulk_insert_mappings when the driver has no COPY support.
+
+        Args:
+            db: Database session
+            mappings: SalesData column mappings
         """
-        if pd.isna(value):
-            return None
+        if not mappings:
+            return
 
+        cursor = db.connection().connection.cursor()
         try:
-            # Remove currency symbols and commas
-            if isinstance(value, str):
-                value = value.replace('$', '').replace(',', '').strip()
-            return Decimal(str(value))
-        except Exception:
-            return None
-
-    def _calculate_sales_stats(self, orders: List[SalesData]) -> Dict[str, Any]:
+            if not hasattr(cursor, 'copy_expert'):
+                db.bulk_insert_mappings(SalesData, mappings)
+                return
+
+            # Unquoted empty CSV fields load as NULL
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            created_at = datetime.utcnow()
+            for mapping in mappings:
+                writer.writerow((
+                    mapping['tenant_id'],
+                    mapping['order_id'],
+                    mapping['order_date'],
+                    json.dumps(mapping['items_ordered']),
+                    mapping['subtotal'],
+                    mapping['tax'],
+                    mapping['tip'],
+                    mapping['total_amount'],
+                    mapping['customer_name'],
+                    mapping['customer_phone'],
+                    mapping['order_source'],
+                    mapping['status'],
+                    created_at,
+                ))
+            buffer.seek(0)
+
+            cursor.copy_expert(
+                f"COPY sales_data ({', '.join(SALES_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+    def _calculate_sales_stats(self, totals: SalesTotals) -> Dict[str, Any]:
         """
         Calculate statistics about imported sales.
 
         Args:
-            orders: List of imported sales records
+            totals: Running totals of the imported orders
 
         Returns:
             Statistics dictionary
         """
-        if not orders:
+        if not totals.total_orders:
             return {}
 
-        # Calculate totals
-        total_revenue = sum(float(order.total_amount) for order in orders)
-        total_orders = len(orders)
+        total_revenue = totals.total_revenue
+        total_orders = totals.total_orders
 
-        # Calculate by day of week
-        day_of_week_stats = {}
-        for order in orders:
-            day_name = order.order_date.strftime('%A')  # Monday, Tuesday, etc.
-            if day_name not in day_of_week_stats:
-                day_of_week_stats[day_name] = {'count': 0, 'revenue': 0}
-            day_of_week_stats[day_name]['count'] += 1
-            day_of_week_stats[day_name]['revenue'] += float(order.total_amount)
+        # Calculate by day of week (Monday, Tuesday, etc.)
+        day_of_week_stats = {
+            calendar.day_name[day]: {'count': count, 'revenue': totals.day_revenues[day]}
+            for day, count in totals.day_counts.items()
+        }
 
         # Find slowest day
-        slowest_day = min(day_of_week_stats.items(), key=lambda x: x[1]['count'])[0] if day_of_week_stats else None
+        slowest_day = min(day_of_week_stats, key=lambda day_name: day_of_week_stats[day_name]['count']) if day_of_week_stats else None
 
         # Calculate average order value
         avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
@@ -385,5 +569,5 @@ class SalesImportService:
             'average_order_value': round(avg_order_value, 2),
             'orders_by_day_of_week': day_of_week_stats,
             'slowest_day': slowest_day,
-            'unique_customers': len(set(order.customer_name for order in orders if order.customer_name)),
+            'unique_customers': len(totals.customers),
         }
@@ -1,18 +1,46 @@
 """Post scheduling service using Celery."""
 
 from datetime import datetime, timedelta
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Dict, Optional, Union
+from sqlalchemy.orm import Session, joinedload
 
 from app.models import PostHistory
 from app.services import PostService, TokenService
+import asyncio
+import json
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import uuid
 
+# Optional faster JSON parser for Graph API responses
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _graph_json(response) -> dict:
+    """Parse a Graph API response body (requests or httpx response)."""
+    if HAS_ORJSON:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
 
 class SchedulerService:
     """Service for scheduling social media posts."""
 
+    # Graph API request timeout in seconds
+    GRAPH_API_TIMEOUT = 30
+
+    # Claims older than the publishing task's hard time limit belong to a dead run
+    CLAIM_TIMEOUT = timedelta(minutes=30)
+
+    # Shared across instances so Graph API connections stay alive between posts
+    _session: Optional[requests.Session] = None
+
     def __init__(self):
         """Initialize scheduler service."""
         self.post_service = PostService()
@@ -65,83 +93,75 @@ class SchedulerService:
         db.commit()
         db.refresh(post)
 
-        # Schedule Celery task (if Celery is available)
-        try:
-            from app.tasks import publish_scheduled_post
-
-            # Calculate delay
-            delay_seconds = (scheduled_for - datetime.utcnow()).total_seconds()
-
-            if delay_seconds > 0:
-                # Schedule the task
-                publish_scheduled_post.apply_async(
-                    args=[str(post.id)],
-                    countdown=int(delay_seconds),
-                )
-        except (ImportError, Exception) as e:
-            print(f"Celery scheduling not available: {e}")
-            # Post will be picked up by periodic task
+        # Published by the publish-due-scheduled-posts periodic task once due
 
         return post
 
-    def get_due_posts(self, db: Session, limit: int = 100) -> list[PostHistory]:
+    def get_due_posts(
+        self,
+        db: Session,
+        limit: int = 100,
+        skip_locked: bool = False,
+    ) -> list[PostHistory]:
         """
         Get posts that are due to be published.
 
         Args:
             db: Database session
             limit: Maximum number of posts
+            skip_locked: Lock the returned rows, skipping rows another
+                transaction already holds
 
         Returns:
             List of PostHistory objects
         """
         now = datetime.utcnow()
 
-        posts = (
+        query = (
             db.query(PostHistory)
             .filter(
                 PostHistory.status == "scheduled",
                 PostHistory.scheduled_for <= now,
             )
+            .options(joinedload(PostHistory.social_account))
             .order_by(PostHistory.scheduled_for)
             .limit(limit)
-            .all()
         )
+        if skip_locked:
+            query = query.with_for_update(skip_locked=True, of=PostHistory)
 
-        return posts
+        return query.all()
 
     def publish_post(
         self,
         db: Session,
-        post_id: str,
+        post: Union[PostHistory, str],
     ) -> bool:
         """
         Publish a scheduled post immediately.
 
         Args:
             db: Database session
-            post_id: Post UUID
+            post: Post UUID, or an already loaded PostHistory (e.g. from
+                get_due_posts) to skip re-reading it
 
         Returns:
             True if successful
         """
-        post = self.post_service.get_post_by_id(db, post_id)
+        if not isinstance(post, PostHistory):
+            post = self.post_service.get_post_by_id(db, post)
 
         if not post:
             return False
 
+        post_id = str(post.id)
+
         if post.status != "scheduled":
             return False
 
         try:
-            # Get social account first
-            from app.models import SocialAccount
-
-            social_account = (
-                db.query(SocialAccount)
-                .filter(SocialAccount.id == post.social_account_id)
-                .first()
-            )
+            # Get social account first (already loaded for get_due_posts rows)
+            social_account = post.social_account
 
             if not social_account:
                 raise Exception("Social account not found")
@@ -193,6 +213,124 @@ class SchedulerService:
             )
             return False
 
+    async def publish_due_posts(self, db: Session, limit: int = 100) -> Dict[str, int]:
+        """
+        Publish all due scheduled posts concurrently.
+
+        Accounts and tokens are resolved up front, the Graph API calls for
+        every post run in parallel on one shared client, and the resulting
+        statuses are committed together.
+
+        Args:
+            db: Database session
+            limit: Maximum number of posts
+
+        Returns:
+            Dict with published and failed counts
+        """
+        posts = self.get_due_posts(db, limit, skip_locked=True)
+        if not posts:
+            return {"published": 0, "failed": 0}
+
+        # Snapshot what publishing needs; the commits below (and the token
+        # lookups) expire the loaded objects
+        targets = [
+            {
+                "tenant_id": str(post.tenant_id),
+                "platform": post.platform,
+                "account_id": post.social_account.platform_account_id if post.social_account else None,
+                "caption": post.caption,
+                "image_url": post.image_url,
+            }
+            for post in posts
+        ]
+
+        # Claim the posts so an overlapping run does not publish them twice
+        claimed_at = datetime.utcnow()
+        for post in posts:
+            post.status = "publishing"
+            post.claimed_at = claimed_at
+        db.commit()
+
+        async def publish(client: httpx.AsyncClient, target: dict) -> str:
+            if not target["account_id"]:
+                raise Exception("Social account not found")
+
+            access_token = self.token_service.get_active_token(
+                db=db,
+                tenant_id=target["tenant_id"],
+                platform=target["platform"],
+                platform_account_id=target["account_id"],
+            )
+            if not access_token:
+                raise Exception("No active OAuth token found")
+
+            if target["platform"] == "facebook":
+                return await self._post_to_facebook_async(
+                    client,
+                    page_id=target["account_id"],
+                    access_token=access_token,
+                    caption=target["caption"],
+                    image_url=target["image_url"],
+                )
+            if target["platform"] == "instagram":
+                return await self._post_to_instagram_async(
+                    client,
+                    instagram_account_id=target["account_id"],
+                    access_token=access_token,
+                    caption=target["caption"],
+                    image_url=target["image_url"],
+                )
+            raise Exception(f"Unsupported platform: {target['platform']}")
+
+        async with httpx.AsyncClient(
+            timeout=self.GRAPH_API_TIMEOUT,
+            limits=httpx.Limits(max_connections=50),
+        ) as client:
+            results = await asyncio.gather(
+                *[publish(client, target) for target in targets],
+                return_exceptions=True,
+            )
+
+        # Record every outcome in one commit
+        published = 0
+        now = datetime.utcnow()
+        for post, result in zip(posts, results):
+            if isinstance(result, Exception):
+                post.status = "failed"
+                post.error_message = str(result)
+            else:
+                post.status = "published"
+                post.platform_post_id = result
+                post.posted_at = now
+                published += 1
+        db.commit()
+
+        return {"published": published, "failed": len(posts) - published}
+
+    def release_stale_claims(self, db: Session) -> int:
+        """
+        Return posts stuck in 'publishing' to the schedule.
+
+        A claim outlives its run only if the worker died (or hit the task
+        time limit) between claiming and recording the outcome.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of posts released
+        """
+        released = db.query(PostHistory).filter(
+            PostHistory.status == "publishing",
+            PostHistory.claimed_at < datetime.utcnow() - self.CLAIM_TIMEOUT,
+        ).update(
+            {PostHistory.status: "scheduled", PostHistory.claimed_at: None},
+            synchronize_session=False,
+        )
+        db.commit()
+        return released
+
     def cancel_scheduled_post(
         self,
         db: Session,
@@ -219,14 +357,27 @@ class SchedulerService:
         return True
 
     # Helper methods
-    def _post_to_facebook(
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Get the pooled HTTP session for Graph API calls."""
+        if cls._session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(
+                pool_connections=20,
+                pool_maxsize=50,
+                max_retries=Retry(total=3, backoff_factor=0.3),
+            ))
+            cls._session = session
+        return cls._session
+
+    def _facebook_request(
         self,
         page_id: str,
         access_token: str,
         caption: str,
         image_url: Optional[str] = None,
-    ) -> str:
-        """Post to Facebook and return post ID."""
+    ) -> tuple[str, dict]:
+        """Build the Facebook feed/photo request URL and form data."""
         url = f"https://graph.facebook.com/v18.0/{page_id}/feed"
 
         data = {
@@ -240,9 +391,10 @@ class SchedulerService:
             data["caption"] = caption
             del data["message"]
 
-        response = requests.post(url, data=data)
-        result = response.json()
+        return url, data
 
+    def _facebook_post_id(self, result: dict) -> str:
+        """Extract the post ID from a Facebook publish response."""
         if "id" in result:
             return result["id"]
         elif "error" in result:
@@ -250,6 +402,31 @@ class SchedulerService:
         else:
             raise Exception("Failed to post to Facebook")
 
+    def _post_to_facebook(
+        self,
+        page_id: str,
+        access_token: str,
+        caption: str,
+        image_url: Optional[str] = None,
+    ) -> str:
+        """Post to Facebook and return post ID."""
+        url, data = self._facebook_request(page_id, access_token, caption, image_url)
+        response = self._get_session().post(url, data=data, timeout=self.GRAPH_API_TIMEOUT)
+        return self._facebook_post_id(_graph_json(response))
+
+    async def _post_to_facebook_async(
+        self,
+        client: httpx.AsyncClient,
+        page_id: str,
+        access_token: str,
+        caption: str,
+        image_url: Optional[str] = None,
+    ) -> str:
+        """Post to Facebook on an async client and return post ID."""
+        url, data = self._facebook_request(page_id, access_token, caption, image_url)
+        response = await client.post(url, data=data)
+        return self._facebook_post_id(_graph_json(response))
+
     def _post_to_instagram(
         self,
         instagram_account_id: str,
@@ -269,8 +446,8 @@ class SchedulerService:
             "access_token": access_token,
         }
 
-        response = requests.post(container_url, data=container_data)
-        result = response.json()
+        response = self._get_session().post(container_url, data=container_data, timeout=self.GRAPH_API_TIMEOUT)
+        result = _graph_json(response)
 
         if "id" not in result:
             error = result.get("error", {})
@@ -289,8 +466,56 @@ class SchedulerService:
             "access_token": access_token,
         }
 
-        response = requests.post(publish_url, data=publish_data)
-        result = response.json()
+        response = self._get_session().post(publish_url, data=publish_data, timeout=self.GRAPH_API_TIMEOUT)
+        result = _graph_json(response)
+
+        if "id" in result:
+            return result["id"]
+        elif "error" in result:
+            raise Exception(
+                result["error"].get("message", "Failed to publish Instagram post")
+            )
+        else:
+            raise Exception("Failed to publish to Instagram")
+
+    async def _post_to_instagram_async(
+        self,
+        client: httpx.AsyncClient,
+        instagram_account_id: str,
+        access_token: str,
+        caption: str,
+        image_url: Optional[str] = None,
+    ) -> str:
+        """Post to Instagram on an async client and return media ID."""
+        if not image_url:
+            raise Exception("Instagram posts require an image")
+
+        # Step 1: Create container
+        response = await client.post(
+            f"https://graph.facebook.com/v18.0/{instagram_account_id}/media",
+            data={
+                "image_url": image_url,
+                "caption": caption,
+                "access_token": access_token,
+            },
+        )
+        result = _graph_json(response)
+
+        if "id" not in result:
+            error = result.get("error", {})
+            raise Exception(
+                error.get("message", "Failed to create Instagram container")
+            )
+
+        # Step 2: Publish container
+        response = await client.post(
+            f"https://graph.facebook.com/v18.0/{instagram_account_id}/media_publish",
+            data={
+                "creation_id": result["id"],
+                "access_token": access_token,
+            },
+        )
+        result = _graph_json(response)
 
         if "id" in result:
             return result["id"]
@@ -4,19 +4,298 @@ Handles token retrieval, refresh, validation, and caching.
 """
 
 import os
+import atexit
+import json
+import time
+import threading
+import uuid
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from typing import Optional, Dict, Iterator, List, Tuple, Union
+from urllib.parse import quote
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import and_, case, func, insert, select, true, update
 
-from app.models import Tenant, SocialAccount, OAuthToken, TokenRefreshHistory
+from app.models import Tenant, SocialAccount, OAuthToken, TokenRefreshHistory, SessionLocal
+from app.utils.cache import get_redis
 from app.utils.encryption import get_encryption_service
+from app.utils.logger import get_logger
+
+# Optional faster JSON parser for Graph API responses
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+logger = get_logger(__name__)
+
+# In-process cache of decrypted tokens:
+# (tenant_id, platform, platform_account_id) -> (token_id, plaintext, deadline)
+# backed by a shared Redis hash per tenant holding the encrypted values
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", "300"))
+TOKEN_CACHE_MAX_SIZE = 10_000
+LAST_USED_FLUSH_INTERVAL = 5
+
+_token_cache: "OrderedDict[Tuple[str, str, Optional[str]], Tuple[str, str, float]]" = OrderedDict()
+_token_cache_lock = threading.RLock()
+
+# last_used_at writes, flushed in the background
+_pending_last_used: Dict[str, datetime] = {}
+_last_used_lock = threading.Lock()
+_last_used_flusher: Optional[threading.Thread] = None
+
+# Single-flight token refresh: in-process followers wait on the leader's
+# result, and a Redis lock coalesces refreshes across workers
+
+
+class _InflightRefresh:
+    """A refresh in progress that concurrent callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = False
+
+
+_inflight_refreshes: Dict[str, _InflightRefresh] = {}
+_inflight_lock = threading.Lock()
+
+# Delete the refresh lock only if this worker still owns it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def _graph_json(data):
+    """Parse a Graph API JSON body from bytes/str without charset detection."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _get_cached_token(key: Tuple[str, str, Optional[str]]) -> Optional[Tuple[str, str]]:
+    """
+    Look up a decrypted token in the in-process cache.
+
+    Args:
+        key: (tenant_id, platform, platform_account_id)
+
+    Returns:
+        (token_id, plaintext) or None on miss/expiry
+    """
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is None:
+            return None
+        token_id, plaintext, deadline = entry
+        if time.monotonic() >= deadline:
+            del _token_cache[key]
+            return None
+        _token_cache.move_to_end(key)
+        return token_id, plaintext
+
+
+def _cache_token(
+    key: Tuple[str, str, Optional[str]],
+    token_id: str,
+    plaintext: str,
+    expires_at: Optional[datetime],
+) -> None:
+    """
+    Cache a decrypted token, never past its expiry.
+
+    Args:
+        key: (tenant_id, platform, platform_account_id)
+        token_id: OAuth token UUID
+        plaintext: Decrypted access token
+        expires_at: Token expiration (None = no expiry)
+    """
+    ttl = TOKEN_CACHE_TTL
+    if expires_at is not None:
+        ttl = min(ttl, (expires_at - datetime.utcnow()).total_seconds())
+    if ttl <= 0:
+        return
+
+    with _token_cache_lock:
+        _token_cache[key] = (token_id, plaintext, time.monotonic() + ttl)
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+            _token_cache.popitem(last=False)
+
+
+def _redis_token_key(tenant_id: str) -> str:
+    """Redis hash holding a tenant's cached (still encrypted) tokens."""
+    return f"tok:{tenant_id}"
+
+
+def _redis_get_token(key: Tuple[str, str, Optional[str]]) -> Optional[Dict]:
+    """
+    Look up a token in the shared Redis cache.
+
+    Args:
+        key: (tenant_id, platform, platform_account_id)
+
+    Returns:
+        Dict with id, enc (encrypted token) and expires_at, or None on miss/error
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    tenant_id, platform, platform_account_id = key
+    try:
+        raw = client.hget(_redis_token_key(tenant_id), f"{platform}:{platform_account_id or ''}")
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+    except Exception as e:
+        logger.debug(f"Token cache read failed for tenant {tenant_id}: {e}")
+        return None
+
+    if time.time() - entry.get("cached_at", 0) >= TOKEN_CACHE_TTL:
+        return None
+    expires_at = datetime.fromisoformat(entry["expires_at"]) if entry.get("expires_at") else None
+    if expires_at is not None and expires_at <= datetime.utcnow():
+        return None
+    entry["expires_at"] = expires_at
+    return entry
+
+
+def _redis_set_token(key: Tuple[str, str, Optional[str]], oauth_token: OAuthToken) -> None:
+    """
+    Share a token with other processes via Redis.
+
+    Only the already-encrypted column value is stored, never the plaintext.
+
+    Args:
+        key: (tenant_id, platform, platform_account_id)
+        oauth_token: Token to cache
+    """
+    client = get_redis()
+    if client is None:
+        return
+    tenant_id, platform, platform_account_id = key
+    entry = {
+        "id": str(oauth_token.id),
+        "enc": oauth_token.access_token_encrypted,
+        "expires_at": oauth_token.expires_at.isoformat() if oauth_token.expires_at else None,
+        "cached_at": time.time(),
+    }
+    try:
+        redis_key = _redis_token_key(tenant_id)
+        pipe = client.pipeline()
+        pipe.hset(redis_key, f"{platform}:{platform_account_id or ''}", json.dumps(entry))
+        pipe.expire(redis_key, TOKEN_CACHE_TTL)
+        pipe.execute()
+    except Exception as e:
+        logger.debug(f"Token cache write failed for tenant {tenant_id}: {e}")
+
+
+def invalidate_cached_tokens(tenant_id: str) -> None:
+    """
+    Drop a tenant's cached tokens after a token is revoked or replaced.
+
+    Clears this process's cache and the shared Redis entries; other
+    processes' in-process entries expire within TOKEN_CACHE_TTL.
+
+    Args:
+        tenant_id: Tenant UUID
+    """
+    tenant_key = str(tenant_id)
+
+    with _token_cache_lock:
+        for key in [key for key in _token_cache if key[0] == tenant_key]:
+            del _token_cache[key]
+
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.delete(_redis_token_key(tenant_key))
+    except Exception as e:
+        logger.debug(f"Token cache invalidation failed for tenant {tenant_key}: {e}")
+
+
+def _record_token_use(token_id: str) -> None:
+    """
+    Queue a last_used_at update for a token.
+
+    Args:
+        token_id: OAuth token UUID
+    """
+    global _last_used_flusher
+    with _last_used_lock:
+        _pending_last_used[token_id] = datetime.utcnow()
+        if _last_used_flusher is None or not _last_used_flusher.is_alive():
+            _last_used_flusher = threading.Thread(
+                target=_flush_last_used_loop,
+                name="token-last-used-flusher",
+                daemon=True,
+            )
+            _last_used_flusher.start()
+
+
+def _flush_last_used_loop() -> None:
+    """Write queued last_used_at timestamps every few seconds."""
+    while True:
+        time.sleep(LAST_USED_FLUSH_INTERVAL)
+        _flush_last_used()
+
+
+def _flush_last_used() -> None:
+    """Write all queued last_used_at timestamps with one UPDATE."""
+    with _last_used_lock:
+        pending = dict(_pending_last_used)
+        _pending_last_used.clear()
+    if not pending:
+        return
+
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(OAuthToken)
+            .where(OAuthToken.id.in_(list(pending)))
+            .values(last_used_at=case(pending, value=OAuthToken.id))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Failed to flush token last_used_at for {len(pending)} tokens: {e}")
+    finally:
+        db.close()
+
+
+# Don't lose the last few seconds of usage on shutdown
+atexit.register(_flush_last_used)
 
 
 class TokenService:
     """Service for managing OAuth tokens lifecycle."""
 
+    # Concurrent Graph batch calls when refreshing tokens in bulk
+    VERIFY_MAX_WORKERS = 32
+
+    # Graph API limit on sub-requests per batch call
+    GRAPH_BATCH_SIZE = 50
+
+    # Expiring tokens loaded, verified and written per page
+    REFRESH_BATCH_SIZE = 500
+
+    # Single-flight refresh timeouts (seconds)
+    REFRESH_WAIT_TIMEOUT = 15
+    REFRESH_LOCK_TTL = 30
+    REFRESH_RESULT_TTL = 60
+
+    # Shared across instances so debug_token calls reuse TLS connections
+    _session: Optional[requests.Session] = None
+
     def __init__(self):
         """Initialize token service."""
         self.app_id = os.getenv("FACEBOOK_APP_ID")
@@ -27,6 +306,9 @@ class TokenService:
         # Token refresh threshold (default: 7 days before expiration)
         self.refresh_threshold_days = int(os.getenv("TOKEN_REFRESH_THRESHOLD_DAYS", "7"))
 
+        # Re-verify page tokens with debug_token at most this often
+        self.verify_interval_days = int(os.getenv("TOKEN_VERIFY_INTERVAL_DAYS", "7"))
+
         self.encryption_service = get_encryption_service()
 
     def get_active_token(
@@ -51,10 +333,30 @@ class TokenService:
         Raises:
             ValueError: If token is expired or revoked
         """
+        # Serve from the in-process cache, then the shared Redis cache
+        cache_key = (str(tenant_id), platform, platform_account_id)
+        cached = _get_cached_token(cache_key)
+        if cached:
+            token_id, decrypted_token = cached
+            _record_token_use(token_id)
+            return decrypted_token
+
+        shared = _redis_get_token(cache_key)
+        if shared:
+            try:
+                decrypted_token = self.encryption_service.decrypt(shared["enc"])
+            except ValueError:
+                decrypted_token = None
+            if decrypted_token:
+                _cache_token(cache_key, shared["id"], decrypted_token, shared["expires_at"])
+                _record_token_use(shared["id"])
+                return decrypted_token
+
         # Build query
         query = (
             db.query(OAuthToken)
-            .join(SocialAccount)
+            .join(OAuthToken.social_account)
+            .options(contains_eager(OAuthToken.social_account))
             .filter(
                 and_(
                     SocialAccount.tenant_id == tenant_id,
@@ -77,36 +379,149 @@ class TokenService:
         # Check if token is expired
         if oauth_token.is_expired:
             # Try to refresh it
-            refreshed = self.refresh_token(db, oauth_token.id)
+            refreshed = self.refresh_token(db, oauth_token)
             if not refreshed:
                 raise ValueError("Token is expired and refresh failed")
 
-            # Re-fetch the token after refresh
-            oauth_token = db.query(OAuthToken).filter(OAuthToken.id == oauth_token.id).first()
-
-        # Update last used timestamp
-        oauth_token.last_used_at = datetime.utcnow()
-        db.commit()
+        # Record last use (written in the background, off the request path)
+        _record_token_use(oauth_token.id)
 
         # Decrypt and return token
         try:
             decrypted_token = self.encryption_service.decrypt(oauth_token.access_token_encrypted)
-            return decrypted_token
         except Exception as e:
             raise ValueError(f"Failed to decrypt token: {e}")
 
-    def refresh_token(self, db: Session, token_id: str) -> bool:
+        _cache_token(cache_key, oauth_token.id, decrypted_token, oauth_token.expires_at)
+        _redis_set_token(cache_key, oauth_token)
+        return decrypted_token
+
+    def refresh_token(self, db: Session, token: Union[OAuthToken, str]) -> bool:
         """
         Refresh an OAuth token.
 
         Args:
             db: Database session
-            token_id: OAuth token UUID
+            token: Loaded OAuthToken or OAuth token UUID
 
         Returns:
             True if refresh successful, False otherwise
         """
-        oauth_token = db.query(OAuthToken).filter(OAuthToken.id == token_id).first()
+        token_id = str(token.id if isinstance(token, OAuthToken) else token)
+
+        # Join a refresh of the same token already running in this process
+        with _inflight_lock:
+            inflight = _inflight_refreshes.get(token_id)
+            is_leader = inflight is None
+            if is_leader:
+                inflight = _inflight_refreshes[token_id] = _InflightRefresh()
+
+        if not is_leader:
+            inflight.done.wait(timeout=self.REFRESH_WAIT_TIMEOUT)
+            if inflight.result and isinstance(token, OAuthToken):
+                db.refresh(token)
+            return inflight.result
+
+        try:
+            inflight.result = self._refresh_token_locked(db, token, token_id)
+            return inflight.result
+        finally:
+            inflight.done.set()
+            with _inflight_lock:
+                _inflight_refreshes.pop(token_id, None)
+
+    def _refresh_token_locked(self, db: Session, token: Union[OAuthToken, str], token_id: str) -> bool:
+        """
+        Refresh a token while holding the cross-process refresh lock.
+
+        If another worker holds the lock, wait for it to finish and report
+        the token's state instead of verifying it again.
+
+        Args:
+            db: Database session
+            token: Loaded OAuthToken or OAuth token UUID
+            token_id: OAuth token UUID as a string
+
+        Returns:
+            True if the token is valid after the refresh, False otherwise
+        """
+        client = get_redis()
+        lock_key = f"refresh_lock:{token_id}"
+        result_key = f"refresh_result:{token_id}"
+        owner = uuid.uuid4().hex
+        acquired = True
+        if client is not None:
+            try:
+                acquired = bool(client.set(lock_key, owner, nx=True, ex=self.REFRESH_LOCK_TTL))
+                if acquired:
+                    client.delete(result_key)
+            except Exception as e:
+                logger.debug(f"Refresh lock unavailable for {token_id}: {e}")
+
+        if not acquired:
+            return self._wait_for_refresh(db, client, token_id)
+
+        try:
+            result = self._refresh_token(db, token)
+            if client is not None:
+                try:
+                    client.set(result_key, int(result), ex=self.REFRESH_RESULT_TTL)
+                except Exception as e:
+                    logger.debug(f"Refresh result publish failed for {token_id}: {e}")
+            return result
+        finally:
+            if client is not None:
+                try:
+                    # Compare-and-delete so an expired lock re-taken by another worker is kept
+                    client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, owner)
+                except Exception as e:
+                    logger.debug(f"Refresh lock release failed for {token_id}: {e}")
+
+    def _wait_for_refresh(self, db: Session, client, token_id: str) -> bool:
+        """
+        Wait for another worker's refresh of a token and return its outcome.
+
+        Polls the published result every 100 ms for up to the lock TTL, then
+        falls back to the token's state in the database.
+
+        Args:
+            db: Database session
+            client: Redis client
+            token_id: OAuth token UUID as a string
+
+        Returns:
+            True if the token is valid after the refresh, False otherwise
+        """
+        deadline = time.monotonic() + self.REFRESH_LOCK_TTL
+        try:
+            while time.monotonic() < deadline:
+                result = client.get(f"refresh_result:{token_id}")
+                if result is not None:
+                    return result == b"1"
+                if not client.exists(f"refresh_lock:{token_id}"):
+                    break
+                time.sleep(0.1)
+        except Exception as e:
+            logger.debug(f"Refresh result poll failed for {token_id}: {e}")
+
+        oauth_token = db.query(OAuthToken).filter(OAuthToken.id == token_id).populate_existing().first()
+        return bool(oauth_token) and oauth_token.is_valid
+
+    def _refresh_token(self, db: Session, token: Union[OAuthToken, str]) -> bool:
+        """
+        Verify a token with Facebook and record the outcome.
+
+        Args:
+            db: Database session
+            token: Loaded OAuthToken or OAuth token UUID
+
+        Returns:
+            True if refresh successful, False otherwise
+        """
+        if isinstance(token, OAuthToken):
+            oauth_token = token
+        else:
+            oauth_token = db.query(OAuthToken).filter(OAuthToken.id == token).first()
 
         if not oauth_token:
             return False
@@ -115,11 +530,16 @@ class TokenService:
             return False
 
         # Facebook Page tokens don't expire, but we'll verify they're still valid
+        # (at most once per TOKEN_VERIFY_INTERVAL_DAYS)
         # For user tokens, we would use the refresh token here
-        decrypted_token = self.encryption_service.decrypt(oauth_token.access_token_encrypted)
+        verified = not self._recently_verified(oauth_token.last_refreshed_at)
+        if verified:
+            decrypted_token = self.encryption_service.decrypt(oauth_token.access_token_encrypted)
 
-        # Verify token is still valid
-        is_valid = self._verify_token(decrypted_token)
+            # Verify token is still valid
+            is_valid = self._verify_token(decrypted_token)
+        else:
+            is_valid = True
 
         old_expires_at = oauth_token.expires_at
 
@@ -127,11 +547,12 @@ class TokenService:
             # Token is still valid, update expiration
             new_expires_at = datetime.utcnow() + timedelta(days=365)
             oauth_token.expires_at = new_expires_at
-            oauth_token.last_refreshed_at = datetime.utcnow()
+            if verified:
+                oauth_token.last_refreshed_at = datetime.utcnow()
 
             # Record refresh history
             refresh_history = TokenRefreshHistory(
-                oauth_token_id=token_id,
+                oauth_token_id=oauth_token.id,
                 tenant_id=oauth_token.tenant_id,
                 old_expires_at=old_expires_at,
                 new_expires_at=new_expires_at,
@@ -149,7 +570,7 @@ class TokenService:
 
             # Record refresh history
             refresh_history = TokenRefreshHistory(
-                oauth_token_id=token_id,
+                oauth_token_id=oauth_token.id,
                 tenant_id=oauth_token.tenant_id,
                 old_expires_at=old_expires_at,
                 new_expires_at=None,
@@ -158,9 +579,23 @@ class TokenService:
             )
             db.add(refresh_history)
             db.commit()
+            invalidate_cached_tokens(oauth_token.tenant_id)
 
             return False
 
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Get the pooled HTTP session for Graph API calls."""
+        if cls._session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(
+                pool_connections=64,
+                pool_maxsize=64,
+                max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504]),
+            ))
+            cls._session = session
+        return cls._session
+
     def _verify_token(self, access_token: str) -> bool:
         """
         Verify if an access token is still valid.
@@ -178,11 +613,11 @@ class TokenService:
         }
 
         try:
-            response = requests.get(debug_url, params=params, timeout=10)
+            response = self._get_session().get(debug_url, params=params, timeout=10)
             if response.status_code != 200:
                 return False
 
-            data = response.json()
+            data = _graph_json(response.content)
             token_data = data.get("data", {})
 
             # Check if token is valid
@@ -222,6 +657,54 @@ class TokenService:
 
         return tokens
 
+    def _expiring_token_batches(self, db: Session, days: int = None) -> Iterator[list]:
+        """
+        Yield expiring tokens in id-ordered pages of REFRESH_BATCH_SIZE rows.
+
+        Only the columns a refresh needs are selected, and each page is its
+        own keyset query, so callers can commit between pages.
+
+        Args:
+            db: Database session
+            days: Number of days threshold (default: TOKEN_REFRESH_THRESHOLD_DAYS)
+
+        Yields:
+            Lists of rows with id, tenant_id, access_token_encrypted, expires_at,
+            last_refreshed_at
+        """
+        if days is None:
+            days = self.refresh_threshold_days
+
+        threshold_date = datetime.utcnow() + timedelta(days=days)
+        last_id = None
+
+        while True:
+            stmt = (
+                select(
+                    OAuthToken.id,
+                    OAuthToken.tenant_id,
+                    OAuthToken.access_token_encrypted,
+                    OAuthToken.expires_at,
+                    OAuthToken.last_refreshed_at,
+                )
+                .where(
+                    OAuthToken.is_revoked == False,
+                    OAuthToken.expires_at != None,
+                    OAuthToken.expires_at <= threshold_date,
+                )
+                .order_by(OAuthToken.id)
+                .limit(self.REFRESH_BATCH_SIZE)
+            )
+            if last_id is not None:
+                stmt = stmt.where(OAuthToken.id > last_id)
+
+            rows = db.execute(stmt).all()
+            if rows:
+                yield rows
+            if len(rows) < self.REFRESH_BATCH_SIZE:
+                return
+            last_id = rows[-1].id
+
     def refresh_expiring_tokens(self, db: Session) -> Dict:
         """
         Refresh all tokens that are expiring soon.
@@ -232,29 +715,40 @@ class TokenService:
         Returns:
             Dictionary with refresh statistics
         """
-        tokens = self.get_tokens_expiring_soon(db)
-
         stats = {
-            "total": len(tokens),
+            "total": 0,
             "success": 0,
             "failed": 0,
             "errors": [],
         }
 
+        with ThreadPoolExecutor(max_workers=self.VERIFY_MAX_WORKERS) as executor:
+            for tokens in self._expiring_token_batches(db):
+                stats["total"] += len(tokens)
+                self._refresh_token_batch(db, tokens, stats, executor)
+
+        return stats
+
+    def _refresh_token_batch(self, db: Session, tokens: list, stats: Dict, executor: ThreadPoolExecutor) -> None:
+        """
+        Verify one page of expiring tokens and write the outcomes.
+
+        Args:
+            db: Database session
+            tokens: Rows from _expiring_token_batches
+            stats: Refresh statistics, updated in place
+            executor: Thread pool for the Graph batch calls
+        """
+        # Page tokens don't expire; skip Graph for tokens verified recently
+        recent = {token.id for token in tokens if self._recently_verified(token.last_refreshed_at)}
+
+        # Decrypt from the selected columns (no per-token re-fetch)
+        decrypted = {}
         for token in tokens:
+            if token.id in recent:
+                continue
             try:
-                success = self.refresh_token(db, str(token.id))
-                if success:
-                    stats["success"] += 1
-                else:
-                    stats["failed"] += 1
-                    stats["errors"].append(
-                        {
-                            "token_id": str(token.id),
-                            "tenant_id": str(token.tenant_id),
-                            "error": "Refresh failed",
-                        }
-                    )
+                decrypted[token.id] = self.encryption_service.decrypt(token.access_token_encrypted)
             except Exception as e:
                 stats["failed"] += 1
                 stats["errors"].append(
@@ -265,7 +759,159 @@ class TokenService:
                     }
                 )
 
-        return stats
+        verifiable = [token for token in tokens if token.id in decrypted or token.id in recent]
+        if not verifiable:
+            return
+
+        # Verify the rest with Facebook, 50 per Graph batch call, batches in parallel
+        to_verify = [token for token in verifiable if token.id not in recent]
+        chunks = [
+            [decrypted[token.id] for token in to_verify[i:i + self.GRAPH_BATCH_SIZE]]
+            for i in range(0, len(to_verify), self.GRAPH_BATCH_SIZE)
+        ]
+        verified = dict(zip(
+            (token.id for token in to_verify),
+            (
+                is_valid
+                for chunk_results in executor.map(self._verify_tokens_batch, chunks)
+                for is_valid in chunk_results
+            ),
+        ))
+        results = [token.id in recent or verified[token.id] for token in verifiable]
+
+        now = datetime.utcnow()
+        new_expires_at = now + timedelta(days=365)
+        valid_ids = []
+        skipped_ids = []
+        invalid_ids = []
+        history = []
+
+        for token, is_valid in zip(verifiable, results):
+            if is_valid:
+                (skipped_ids if token.id in recent else valid_ids).append(token.id)
+                stats["success"] += 1
+                history.append({
+                    "oauth_token_id": token.id,
+                    "tenant_id": token.tenant_id,
+                    "old_expires_at": token.expires_at,
+                    "new_expires_at": new_expires_at,
+                    "refresh_status": "success",
+                })
+            else:
+                invalid_ids.append(token.id)
+                stats["failed"] += 1
+                stats["errors"].append(
+                    {
+                        "token_id": str(token.id),
+                        "tenant_id": str(token.tenant_id),
+                        "error": "Refresh failed",
+                    }
+                )
+                history.append({
+                    "oauth_token_id": token.id,
+                    "tenant_id": token.tenant_id,
+                    "old_expires_at": token.expires_at,
+                    "new_expires_at": None,
+                    "refresh_status": "failed",
+                    "error_message": "Token verification failed",
+                })
+
+        # Write the page's outcomes with two UPDATEs, one history insert and one commit
+        if valid_ids:
+            db.execute(
+                update(OAuthToken)
+                .where(OAuthToken.id.in_(valid_ids))
+                .values(expires_at=new_expires_at, last_refreshed_at=now)
+            )
+        if skipped_ids:
+            # Not re-verified, so last_refreshed_at keeps the last verification time
+            db.execute(
+                update(OAuthToken)
+                .where(OAuthToken.id.in_(skipped_ids))
+                .values(expires_at=new_expires_at)
+            )
+        if invalid_ids:
+            db.execute(
+                update(OAuthToken)
+                .where(OAuthToken.id.in_(invalid_ids))
+                .values(
+                    is_revoked=True,
+                    revoked_at=now,
+                    revoked_reason="Token verification failed",
+                )
+            )
+        if history:
+            # One multi-row INSERT (insertmanyvalues) instead of per-row statements
+            db.execute(insert(TokenRefreshHistory), history)
+        db.commit()
+        for tenant_id in {token.tenant_id for token, is_valid in zip(verifiable, results) if not is_valid}:
+            invalidate_cached_tokens(tenant_id)
+
+    def _recently_verified(self, last_refreshed_at: Optional[datetime]) -> bool:
+        """
+        Check whether a token was verified within TOKEN_VERIFY_INTERVAL_DAYS.
+
+        last_refreshed_at is set by a successful debug_token check or when
+        the token is (re)issued through OAuth.
+
+        Args:
+            last_refreshed_at: Token's last verification time
+
+        Returns:
+            True if the debug_token call can be skipped
+        """
+        if last_refreshed_at is None:
+            return False
+        return datetime.utcnow() - last_refreshed_at < timedelta(days=self.verify_interval_days)
+
+    def _verify_tokens_batch(self, access_tokens: List[str]) -> List[bool]:
+        """
+        Verify up to GRAPH_BATCH_SIZE access tokens with one Graph batch call.
+
+        Falls back to per-token verification if the batch call itself fails,
+        so a transient error never marks a whole batch as invalid.
+
+        Args:
+            access_tokens: Facebook access tokens
+
+        Returns:
+            Validity flags in the same order as access_tokens
+        """
+        batch = [
+            {"method": "GET", "relative_url": f"debug_token?input_token={quote(token, safe='')}"}
+            for token in access_tokens
+        ]
+        data = {
+            "batch": json.dumps(batch),
+            "access_token": f"{self.app_id}|{self.app_secret}",
+            "include_headers": "false",
+        }
+
+        try:
+            response = self._get_session().post(f"{self.graph_base_url}/", data=data, timeout=30)
+            response.raise_for_status()
+            sub_responses = _graph_json(response.content)
+            if not isinstance(sub_responses, list) or len(sub_responses) != len(access_tokens):
+                raise ValueError("Unexpected batch response shape")
+        except Exception as e:
+            logger.warning(f"Graph batch verify failed, verifying {len(access_tokens)} tokens individually: {e}")
+            return [self._verify_token(token) for token in access_tokens]
+
+        results = []
+        for access_token, sub_response in zip(access_tokens, sub_responses):
+            # Timed-out (null) or 5xx sub-requests are retried on their own
+            if not sub_response or sub_response.get("code", 500) >= 500:
+                results.append(self._verify_token(access_token))
+                continue
+            if sub_response.get("code") != 200:
+                results.append(False)
+                continue
+            try:
+                token_data = _graph_json(sub_response.get("body") or "{}").get("data", {})
+                results.append(bool(token_data.get("is_valid", False)))
+            except Exception:
+                results.append(False)
+        return results
 
     def get_tenant_token_health(self, db: Session, tenant_id: str) -> Dict:
         """
@@ -278,51 +924,48 @@ class TokenService:
         Returns:
             Dictionary with token health statistics
         """
-        # Get all active tokens for tenant
-        active_tokens = (
-            db.query(OAuthToken)
-            .filter(
-                and_(
-                    OAuthToken.tenant_id == tenant_id,
-                    OAuthToken.is_revoked == False,
-                )
+        now = datetime.utcnow()
+        threshold = now + timedelta(days=self.refresh_threshold_days)
+
+        # Token and account counts aggregated in SQL, one round trip
+        token_counts = (
+            select(
+                func.count(OAuthToken.id).label("active_tokens"),
+                func.count(case((OAuthToken.expires_at <= threshold, 1))).label("expiring_soon"),
+                func.count(case((OAuthToken.expires_at < now, 1))).label("expired"),
             )
-            .all()
-        )
-
-        # Get social accounts
-        social_accounts = (
-            db.query(SocialAccount)
-            .filter(
-                and_(
-                    SocialAccount.tenant_id == tenant_id,
-                    SocialAccount.is_active == True,
-                )
+            .where(
+                OAuthToken.tenant_id == tenant_id,
+                OAuthToken.is_revoked == False,
             )
-            .all()
+            .subquery()
         )
-
-        # Count expiring soon
-        expiring_soon = sum(
-            1
-            for token in active_tokens
-            if token.expires_at
-            and token.expires_at
-            <= (datetime.utcnow() + timedelta(days=self.refresh_threshold_days))
+        account_counts = (
+            select(
+                func.count(SocialAccount.id).label("total_accounts"),
+                func.count(case((SocialAccount.platform == "facebook", 1))).label("facebook"),
+                func.count(case((SocialAccount.platform == "instagram", 1))).label("instagram"),
+            )
+            .where(
+                SocialAccount.tenant_id == tenant_id,
+                SocialAccount.is_active == True,
+            )
+            .subquery()
         )
-
-        # Count expired
-        expired = sum(1 for token in active_tokens if token.is_expired)
+        counts = db.execute(
+            select(token_counts, account_counts)
+            .select_from(token_counts.join(account_counts, true()))
+        ).one()
 
         return {
             "tenant_id": tenant_id,
-            "total_accounts": len(social_accounts),
-            "active_tokens": len(active_tokens),
-            "expiring_soon": expiring_soon,
-            "expired": expired,
-            "healthy": len(active_tokens) - expired - expiring_soon,
+            "total_accounts": counts.total_accounts,
+            "active_tokens": counts.active_tokens,
+            "expiring_soon": counts.expiring_soon,
+            "expired": counts.expired,
+            "healthy": counts.active_tokens - counts.expired - counts.expiring_soon,
             "accounts_by_platform": {
-                "facebook": sum(1 for acc in social_accounts if acc.platform == "facebook"),
-                "instagram": sum(1 for acc in social_accounts if acc.platform == "instagram"),
+                "facebook": counts.facebook,
+                "instagram": counts.instagram,
             },
         }
@@ -2,11 +2,24 @@
 
 from .celery_app import celery_app
 from .token_tasks import refresh_expiring_tokens, cleanup_expired_states
-from .calendar_tasks import publish_due_calendar_posts
+from .calendar_tasks import publish_due_calendar_posts, publish_calendar_post
+from .sales_tasks import run_sales_import
+from .post_tasks import publish_due_scheduled_posts
+from .restaurant_tasks import (
+    reanalyze_restaurants,
+    submit_restaurant_analysis_batch,
+    collect_restaurant_analysis_batch,
+)
 
 __all__ = [
     "celery_app",
     "refresh_expiring_tokens",
     "cleanup_expired_states",
     "publish_due_calendar_posts",
+    "publish_calendar_post",
+    "run_sales_import",
+    "publish_due_scheduled_posts",
+    "reanalyze_restaurants",
+    "submit_restaurant_analysis_batch",
+    "collect_restaurant_analysis_batch",
 ]
@@ -1,7 +1,9 @@
 """Background tasks for content calendar auto-publishing."""
 
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from typing import Optional
+from celery import group
+from sqlalchemy import update
 import logging
 
 from app.tasks.celery_app import celery_app
@@ -11,67 +13,117 @@ from app.services.content_calendar_service import ContentCalendarService
 
 logger = logging.getLogger(__name__)
 
+_calendar_service: Optional[ContentCalendarService] = None
+
+# A 'publishing' claim older than the task hard time limit belongs to a dead subtask
+PUBLISHING_CLAIM_TIMEOUT = timedelta(seconds=celery_app.conf.task_time_limit)
+
 
 @celery_app.task(name="publish_due_calendar_posts")
 def publish_due_calendar_posts():
     """
     Periodic task to publish calendar posts that are due.
     Runs every minute to check for approved posts scheduled for now or earlier.
+
+    Due posts are claimed (status -> 'publishing') and fanned out to one
+    publish_calendar_post task each, so a slow upload never blocks the tick
+    and the next tick cannot pick the same post up again. Claims that were
+    never enqueued, or whose subtask died, go back to 'approved'.
     """
     db = SessionLocal()
     try:
         # Get current datetime
         now = datetime.utcnow()
 
-        # Find approved posts that are due (scheduled_date + scheduled_time <= now)
-        due_posts = (
-            db.query(CalendarPost)
-            .filter(
-                CalendarPost.status == "approved",
-                CalendarPost.scheduled_date <= now.date(),
+        # Release stale claims so they are picked up again below
+        released = db.execute(
+            update(CalendarPost)
+            .where(
+                CalendarPost.status == "publishing",
+                CalendarPost.updated_at < now - PUBLISHING_CLAIM_TIMEOUT,
             )
-            .all()
-        )
+            .values(status="approved", updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        if released:
+            logger.warning(f"Released {released} stale publishing claims back to approved")
 
-        # Filter by time as well (since we can't easily query date + time in SQLAlchemy)
-        posts_to_publish = []
-        for post in due_posts:
-            scheduled_datetime = datetime.combine(post.scheduled_date, post.scheduled_time)
-            if scheduled_datetime <= now:
-                posts_to_publish.append(post)
+        # Claim approved posts that are due (scheduled_date + scheduled_time <= now)
+        posts_to_publish = [
+            post_id
+            for (post_id,) in db.execute(
+                update(CalendarPost)
+                .where(
+                    CalendarPost.status == "approved",
+                    CalendarPost.scheduled_date + CalendarPost.scheduled_time <= now,
+                )
+                .values(status="publishing", updated_at=now)
+                .returning(CalendarPost.id)
+                .execution_options(synchronize_session=False)
+            ).all()
+        ]
+        db.commit()
 
         if not posts_to_publish:
             logger.info(f"No calendar posts due for publishing at {now}")
-            return {"published": 0, "failed": 0}
+            return {"queued": 0}
 
         logger.info(f"Found {len(posts_to_publish)} calendar posts to publish")
 
-        # Publish each post
-        calendar_service = ContentCalendarService()
-        published_count = 0
-        failed_count = 0
-
-        for post in posts_to_publish:
-            try:
-                result = calendar_service.publish_calendar_post(db, str(post.id))
-                if result.get('success'):
-                    published_count += 1
-                    logger.info(f"Published calendar post {post.id}: {post.title}")
-                else:
-                    failed_count += 1
-                    logger.error(f"Failed to publish calendar post {post.id}: {result.get('error')}")
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"Exception publishing calendar post {post.id}: {e}")
-
-        return {
-            "published": published_count,
-            "failed": failed_count,
-            "total_checked": len(posts_to_publish)
-        }
+        try:
+            group(publish_calendar_post.s(str(post_id)) for post_id in posts_to_publish).apply_async()
+        except Exception:
+            # Nothing was queued (e.g. broker down); hand the posts back to the next tick
+            db.execute(
+                update(CalendarPost)
+                .where(
+                    CalendarPost.id.in_(posts_to_publish),
+                    CalendarPost.status == "publishing",
+                )
+                .values(status="approved", updated_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            raise
+
+        return {"queued": len(posts_to_publish)}
 
     except Exception as e:
         logger.error(f"Error in publish_due_calendar_posts task: {e}")
+        db.rollback()
         return {"error": str(e)}
     finally:
         db.close()
+
+
+@celery_app.task(name="publish_calendar_post")
+def publish_calendar_post(post_id: str):
+    """
+    Publish a single claimed calendar post.
+
+    Args:
+        post_id: Calendar post UUID
+    """
+    db = SessionLocal()
+    try:
+        result = _get_calendar_service().publish_calendar_post(db, post_id, claimed=True)
+        if result.get('success'):
+            logger.info(f"Published calendar post {post_id}")
+        else:
+            logger.error(f"Failed to publish calendar post {post_id}: {result.get('error')}")
+        return result
+
+    except Exception as e:
+        logger.error(f"Exception publishing calendar post {post_id}: {e}")
+        return {"success": False, "error": str(e)}
+    finally:
+        db.close()
+
+
+def _get_calendar_service() -> ContentCalendarService:
+    """Get the worker's shared calendar service (reused across subtasks)."""
+    global _calendar_service
+    if _calendar_service is None:
+        _calendar_service = ContentCalendarService()
+    return _calendar_service
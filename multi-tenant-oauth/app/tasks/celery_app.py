@@ -5,6 +5,7 @@ Celery application configuration.
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -15,7 +16,13 @@ celery_app = Celery(
     "social_automation",
     broker=os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"),
     backend=os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0"),
-    include=["app.tasks.token_tasks", "app.tasks.calendar_tasks"],
+    include=[
+        "app.tasks.token_tasks",
+        "app.tasks.calendar_tasks",
+        "app.tasks.sales_tasks",
+        "app.tasks.post_tasks",
+        "app.tasks.restaurant_tasks",
+    ],
 )
 
 # Configure Celery
@@ -28,8 +35,23 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
+    # Tasks are long-running I/O; don't let one process hoard queued work
+    worker_prefetch_multiplier=int(os.getenv("CELERY_PREFETCH_MULTIPLIER", "1")),
 )
 
+
+@worker_process_init.connect
+def reset_db_pool(**kwargs):
+    """
+    Give each forked worker process its own connection pool.
+
+    Connections inherited from the parent are dropped without being closed
+    (they still belong to the parent), so tasks never share a socket.
+    """
+    from app.models.base import engine
+
+    engine.dispose(close=False)
+
 # Celery Beat schedule (periodic tasks)
 celery_app.conf.beat_schedule = {
     # Refresh tokens expiring within threshold
@@ -53,6 +75,11 @@ celery_app.conf.beat_schedule = {
         "task": "publish_due_calendar_posts",
         "schedule": crontab(minute="*/1"),  # Every 1 minute
     },
+    # Publish due scheduled posts
+    "publish-due-scheduled-posts": {
+        "task": "app.tasks.post_tasks.publish_due_scheduled_posts",
+        "schedule": crontab(minute="*/1"),  # Every 1 minute
+    },
 }
 
 if __name__ == "__main__":
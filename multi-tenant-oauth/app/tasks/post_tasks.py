@@ -0,0 +1,52 @@
+"""
+Celery tasks for publishing scheduled posts.
+"""
+
+import asyncio
+from sqlalchemy.orm import Session
+
+from app.tasks.celery_app import celery_app
+from app.models.base import SessionLocal
+from app.services import SchedulerService
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@celery_app.task(name="app.tasks.post_tasks.publish_due_scheduled_posts")
+def publish_due_scheduled_posts():
+    """
+    Periodic task to publish scheduled posts that are due.
+
+    Runs every minute (configured in Celery Beat schedule). The database is
+    the source of truth for the schedule, so nothing waits in the broker
+    between scheduling and publishing.
+
+    Returns:
+        Dictionary with published and failed counts
+    """
+    db: Session = SessionLocal()
+    try:
+        scheduler = SchedulerService()
+
+        # Reschedule posts whose publishing run died before recording an outcome
+        released = scheduler.release_stale_claims(db)
+        if released:
+            logger.warning(f"Released {released} stale publishing claims back to scheduled")
+
+        stats = asyncio.run(scheduler.publish_due_posts(db))
+
+        if stats["published"] or stats["failed"]:
+            logger.info(
+                f"Scheduled posts task completed - "
+                f"Published: {stats['published']}, "
+                f"Failed: {stats['failed']}"
+            )
+
+        return stats
+
+    except Exception as e:
+        logger.error(f"Scheduled posts task failed: {e}", exc_info=True)
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,148 @@
+"""Background tasks for bulk restaurant AI analyses."""
+
+import asyncio
+from typing import List, Optional
+import logging
+
+from app.tasks.celery_app import celery_app
+from app.models.base import SessionLocal
+from app.models import MenuItem
+from app.services.restaurant_intelligence_service import RestaurantIntelligenceService
+
+logger = logging.getLogger(__name__)
+
+# Seconds between status checks of a submitted analysis batch
+ANALYSIS_BATCH_POLL_INTERVAL = 5 * 60
+
+# Batches finish within their 24h completion window; allow an hour of slack
+ANALYSIS_BATCH_MAX_POLLS = 25 * 3600 // ANALYSIS_BATCH_POLL_INTERVAL
+
+# Tenants per re-analysis task, so each stays well inside the task time limit
+REANALYZE_CHUNK_SIZE = 50
+
+
+async def _run_analysis(coro):
+    """Await an analysis coroutine, then close the OpenAI client bound to this event loop."""
+    try:
+        return await coro
+    finally:
+        await RestaurantIntelligenceService.close_client()
+
+
+def _analyzable_tenant_ids(db) -> List[str]:
+    """IDs of all tenants that have menu items to analyze."""
+    rows = db.query(MenuItem.tenant_id).distinct().all()
+    return [str(tenant_id) for (tenant_id,) in rows]
+
+
+@celery_app.task(name="app.tasks.restaurant_tasks.reanalyze_restaurants")
+def reanalyze_restaurants(tenant_ids: Optional[List[str]] = None):
+    """
+    Re-run the real-time AI analysis for many restaurants.
+
+    Without tenant_ids, every tenant with menu items is re-analyzed: the
+    tenants are split into chunks of REANALYZE_CHUNK_SIZE, each handled by
+    its own reanalyze_restaurants task.
+
+    Args:
+        tenant_ids: Tenant UUIDs to analyze (defaults to every tenant with
+            menu items)
+
+    Returns:
+        Dict with the number of tenants analyzed and failed, or queued
+    """
+    db = SessionLocal()
+    try:
+        if tenant_ids is None:
+            all_tenant_ids = _analyzable_tenant_ids(db)
+            for start in range(0, len(all_tenant_ids), REANALYZE_CHUNK_SIZE):
+                reanalyze_restaurants.delay(all_tenant_ids[start:start + REANALYZE_CHUNK_SIZE])
+            logger.info(f"Queued re-analysis of {len(all_tenant_ids)} restaurants")
+            return {"queued": len(all_tenant_ids)}
+    finally:
+        db.close()
+
+    service = RestaurantIntelligenceService()
+    results = asyncio.run(_run_analysis(service.analyze_restaurants(tenant_ids)))
+
+    failed = [tenant_id for tenant_id, result in results.items() if not result.get("success")]
+    if failed:
+        logger.warning(f"Re-analysis failed for {len(failed)} restaurants: {failed}")
+
+    return {"analyzed": len(results) - len(failed), "failed": len(failed)}
+
+
+@celery_app.task(name="app.tasks.restaurant_tasks.submit_restaurant_analysis_batch")
+def submit_restaurant_analysis_batch(tenant_ids: Optional[List[str]] = None):
+    """
+    Submit the AI analysis for many restaurants as one OpenAI Batch API job.
+
+    The batch is collected by collect_restaurant_analysis_batch, which is
+    scheduled here and re-checks the batch until it has finished.
+
+    Args:
+        tenant_ids: Tenant UUIDs to analyze (defaults to every tenant with
+            menu items)
+
+    Returns:
+        Submitted batch ID, or None if nothing needed the API
+    """
+    db = SessionLocal()
+    try:
+        if tenant_ids is None:
+            tenant_ids = _analyzable_tenant_ids(db)
+
+        service = RestaurantIntelligenceService()
+        batch_id, pending = asyncio.run(_run_analysis(
+            service.submit_analysis_batch(db, tenant_ids)
+        ))
+
+        if batch_id:
+            collect_restaurant_analysis_batch.apply_async(
+                args=[batch_id, pending],
+                countdown=ANALYSIS_BATCH_POLL_INTERVAL,
+            )
+
+        return batch_id
+
+    except Exception as e:
+        logger.error(f"Error submitting restaurant analysis batch: {e}", exc_info=True)
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(
+    bind=True,
+    name="app.tasks.restaurant_tasks.collect_restaurant_analysis_batch",
+    max_retries=ANALYSIS_BATCH_MAX_POLLS,
+)
+def collect_restaurant_analysis_batch(self, batch_id: str, pending: dict):
+    """
+    Save the results of an analysis batch, re-checking until it has finished.
+
+    Args:
+        batch_id: Batch ID from submit_restaurant_analysis_batch
+        pending: Submitted tenant mapping from submit_analysis_batch
+
+    Returns:
+        Dict mapping tenant ID to whether its AI analysis was saved
+    """
+    db = SessionLocal()
+    try:
+        service = RestaurantIntelligenceService()
+        results = asyncio.run(_run_analysis(
+            service.collect_analysis_batch(db, batch_id, pending)
+        ))
+    except Exception as e:
+        logger.error(f"Error collecting restaurant analysis batch {batch_id}: {e}", exc_info=True)
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    if results is None:
+        raise self.retry(countdown=ANALYSIS_BATCH_POLL_INTERVAL)
+
+    return results
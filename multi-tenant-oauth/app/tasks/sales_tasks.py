@@ -0,0 +1,61 @@
+"""
+Celery tasks for sales data imports.
+"""
+
+import asyncio
+import os
+from sqlalchemy.orm import Session
+
+from app.tasks.celery_app import celery_app
+from app.models.base import SessionLocal
+from app.services import SalesImportService
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@celery_app.task(name="app.tasks.sales_tasks.run_sales_import")
+def run_sales_import(file_path: str, tenant_id: str):
+    """
+    Background task to import an uploaded Innowi order history file.
+
+    Parsing and database writes run on a worker instead of the API process.
+    The uploaded file is removed once the import finishes.
+
+    Args:
+        file_path: Path to the uploaded Excel file (shared with the API)
+        tenant_id: Tenant UUID
+
+    Returns:
+        Import statistics
+    """
+    logger.info(f"Starting sales import task for tenant {tenant_id}")
+
+    db: Session = SessionLocal()
+    try:
+        sales_service = SalesImportService()
+        result = asyncio.run(sales_service.import_sales_from_excel(
+            db=db,
+            file_path=file_path,
+            tenant_id=tenant_id,
+        ))
+
+        # Result backend is JSON
+        date_range = result.get("date_range")
+        if date_range:
+            result["date_range"] = {
+                key: value.isoformat() if value is not None else None
+                for key, value in date_range.items()
+            }
+
+        logger.info(f"Sales import task completed for tenant {tenant_id}: {result.get('orders_imported', 0)} orders")
+
+        return result
+
+    except Exception as e:
+        logger.error(f"Sales import task failed: {e}", exc_info=True)
+        raise
+    finally:
+        db.close()
+        if os.path.exists(file_path):
+            os.unlink(file_path)
@@ -3,6 +3,7 @@ Celery tasks for token management and maintenance.
 """
 
 from datetime import datetime
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
 from app.tasks.celery_app import celery_app
@@ -13,6 +14,9 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Rows deleted per statement when purging expired OAuth states
+STATE_CLEANUP_BATCH_SIZE = 5_000
+
 
 @celery_app.task(name="app.tasks.token_tasks.refresh_expiring_tokens")
 def refresh_expiring_tokens():
@@ -69,14 +73,33 @@ def cleanup_expired_states():
 
     db: Session = SessionLocal()
     try:
-        # Delete expired states
-        deleted_count = (
-            db.query(OAuthState)
-            .filter(OAuthState.expires_at < datetime.utcnow())
-            .delete(synchronize_session=False)
+        # Delete expired states in short batches; SKIP LOCKED leaves rows an
+        # in-flight OAuth callback is using, RETURNING gives the exact count
+        now = datetime.utcnow()
+        victims = (
+            select(OAuthState.id)
+            .where(OAuthState.expires_at < now)
+            .order_by(OAuthState.expires_at)
+            .limit(STATE_CLEANUP_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+            .cte("victims")
+        )
+        # WITH victims AS (...) DELETE FROM oauth_state USING victims ... RETURNING id
+        delete_expired = (
+            delete(OAuthState)
+            .where(OAuthState.id == victims.c.id)
+            .returning(OAuthState.id)
+            .execution_options(synchronize_session=False)
         )
 
-        db.commit()
+        deleted_count = 0
+        while True:
+            deleted = len(db.execute(delete_expired).fetchall())
+            db.commit()
+
+            deleted_count += deleted
+            if deleted < STATE_CLEANUP_BATCH_SIZE:
+                break
 
         logger.info(f"OAuth state cleanup completed - Deleted: {deleted_count} expired states")
 
@@ -0,0 +1,129 @@
+"""
+Redis cache helpers shared by services.
+
+All helpers degrade gracefully: if redis is not installed, REDIS_URL is not
+set, or Redis is unreachable, reads return None and writes are no-ops so
+callers simply fall through to the database / API.
+"""
+
+import os
+import json
+import logging
+from typing import Any, Optional
+
+# Optional Redis support
+try:
+    import redis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+logger = logging.getLogger(__name__)
+
+_client = None
+
+
+def get_redis():
+    """
+    Get the shared Redis client.
+
+    Returns:
+        Redis client or None if Redis is not configured
+    """
+    global _client
+    if _client is None and HAS_REDIS:
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url:
+            _client = redis.Redis.from_url(
+                redis_url,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+            )
+    return _client
+
+
+def cache_get_json(key: str) -> Optional[Any]:
+    """
+    Read a JSON value from the cache.
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Decoded value or None on miss/error
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        raw = client.get(key)
+        return json.loads(raw) if raw is not None else None
+    except Exception as e:
+        logger.debug(f"Cache read failed for {key}: {e}")
+        return None
+
+
+def cache_set_json(key: str, value: Any, ttl: int) -> None:
+    """
+    Write a JSON value to the cache.
+
+    Args:
+        key: Cache key
+        value: JSON-serializable value
+        ttl: Time to live in seconds
+    """
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.setex(key, ttl, json.dumps(value))
+    except Exception as e:
+        logger.debug(f"Cache write failed for {key}: {e}")
+
+
+def get_tag_version(tag: str) -> int:
+    """
+    Get the current version of a cache tag.
+
+    Keys built with the tag version are invalidated together by bumping it.
+
+    Args:
+        tag: Tag name
+
+    Returns:
+        Current version (0 if unset or Redis unavailable)
+    """
+    client = get_redis()
+    if client is None:
+        return 0
+    try:
+        return int(client.get(f"tagver:{tag}") or 0)
+    except Exception as e:
+        logger.debug(f"Cache tag read failed for {tag}: {e}")
+        return 0
+
+
+def bump_tag_version(tag: str) -> None:
+    """
+    Invalidate all keys built with a cache tag.
+
+    Args:
+        tag: Tag name
+    """
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.incr(f"tagver:{tag}")
+    except Exception as e:
+        logger.debug(f"Cache tag bump failed for {tag}: {e}")
+
+
+def invalidate_brand_assets(tenant_id: Any) -> None:
+    """
+    Invalidate cached brand-asset lookups for a tenant.
+
+    Args:
+        tenant_id: Tenant UUID
+    """
+    bump_tag_version(f"brand_assets:{tenant_id}")
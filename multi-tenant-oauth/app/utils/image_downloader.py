@@ -1,17 +1,94 @@
 """Image downloader utility for downloading images from URLs."""
 
+import asyncio
 import httpx
 import logging
+import struct
 from io import BytesIO
 from typing import Optional, Tuple
 from PIL import Image
 
 logger = logging.getLogger(__name__)
 
+# JPEG start-of-frame markers (carry the image dimensions)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# Standalone JPEG markers without a length field
+JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xD8)) | {0x01}
+
+
+def _probe_jpeg(data: bytes) -> Optional[Tuple[int, int]]:
+    """Walk JPEG segments up to the first SOF marker and read its dimensions."""
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        if marker in JPEG_STANDALONE_MARKERS:
+            i += 2
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return width, height
+        i += 2 + struct.unpack(">H", data[i + 2:i + 4])[0]
+    return None
+
+
+def _probe_webp(data: bytes) -> Optional[Tuple[int, int]]:
+    """Read dimensions from the first WEBP chunk (VP8, VP8L or VP8X)."""
+    chunk = data[12:16]
+    if chunk == b"VP8 " and data[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and data[20:21] == b"\x2f":
+        bits = struct.unpack("<I", data[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def _probe(data: bytes) -> Optional[Tuple[str, int, int]]:
+    """
+    Identify an image and its dimensions from its header bytes.
+
+    Args:
+        data: Image bytes
+
+    Returns:
+        Tuple of (PIL format name, width, height) or None if not recognised
+    """
+    try:
+        if data[:3] == b"\xff\xd8\xff":
+            size = _probe_jpeg(data)
+            return ("JPEG", *size) if size else None
+        if data[:8] == b"\x89PNG\r\n\x1a\n" and data[12:16] == b"IHDR":
+            return ("PNG", *struct.unpack(">II", data[16:24]))
+        if data[:6] in (b"GIF87a", b"GIF89a"):
+            return ("GIF", *struct.unpack("<HH", data[6:10]))
+        if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+            size = _probe_webp(data)
+            return ("WEBP", *size) if size else None
+        if data[:2] == b"BM":
+            width, height = struct.unpack("<ii", data[18:26])
+            return ("BMP", width, abs(height))
+    except struct.error:
+        return None
+    return None
+
 
 class ImageDownloader:
     """Download and validate images from URLs."""
 
+    # Shared async HTTP client so downloads reuse pooled connections (created lazily)
+    _http_client: Optional[httpx.AsyncClient] = None
+    _http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
     def __init__(self, timeout: int = 30):
         """
         Initialize image downloader.
@@ -21,6 +98,26 @@ class ImageDownloader:
         """
         self.timeout = timeout
 
+    @classmethod
+    def _get_http_client(cls) -> httpx.AsyncClient:
+        """Return the shared async HTTP client, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if cls._http_client is None or cls._http_client.is_closed or cls._http_client_loop is not loop:
+            cls._http_client = httpx.AsyncClient(
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            )
+            cls._http_client_loop = loop
+        return cls._http_client
+
+    @classmethod
+    async def close_http_client(cls):
+        """Close the shared async HTTP client (call on application shutdown)."""
+        if cls._http_client is not None and not cls._http_client.is_closed:
+            await cls._http_client.aclose()
+        cls._http_client = None
+        cls._http_client_loop = None
+
     async def download_image(self, url: str) -> Optional[Tuple[bytes, str, int, int]]:
         """
         Download image from URL and validate it.
@@ -36,41 +133,46 @@ class ImageDownloader:
         """
         try:
             # Download image with timeout
-            async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-
-                # Get image bytes
-                image_bytes = response.content
-
-                # Validate with PIL and get dimensions
-                # We validate the actual image data instead of trusting content-type headers
-                # (S3 buckets often return application/octet-stream instead of image/*)
-                try:
+            response = await self._get_http_client().get(url, timeout=self.timeout)
+            response.raise_for_status()
+
+            # Get image bytes
+            image_bytes = response.content
+
+            # Validate with PIL and get dimensions
+            # We validate the actual image data instead of trusting content-type headers
+            # (S3 buckets often return application/octet-stream instead of image/*)
+            try:
+                # Read format/size from the header; PIL only for anything unrecognised
+                probed = _probe(image_bytes)
+                if probed and probed[1] > 0 and probed[2] > 0:
+                    image_format, width, height = probed
+                else:
                     image = Image.open(BytesIO(image_bytes))
+                    image_format = image.format
                     width, height = image.size
 
-                    # Verify image format is valid
-                    if image.format not in ["JPEG", "PNG", "GIF", "WEBP", "BMP"]:
-                        logger.warning(f"Unsupported image format: {image.format} for URL: {url}")
-                        return None
-
-                    # Generate proper content-type based on actual image format
-                    format_to_mime = {
-                        "JPEG": "image/jpeg",
-                        "PNG": "image/png",
-                        "GIF": "image/gif",
-                        "WEBP": "image/webp",
-                        "BMP": "image/bmp",
-                    }
-                    content_type = format_to_mime.get(image.format, "image/jpeg")
-
-                    return (image_bytes, content_type, width, height)
-
-                except Exception as e:
-                    logger.warning(f"Failed to validate image from {url}: {str(e)}")
+                # Verify image format is valid
+                if image_format not in ["JPEG", "PNG", "GIF", "WEBP", "BMP"]:
+                    logger.warning(f"Unsupported image format: {image_format} for URL: {url}")
                     return None
 
+                # Generate proper content-type based on actual image format
+                format_to_mime = {
+                    "JPEG": "image/jpeg",
+                    "PNG": "image/png",
+                    "GIF": "image/gif",
+                    "WEBP": "image/webp",
+                    "BMP": "image/bmp",
+                }
+                content_type = format_to_mime.get(image_format, "image/jpeg")
+
+                return (image_bytes, content_type, width, height)
+
+            except Exception as e:
+                logger.warning(f"Failed to validate image from {url}: {str(e)}")
+                return None
+
         except httpx.TimeoutException:
             logger.warning(f"Timeout downloading image from {url}")
             return None
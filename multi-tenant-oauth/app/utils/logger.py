@@ -4,25 +4,60 @@ Provides structured logging for the multi-tenant OAuth system.
 """
 
 import os
+import json
 import logging
 import sys
 from datetime import datetime
 from pathlib import Path
 
+# Optional fast JSON serialization for LOG_FORMAT=json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-def setup_logging(log_level: str = None, log_file: str = None) -> logging.Logger:
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line (for log aggregators)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": record.created,
+            "lvl": record.levelname,
+            "logger": record.name,
+            "src": f"{record.filename}:{record.lineno}",
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+
+        if HAS_ORJSON:
+            return orjson.dumps(payload, default=str).decode("utf-8")
+        return json.dumps(payload, default=str)
+
+
+def setup_logging(log_level: str = None, log_file: str = None, log_format: str = None) -> logging.Logger:
     """
     Configure application logging.
 
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Path to log file (optional, logs to stdout if not provided)
+        log_format: "text" (default) or "json" (one JSON object per line)
 
     Returns:
         Configured logger instance
     """
     if log_level is None:
         log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+    if log_format is None:
+        log_format = os.getenv("LOG_FORMAT", "text").lower()
+
+    # Skip LogRecord attributes no formatter here uses
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
 
     # Create logs directory if logging to file
     if log_file:
@@ -37,10 +72,13 @@ def setup_logging(log_level: str = None, log_file: str = None) -> logging.Logger
     logger.handlers = []
 
     # Create formatter
-    formatter = logging.Formatter(
-        fmt="%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+    if log_format == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            fmt="%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
 
     # Console handler (stdout)
     console_handler = logging.StreamHandler(sys.stdout)
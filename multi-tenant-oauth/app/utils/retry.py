@@ -0,0 +1,59 @@
+"""
+Retry helpers for transient OpenAI and HTTP failures.
+"""
+
+import asyncio
+import logging
+import random
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def _transient_errors() -> tuple:
+    """Exception types worth retrying (openai is imported lazily)."""
+    import openai
+
+    return (
+        openai.RateLimitError,
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.InternalServerError,
+        httpx.TransportError,
+        asyncio.TimeoutError,
+    )
+
+
+def _is_transient(error: BaseException, transient_errors: tuple) -> bool:
+    """Whether an error is worth retrying (HTTP status errors only for 429/5xx)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        return status_code == 429 or status_code >= 500
+    return isinstance(error, transient_errors)
+
+
+async def retry_transient(fn: Callable[[], Awaitable[Any]], retries: int = 3) -> Any:
+    """
+    Await fn(), retrying rate-limit/timeout/connection/5xx errors with exponential backoff.
+
+    httpx.HTTPStatusError is retried only for 429 and 5xx responses.
+
+    Args:
+        fn: Zero-argument callable returning a fresh awaitable per attempt
+        retries: Maximum number of attempts
+
+    Returns:
+        Result of fn()
+    """
+    transient_errors = _transient_errors()
+    for attempt in range(retries):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt == retries - 1 or not _is_transient(e, transient_errors):
+                raise
+            delay = min(30, 2 ** attempt) + random.random()
+            logger.debug("Transient error (%s), retrying in %.1fs", type(e).__name__, delay)
+            await asyncio.sleep(delay)
@@ -2,20 +2,55 @@
 
 import pandas as pd
 
+# Prefer the Rust calamine reader (pandas >= 2.2); fall back to openpyxl
+try:
+    import python_calamine  # noqa: F401
+    HAS_CALAMINE = tuple(int(part) for part in pd.__version__.split(".")[:2]) >= (2, 2)
+except ImportError:
+    HAS_CALAMINE = False
+
+EXCEL_ENGINE = "calamine" if HAS_CALAMINE else "openpyxl"
+
+# Only the first rows are previewed, so only those are parsed
+MENU_PREVIEW_ROWS = 3
+SALES_PREVIEW_ROWS = 2
+
+
+def sheet_sizes(path):
+    """Return {sheet_name: (rows, columns)} from the sheet dimensions, without reading cells."""
+    if HAS_CALAMINE:
+        from python_calamine import CalamineWorkbook
+
+        workbook = CalamineWorkbook.from_path(path)
+        sizes = {}
+        for name in workbook.sheet_names:
+            sheet = workbook.get_sheet_by_name(name)
+            sizes[name] = (sheet.height, sheet.width)
+        return sizes
+
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return {ws.title: (ws.max_row, ws.max_column) for ws in workbook.worksheets}
+    finally:
+        workbook.close()
+
 print("=" * 80)
 print("MENU FILE STRUCTURE")
 print("=" * 80)
 
 # Read menu Excel file
 menu_file = "krusti.pizza.pasta.dec28.xlsx"
-excel_data = pd.read_excel(menu_file, sheet_name=None, engine='openpyxl')
+excel_data = pd.read_excel(menu_file, sheet_name=None, engine=EXCEL_ENGINE, nrows=MENU_PREVIEW_ROWS)
+menu_sizes = sheet_sizes(menu_file)
 
 for sheet_name, df in excel_data.items():
     print(f"\n### Sheet: {sheet_name}")
-    print(f"Shape: {df.shape}")
+    print(f"Sheet size (rows x columns): {menu_sizes.get(sheet_name)}")
     print(f"Columns: {list(df.columns)}")
     print(f"\nFirst 3 rows:")
-    print(df.head(3))
+    print(df)
     print("\n" + "-" * 80)
 
 print("\n" + "=" * 80)
@@ -25,15 +60,17 @@ print("=" * 80)
 # Read sales Excel file
 sales_file = "Krusti-Pizza-Pasta-Order History Report 12-01-2025_12-28-2025.xlsx"
 
-# Try different skiprows values
-for skiprows in [0, 1, 2, 3, 4, 5]:
-    print(f"\n### With skiprows={skiprows}")
-    try:
-        df = pd.read_excel(sales_file, skiprows=skiprows, engine='openpyxl')
-        print(f"Shape: {df.shape}")
-        print(f"Columns: {list(df.columns)}")
-        print(f"\nFirst 2 rows:")
-        print(df.head(2))
-    except Exception as e:
-        print(f"Error: {e}")
-    print("-" * 80)
+print(f"Sheet sizes (rows x columns): {sheet_sizes(sales_file)}")
+
+# Try different skiprows values (workbook opened and parsed once)
+with pd.ExcelFile(sales_file, engine=EXCEL_ENGINE) as sales_workbook:
+    for skiprows in [0, 1, 2, 3, 4, 5]:
+        print(f"\n### With skiprows={skiprows}")
+        try:
+            df = sales_workbook.parse(skiprows=skiprows, nrows=SALES_PREVIEW_ROWS)
+            print(f"Columns: {list(df.columns)}")
+            print(f"\nFirst 2 rows:")
+            print(df)
+        except Exception as e:
+            print(f"Error: {e}")
+        print("-" * 80)
@@ -16,7 +16,13 @@ load_dotenv()
 
 # Database connection
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://localhost/social_automation_multi_tenant")
-engine = create_engine(DATABASE_URL)
+# Batch executemany on psycopg2 (multi-row VALUES for INSERT, execute_batch for UPDATE/DELETE)
+engine = create_engine(
+    DATABASE_URL,
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
+    executemany_batch_page_size=500,
+)
 Session = sessionmaker(bind=engine)
 
 def fix_brand_assets_urls():
@@ -24,14 +30,9 @@ def fix_brand_assets_urls():
     session = Session()
 
     try:
-        # Find all menu items with S3 URLs that have linked assets
-        query = text("""
-            SELECT
-                mi.id as menu_id,
-                mi.name as menu_name,
-                mi.image_url as s3_url,
-                mi.asset_id,
-                ba.file_url as current_asset_url
+        # Count candidates first instead of pulling every row across the wire
+        count_query = text("""
+            SELECT COUNT(*)
             FROM menu_items mi
             INNER JOIN brand_assets ba ON mi.asset_id = ba.id
             WHERE mi.image_url IS NOT NULL
@@ -39,31 +40,44 @@ def fix_brand_assets_urls():
             AND ba.file_url NOT LIKE '%s3%'
         """)
 
-        results = session.execute(query).fetchall()
+        total = session.execute(count_query).scalar()
 
-        print(f"Found {len(results)} brand assets to update\n")
+        print(f"Found {total} brand assets to update\n")
 
-        if len(results) == 0:
+        if total == 0:
             print("No assets need updating!")
             return
 
         # Show what will be updated
-        for row in results[:5]:  # Show first 5
+        preview_query = text("""
+            SELECT
+                mi.name as menu_name,
+                mi.image_url as s3_url,
+                ba.file_url as current_asset_url
+            FROM menu_items mi
+            INNER JOIN brand_assets ba ON mi.asset_id = ba.id
+            WHERE mi.image_url IS NOT NULL
+            AND mi.image_url LIKE '%s3%'
+            AND ba.file_url NOT LIKE '%s3%'
+            LIMIT 5
+        """)
+
+        for row in session.execute(preview_query):
             print(f"Menu: {row.menu_name}")
             print(f"  Current (ngrok): {row.current_asset_url}")
             print(f"  Will update to (S3): {row.s3_url}")
             print()
 
-        if len(results) > 5:
-            print(f"... and {len(results) - 5} more\n")
+        if total > 5:
+            print(f"... and {total - 5} more\n")
 
         # Ask for confirmation
-        confirm = input(f"Update {len(results)} assets? (yes/no): ")
+        confirm = input(f"Update {total} assets? (yes/no): ")
         if confirm.lower() != 'yes':
             print("Cancelled.")
             return
 
-        # Update all brand_assets
+        # Update all brand_assets; RETURNING reports the rewritten rows in the same round-trip
         update_query = text("""
             UPDATE brand_assets ba
             SET file_url = mi.image_url
@@ -72,25 +86,20 @@ def fix_brand_assets_urls():
             AND mi.image_url IS NOT NULL
             AND mi.image_url LIKE '%s3%'
             AND ba.file_url NOT LIKE '%s3%'
+            RETURNING ba.id, mi.name as menu_name, ba.file_url
         """)
 
-        result = session.execute(update_query)
+        rows = session.execute(update_query).fetchall()
         session.commit()
 
-        print(f"\n✅ Updated {result.rowcount} brand assets with S3 URLs!")
-        print("\nVerifying updates...")
+        print(f"\n✅ Updated {len(rows)} brand assets with S3 URLs!\n")
 
-        # Verify
-        verify_query = text("""
-            SELECT COUNT(*)
-            FROM brand_assets ba
-            INNER JOIN menu_items mi ON ba.id = mi.asset_id
-            WHERE mi.image_url LIKE '%s3%'
-            AND ba.file_url LIKE '%s3%'
-        """)
+        for row in rows[:5]:
+            print(f"Menu: {row.menu_name}")
+            print(f"  Asset {row.id}: {row.file_url}")
 
-        count = session.execute(verify_query).scalar()
-        print(f"✅ {count} menu items now have matching S3 URLs in brand_assets")
+        if len(rows) > 5:
+            print(f"... and {len(rows) - 5} more")
 
     except Exception as e:
         session.rollback()
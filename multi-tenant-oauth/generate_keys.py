@@ -6,7 +6,6 @@ Generates secure SECRET_KEY and ENCRYPTION_KEY for .env file
 
 import secrets
 import base64
-import os
 
 
 def generate_secret_key():
@@ -17,7 +16,7 @@ def generate_secret_key():
 def generate_encryption_key():
     """Generate a 32-byte AES-256 encryption key (base64-encoded)."""
     # Generate 32 random bytes
-    key_bytes = os.urandom(32)
+    key_bytes = secrets.token_bytes(32)
     # Encode as base64 for storage in .env
     return base64.b64encode(key_bytes).decode('utf-8')
 
@@ -0,0 +1,32 @@
+"""add brand_assets tenant/last_used_at index
+
+Revision ID: 4b7e2d9c1a35
+Revises: 1cc5db06fca8
+Create Date: 2026-10-16 09:10:12.418530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2d9c1a35'
+down_revision = '1cc5db06fca8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Composite index matching ORDER BY last_used_at NULLS LAST per tenant,
+    # used when selecting an existing brand asset for a post.
+    # (JSONB tags are already covered by the idx_brand_assets_tags GIN index.)
+    op.create_index(
+        'idx_brand_assets_tenant_last_used',
+        'brand_assets',
+        ['tenant_id', sa.text('last_used_at NULLS LAST')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_brand_assets_tenant_last_used', table_name='brand_assets')
@@ -0,0 +1,41 @@
+"""use jsonb_path_ops GIN index for brand_assets.tags
+
+Revision ID: 9d41c6e8b207
+Revises: 4b7e2d9c1a35
+Create Date: 2026-10-16 09:35:40.127804
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d41c6e8b207'
+down_revision = '4b7e2d9c1a35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tag lookups only use JSONB containment (tags @> '[...]'), which
+    # jsonb_path_ops serves with a smaller, faster GIN index
+    op.execute('DROP INDEX IF EXISTS idx_brand_assets_tags')
+    op.create_index(
+        'idx_brand_assets_tags',
+        'brand_assets',
+        ['tags'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'tags': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_brand_assets_tags', table_name='brand_assets')
+    op.create_index(
+        'idx_brand_assets_tags',
+        'brand_assets',
+        ['tags'],
+        unique=False,
+        postgresql_using='gin',
+    )
@@ -0,0 +1,33 @@
+"""add prompt_hash to brand_assets
+
+Revision ID: c2f85a7d3e91
+Revises: 9d41c6e8b207
+Create Date: 2026-10-16 10:02:18.664213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2f85a7d3e91'
+down_revision = '9d41c6e8b207'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Add prompt_hash column so identical DALL-E prompts reuse the stored image
+    op.add_column('brand_assets', sa.Column('prompt_hash', sa.String(length=64), nullable=True))
+    op.create_index(
+        'idx_brand_assets_tenant_prompt_hash',
+        'brand_assets',
+        ['tenant_id', 'prompt_hash'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    # Remove prompt_hash column and its index
+    op.drop_index('idx_brand_assets_tenant_prompt_hash', table_name='brand_assets')
+    op.drop_column('brand_assets', 'prompt_hash')
@@ -0,0 +1,26 @@
+"""add analysis_fingerprint to restaurant_profiles
+
+Revision ID: e7a1b4c9d2f6
+Revises: c2f85a7d3e91
+Create Date: 2026-10-16 10:30:42.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a1b4c9d2f6'
+down_revision = 'c2f85a7d3e91'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Add analysis_fingerprint column so unchanged menu/sales data skips re-analysis
+    op.add_column('restaurant_profiles', sa.Column('analysis_fingerprint', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    # Remove analysis_fingerprint column
+    op.drop_column('restaurant_profiles', 'analysis_fingerprint')
@@ -0,0 +1,44 @@
+"""add analysis metadata columns to restaurant_profiles
+
+Revision ID: 3f9c2e71b8a4
+Revises: e7a1b4c9d2f6
+Create Date: 2026-10-16 10:55:07.392851
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2e71b8a4'
+down_revision = 'e7a1b4c9d2f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Store analysis freshness and coverage as columns instead of inside the JSONB blobs
+    op.add_column('restaurant_profiles', sa.Column('analyzed_at', sa.DateTime(), nullable=True))
+    op.add_column('restaurant_profiles', sa.Column('analyzed_menu_items_count', sa.Integer(), nullable=True))
+    op.add_column('restaurant_profiles', sa.Column('analyzed_orders_count', sa.Integer(), nullable=True))
+
+    # Backfill from the metadata previously embedded in brand_analysis
+    op.execute(
+        """
+        UPDATE restaurant_profiles
+        SET analyzed_at = (brand_analysis->>'analyzed_at')::timestamp,
+            analyzed_menu_items_count = (brand_analysis->>'total_menu_items')::integer,
+            analyzed_orders_count = COALESCE((sales_insights->>'total_orders_analyzed')::integer, 0)
+        WHERE brand_analysis ? 'analyzed_at'
+        """
+    )
+
+    op.create_index('ix_restaurant_profiles_analyzed_at', 'restaurant_profiles', ['analyzed_at'], unique=False)
+
+
+def downgrade() -> None:
+    # Remove analysis metadata columns
+    op.drop_index('ix_restaurant_profiles_analyzed_at', table_name='restaurant_profiles')
+    op.drop_column('restaurant_profiles', 'analyzed_orders_count')
+    op.drop_column('restaurant_profiles', 'analyzed_menu_items_count')
+    op.drop_column('restaurant_profiles', 'analyzed_at')
@@ -0,0 +1,32 @@
+"""add scheduled due index to post_history
+
+Revision ID: 8d4b6a2f1c37
+Revises: 3f9c2e71b8a4
+Create Date: 2026-10-16 11:20:41.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4b6a2f1c37'
+down_revision = '3f9c2e71b8a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partial index for the scheduler's due-post query (status = 'scheduled' ORDER BY scheduled_for)
+    op.create_index(
+        'idx_post_history_scheduled_due',
+        'post_history',
+        ['scheduled_for'],
+        unique=False,
+        postgresql_where=sa.text("status = 'scheduled'"),
+    )
+
+
+def downgrade() -> None:
+    # Remove scheduled due index
+    op.drop_index('idx_post_history_scheduled_due', table_name='post_history')
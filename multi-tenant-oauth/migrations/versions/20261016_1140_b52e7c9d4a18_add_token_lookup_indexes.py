@@ -0,0 +1,48 @@
+"""add token lookup indexes
+
+Revision ID: b52e7c9d4a18
+Revises: 8d4b6a2f1c37
+Create Date: 2026-10-16 11:40:12.603517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b52e7c9d4a18'
+down_revision = '8d4b6a2f1c37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Replace (tenant_id, platform) with a covering index for the active-account filter
+    op.drop_index('idx_social_accounts_tenant_platform', table_name='social_accounts')
+    op.create_index(
+        'idx_social_accounts_tenant_platform_active',
+        'social_accounts',
+        ['tenant_id', 'platform', 'is_active'],
+        unique=False,
+    )
+
+    # Newest non-revoked token per account (ORDER BY issued_at DESC LIMIT 1)
+    op.create_index(
+        'idx_oauth_tokens_account_issued',
+        'oauth_tokens',
+        ['social_account_id', sa.text('issued_at DESC')],
+        unique=False,
+        postgresql_where=sa.text('is_revoked = false'),
+    )
+
+
+def downgrade() -> None:
+    # Remove token lookup indexes
+    op.drop_index('idx_oauth_tokens_account_issued', table_name='oauth_tokens')
+    op.drop_index('idx_social_accounts_tenant_platform_active', table_name='social_accounts')
+    op.create_index(
+        'idx_social_accounts_tenant_platform',
+        'social_accounts',
+        ['tenant_id', 'platform'],
+        unique=False,
+    )
@@ -0,0 +1,32 @@
+"""add due index to calendar_posts
+
+Revision ID: e81a4f3b6c25
+Revises: b52e7c9d4a18
+Create Date: 2026-10-16 11:50:27.114806
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e81a4f3b6c25'
+down_revision = 'b52e7c9d4a18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Expression index for the auto-publish query (scheduled_date + scheduled_time <= now)
+    op.create_index(
+        'idx_calendar_posts_due',
+        'calendar_posts',
+        [sa.text('(scheduled_date + scheduled_time)')],
+        unique=False,
+        postgresql_where=sa.text("status = 'approved'"),
+    )
+
+
+def downgrade() -> None:
+    # Remove calendar due index
+    op.drop_index('idx_calendar_posts_due', table_name='calendar_posts')
@@ -0,0 +1,32 @@
+"""add expiring index to oauth_tokens
+
+Revision ID: 4c9d1e6a7b52
+Revises: e81a4f3b6c25
+Create Date: 2026-10-16 12:00:48.270935
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c9d1e6a7b52'
+down_revision = 'e81a4f3b6c25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partial index matching the expiring-token refresh predicate (live tokens only)
+    op.create_index(
+        'idx_oauth_tokens_expiring',
+        'oauth_tokens',
+        ['expires_at'],
+        unique=False,
+        postgresql_where=sa.text('is_revoked = false AND expires_at IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    # Remove expiring index
+    op.drop_index('idx_oauth_tokens_expiring', table_name='oauth_tokens')
@@ -0,0 +1,41 @@
+"""add s3 url partial indexes to menu_items and brand_assets
+
+Revision ID: a7e3c5d91f04
+Revises: 4c9d1e6a7b52
+Create Date: 2026-10-16 12:10:17.604829
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7e3c5d91f04'
+down_revision = '4c9d1e6a7b52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partial indexes matching the S3 URL backfill join (mi.asset_id = ba.id);
+    # the predicates must stay textually identical to the queries in fix_brand_assets_urls.py
+    op.create_index(
+        'ix_menu_items_image_url_s3',
+        'menu_items',
+        ['asset_id'],
+        unique=False,
+        postgresql_where=sa.text("image_url LIKE '%s3%'"),
+    )
+    op.create_index(
+        'idx_brand_assets_file_url_non_s3',
+        'brand_assets',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text("file_url NOT LIKE '%s3%'"),
+    )
+
+
+def downgrade() -> None:
+    # Remove S3 URL partial indexes
+    op.drop_index('idx_brand_assets_file_url_non_s3', table_name='brand_assets')
+    op.drop_index('ix_menu_items_image_url_s3', table_name='menu_items')
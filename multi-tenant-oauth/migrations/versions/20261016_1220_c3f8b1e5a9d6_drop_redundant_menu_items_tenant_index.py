@@ -0,0 +1,27 @@
+"""drop redundant menu_items tenant index
+
+Revision ID: c3f8b1e5a9d6
+Revises: a7e3c5d91f04
+Create Date: 2026-10-16 12:20:09.381547
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f8b1e5a9d6'
+down_revision = 'a7e3c5d91f04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # tenant_id is the leading column of ix_menu_items_tenant_category and
+    # ix_menu_items_tenant_popularity, so the single-column index only adds write cost
+    op.drop_index('ix_menu_items_tenant_id', table_name='menu_items')
+
+
+def downgrade() -> None:
+    # Restore single-column tenant index
+    op.create_index('ix_menu_items_tenant_id', 'menu_items', ['tenant_id'], unique=False)
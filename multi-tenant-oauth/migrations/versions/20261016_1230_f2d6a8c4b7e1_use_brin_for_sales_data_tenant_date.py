@@ -0,0 +1,36 @@
+"""use brin for sales_data tenant/date index
+
+Revision ID: f2d6a8c4b7e1
+Revises: c3f8b1e5a9d6
+Create Date: 2026-10-16 12:30:52.116390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2d6a8c4b7e1'
+down_revision = 'c3f8b1e5a9d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Sales imports COPY a tenant's rows in one contiguous batch in report (date) order, so a
+    # BRIN index covers the same scans as the btree at a fraction of the size and write cost
+    op.drop_index('ix_sales_data_tenant_date', table_name='sales_data')
+    op.create_index(
+        'ix_sales_data_tenant_date',
+        'sales_data',
+        ['tenant_id', 'order_date'],
+        unique=False,
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32},
+    )
+
+
+def downgrade() -> None:
+    # Restore btree tenant/date index
+    op.drop_index('ix_sales_data_tenant_date', table_name='sales_data')
+    op.create_index('ix_sales_data_tenant_date', 'sales_data', ['tenant_id', 'order_date'], unique=False)
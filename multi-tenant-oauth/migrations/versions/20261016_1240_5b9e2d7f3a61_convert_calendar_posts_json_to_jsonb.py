@@ -0,0 +1,39 @@
+"""convert calendar_posts json columns to jsonb
+
+Revision ID: 5b9e2d7f3a61
+Revises: f2d6a8c4b7e1
+Create Date: 2026-10-16 12:40:27.843105
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9e2d7f3a61'
+down_revision = 'f2d6a8c4b7e1'
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = ('featured_items', 'hashtags', 'engagement_metrics')
+
+
+def upgrade() -> None:
+    # Store calendar post JSON as binary jsonb (parsed once on write, not on every read)
+    for column in JSON_COLUMNS:
+        op.alter_column('calendar_posts', column,
+                   existing_type=postgresql.JSON(astext_type=sa.Text()),
+                   type_=postgresql.JSONB(astext_type=sa.Text()),
+                   existing_nullable=True,
+                   postgresql_using=f'{column}::jsonb')
+
+
+def downgrade() -> None:
+    # Revert to text json
+    for column in JSON_COLUMNS:
+        op.alter_column('calendar_posts', column,
+                   existing_type=postgresql.JSONB(astext_type=sa.Text()),
+                   type_=postgresql.JSON(astext_type=sa.Text()),
+                   existing_nullable=True,
+                   postgresql_using=f'{column}::json')
@@ -0,0 +1,37 @@
+"""add gen_random_uuid server defaults to restaurant and calendar tables
+
+Revision ID: 9d4f7b2c6e38
+Revises: 5b9e2d7f3a61
+Create Date: 2026-10-16 12:50:33.902417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4f7b2c6e38'
+down_revision = '5b9e2d7f3a61'
+branch_labels = None
+depends_on = None
+
+UUID_TABLES = ('restaurant_profiles', 'menu_items', 'sales_data', 'content_calendars', 'calendar_posts')
+
+
+def upgrade() -> None:
+    # Let Postgres generate primary keys so bulk loads (sales COPY) can omit id
+    op.execute('CREATE EXTENSION IF NOT EXISTS pgcrypto')
+    for table in UUID_TABLES:
+        op.alter_column(table, 'id',
+                   existing_type=sa.UUID(),
+                   server_default=sa.text('gen_random_uuid()'),
+                   existing_nullable=False)
+
+
+def downgrade() -> None:
+    # Remove id server defaults (pgcrypto is left installed)
+    for table in UUID_TABLES:
+        op.alter_column(table, 'id',
+                   existing_type=sa.UUID(),
+                   server_default=None,
+                   existing_nullable=False)
@@ -0,0 +1,34 @@
+"""consolidate calendar_posts indexes
+
+Revision ID: e6a1c9f4d2b7
+Revises: 9d4f7b2c6e38
+Create Date: 2026-10-16 13:00:14.527760
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6a1c9f4d2b7'
+down_revision = '9d4f7b2c6e38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Due-post lookups use the partial idx_calendar_posts_due, so the single-column
+    # status and scheduled_date indexes only add write cost
+    op.drop_index('ix_calendar_posts_status', table_name='calendar_posts')
+    op.drop_index('ix_calendar_posts_scheduled_date', table_name='calendar_posts')
+    # Composite tenant index serves tenant-only lookups by prefix
+    op.create_index('ix_calendar_posts_tenant_date', 'calendar_posts', ['tenant_id', 'scheduled_date'], unique=False)
+    op.drop_index('ix_calendar_posts_tenant_id', table_name='calendar_posts')
+
+
+def downgrade() -> None:
+    # Restore single-column indexes
+    op.create_index('ix_calendar_posts_tenant_id', 'calendar_posts', ['tenant_id'], unique=False)
+    op.drop_index('ix_calendar_posts_tenant_date', table_name='calendar_posts')
+    op.create_index('ix_calendar_posts_scheduled_date', 'calendar_posts', ['scheduled_date'], unique=False)
+    op.create_index('ix_calendar_posts_status', 'calendar_posts', ['status'], unique=False)
@@ -0,0 +1,47 @@
+"""add publishing claim to post_history
+
+Revision ID: 7a2c4e9b1d53
+Revises: e6a1c9f4d2b7
+Create Date: 2026-10-16 13:10:42.615098
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a2c4e9b1d53'
+down_revision = 'e6a1c9f4d2b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Scheduler claims due posts as 'publishing' and records when, so stale claims can be released
+    op.add_column('post_history', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+    op.drop_constraint('check_post_status', 'post_history', type_='check')
+    op.create_check_constraint(
+        'check_post_status',
+        'post_history',
+        "status IN ('pending', 'published', 'failed', 'deleted', 'scheduled', 'publishing')",
+    )
+    op.create_index(
+        'idx_post_history_publishing_claimed',
+        'post_history',
+        ['claimed_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'publishing'"),
+    )
+
+
+def downgrade() -> None:
+    # Return in-flight claims to the schedule before removing the state
+    op.drop_index('idx_post_history_publishing_claimed', table_name='post_history')
+    op.execute("UPDATE post_history SET status = 'scheduled' WHERE status = 'publishing'")
+    op.drop_constraint('check_post_status', 'post_history', type_='check')
+    op.create_check_constraint(
+        'check_post_status',
+        'post_history',
+        "status IN ('pending', 'published', 'failed', 'deleted', 'scheduled')",
+    )
+    op.drop_column('post_history', 'claimed_at')
@@ -1,6 +1,7 @@
 """Test script to import Krusty Pizza sample data."""
 
 import requests
+import time
 import os
 from pathlib import Path
 
@@ -14,6 +15,12 @@ TENANT_ID = "1485f8b4-04e9-47b7-ad8a-27adbe78d20a"
 MENU_FILE = "krusti.pizza.pasta.dec28.xlsx"
 SALES_FILE = "Krusti-Pizza-Pasta-Order History Report 12-01-2025_12-28-2025.xlsx"
 
+# Celery states of an import job that is still in flight
+IMPORT_JOB_ACTIVE_STATES = ("PENDING", "STARTED", "RETRY")
+
+# Seconds to wait for the import worker before giving up
+IMPORT_JOB_TIMEOUT = 600
+
 def import_menu():
     """Import menu data."""
     print("=" * 80)
@@ -51,7 +58,24 @@ def import_sales():
         response = requests.post(url, files=files)
 
     print(f"Status Code: {response.status_code}")
-    print(f"Response: {response.json()}")
+    job = response.json()
+
+    # Import runs on a Celery worker; wait for it to finish
+    if response.ok:
+        job_url = f"{API_URL}/api/v1/restaurant/{TENANT_ID}/import/jobs/{job['job_id']}"
+        deadline = time.monotonic() + IMPORT_JOB_TIMEOUT
+        while job.get("status") in IMPORT_JOB_ACTIVE_STATES:
+            if time.monotonic() >= deadline:
+                print(f"ERROR: Import job still {job['status']} after {IMPORT_JOB_TIMEOUT}s (is a worker running?)")
+                break
+            time.sleep(1)
+            job_response = requests.get(job_url)
+            job = job_response.json()
+            if not job_response.ok:
+                print(f"ERROR: Import job status check failed ({job_response.status_code})")
+                break
+
+    print(f"Response: {job}")
     print()
 
 def get_restaurant_profile():